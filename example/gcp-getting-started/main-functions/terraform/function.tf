@@ -51,7 +51,7 @@ resource "google_cloudfunctions2_function" "notification_email_send" {
         timeout_seconds       = 60
         environment_variables = {
             ENV                       = var.env
-            OPERATOR_IMPORT           = "from airless.operator.notification.email import EmailSendOperator"
+            OPERATOR                  = "GoogleEmailSendOperator"
             GCP_PROJECT               = var.project_id
             PUBSUB_TOPIC_ERROR        = google_pubsub_topic.error_reprocess.name
             LOG_LEVEL                 = var.log_level
@@ -95,7 +95,7 @@ resource "google_cloudfunctions2_function" "notification_slack_send" {
         timeout_seconds       = 60
         environment_variables = {
             ENV                     = var.env
-            OPERATOR_IMPORT         = "from airless.operator.notification.slack import SlackSendOperator"
+            OPERATOR                = "GoogleSlackSendOperator"
             GCP_PROJECT             = var.project_id
             PUBSUB_TOPIC_ERROR      = google_pubsub_topic.error_reprocess.name
             LOG_LEVEL               = var.log_level
@@ -138,7 +138,7 @@ resource "google_cloudfunctions2_function" "error_reprocess" {
         timeout_seconds       = 540
         environment_variables = {
             ENV                       = var.env
-            OPERATOR_IMPORT           = "from airless.operator.error import ErrorReprocessOperator"
+            OPERATOR                  = "GoogleErrorReprocessOperator"
             GCP_PROJECT               = var.project_id
             PUBSUB_TOPIC_ERROR        = google_pubsub_topic.error_reprocess.name
             LOG_LEVEL                 = var.log_level
@@ -189,7 +189,7 @@ resource "google_cloudfunctions2_function" "gcs_query_to_bigquery" {
         timeout_seconds       = 540
         environment_variables = {
             ENV                     = var.env
-            OPERATOR_IMPORT         = "from airless.operator.google.bigquery import GcsQueryToBigqueryOperator"
+            OPERATOR                = "GcsQueryToBigqueryOperator"
             GCP_PROJECT             = var.project_id
             PUBSUB_TOPIC_ERROR      = google_pubsub_topic.error_reprocess.name
             LOG_LEVEL               = var.log_level
@@ -234,7 +234,7 @@ resource "google_cloudfunctions2_function" "redirect" {
         timeout_seconds       = 540
         environment_variables = {
             ENV                     = var.env
-            OPERATOR_IMPORT         = "from airless.operator.redirect import RedirectOperator"
+            OPERATOR                = "GoogleRedirectOperator"
             GCP_PROJECT             = var.project_id
             PUBSUB_TOPIC_ERROR      = google_pubsub_topic.error_reprocess.name
             LOG_LEVEL               = var.log_level
@@ -278,7 +278,7 @@ resource "google_cloudfunctions2_function" "pubsub_to_bq" {
         timeout_seconds       = 180
         environment_variables = {
             ENV                     = var.env
-            OPERATOR_IMPORT         = "from airless.operator.google.bigquery import PubsubToBqOperator"
+            OPERATOR                = "PubsubToBigqueryOperator"
             GCP_PROJECT             = var.project_id
             PUBSUB_TOPIC_ERROR      = google_pubsub_topic.error_reprocess.name
             LOG_LEVEL               = var.log_level
@@ -321,7 +321,7 @@ resource "google_cloudfunctions2_function" "delay" {
         timeout_seconds       = 540
         environment_variables = {
             ENV                     = var.env
-            OPERATOR_IMPORT         = "from airless.operator.delay import DelayOperator"
+            OPERATOR                = "GoogleDelayOperator"
             GCP_PROJECT             = var.project_id
             PUBSUB_TOPIC_ERROR      = google_pubsub_topic.error_reprocess.name
             LOG_LEVEL               = var.log_level
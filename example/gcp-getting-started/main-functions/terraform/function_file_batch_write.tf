@@ -21,7 +21,7 @@ resource "google_cloudfunctions2_function" "file_batch_write_detect" {
         timeout_seconds       = 540
         environment_variables = {
             ENV                              = var.env
-            OPERATOR_IMPORT                  = "from airless.operator.google.storage import BatchWriteDetectOperator"
+            OPERATOR                         = "BatchWriteDetectOperator"
             GCP_PROJECT                      = var.project_id
             PUBSUB_TOPIC_ERROR               = google_pubsub_topic.error_reprocess.name
             LOG_LEVEL                        = var.log_level
@@ -69,7 +69,7 @@ resource "google_cloudfunctions2_function" "file_batch_write_process" {
         timeout_seconds       = 540
         environment_variables = {
             ENV                               = var.env
-            OPERATOR_IMPORT                   = "from airless.operator.google.storage import BatchWriteProcessOperator"
+            OPERATOR                          = "BatchWriteProcessOperator"
             GCP_PROJECT                       = var.project_id
             PUBSUB_TOPIC_ERROR                = google_pubsub_topic.error_reprocess.name
             LOG_LEVEL                         = var.log_level
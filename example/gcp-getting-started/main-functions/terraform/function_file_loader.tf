@@ -21,7 +21,7 @@ resource "google_cloudfunctions2_function" "file_detect" {
         timeout_seconds       = 60
         environment_variables = {
             ENV                                   = var.env
-            OPERATOR_IMPORT                       = "from airless.operator.google.storage import FileDetectOperator"
+            OPERATOR                              = "FileDetectOperator"
             GCP_PROJECT                           = var.project_id
             PUBSUB_TOPIC_ERROR                    = google_pubsub_topic.error_reprocess.name
             LOG_LEVEL                             = var.log_level
@@ -71,7 +71,7 @@ resource "google_cloudfunctions2_function" "file_to_bq" {
         timeout_seconds       = 540
         environment_variables = {
             ENV                     = var.env
-            OPERATOR_IMPORT         = "from airless.operator.google.storage import FileToBigqueryOperator"
+            OPERATOR                = "airless.operator.google.storage:FileToBigqueryOperator"
             GCP_PROJECT             = var.project_id
             PUBSUB_TOPIC_ERROR      = google_pubsub_topic.error_reprocess.name
             LOG_LEVEL               = var.log_level
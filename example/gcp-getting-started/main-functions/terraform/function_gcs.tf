@@ -21,7 +21,7 @@ resource "google_cloudfunctions2_function" "gcs_move" {
         timeout_seconds       = 540
         environment_variables = {
             ENV                                   = var.env
-            OPERATOR_IMPORT                       = "from airless.operator.google.storage import FileMoveOperator"
+            OPERATOR                              = "FileMoveOperator"
             GCP_PROJECT                           = var.project_id
             PUBSUB_TOPIC_ERROR                    = google_pubsub_topic.error_reprocess.name
             LOG_LEVEL                             = var.log_level
@@ -64,7 +64,7 @@ resource "google_cloudfunctions2_function" "gcs_delete" {
         timeout_seconds       = 540
         environment_variables = {
             ENV                                   = var.env
-            OPERATOR_IMPORT                       = "from airless.operator.google.storage import FileDeleteOperator"
+            OPERATOR                              = "FileDeleteOperator"
             GCP_PROJECT                           = var.project_id
             PUBSUB_TOPIC_ERROR                    = google_pubsub_topic.error_reprocess.name
             LOG_LEVEL                             = var.log_level
@@ -1,13 +1,17 @@
-
 import functions_framework
 import gc
 
-from airless.core.utils import get_config
+from airless.core.hook import DatalakeWriter
+from airless.core.operator import OperatorRouter
+from airless.google.cloud.pubsub.hook import GooglePubsubHook
 
-exec(f'{get_config("OPERATOR_IMPORT")} as op')
+# Operators are loaded by the first event routed to them and reused by warm invocations
+router = OperatorRouter(queue_hook=GooglePubsubHook())
+# The operator buffers rows across invocations, so they are written when the instance is stopped
+DatalakeWriter.install_shutdown_handler()
 
 
 @functions_framework.cloud_event
 def route(cloud_event):
-    op().run(cloud_event)  # noqa
+    router.run(cloud_event)
     gc.collect()
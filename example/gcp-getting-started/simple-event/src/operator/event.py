@@ -1,4 +1,5 @@
 
+from airless.core.hook import DatalakeWriter
 from airless.google.cloud.storage.hook import GcsDatalakeHook
 from airless.google.cloud.core.operator import GoogleBaseEventOperator
 from airless.core.utils import get_config
@@ -11,6 +12,10 @@ class PasteBinOperator(GoogleBaseEventOperator):
     def __init__(self):
         super().__init__()
         self.datalake_hook = GcsDatalakeHook()
+        # Contents are small, so they are written in batches of several messages instead of
+        # one file per message, accepting that rows buffered by an instance killed without
+        # SIGTERM are lost
+        self.datalake_writer = DatalakeWriter(self.datalake_hook, flush_on_invocation=False)
         self.paste_bin_hook = PasteBinHook()
 
     def execute(self, data, topic):
@@ -26,18 +31,17 @@ class PasteBinOperator(GoogleBaseEventOperator):
     def list_ids(self, data, topic):
         ids = self.paste_bin_hook.list_ids()
 
-        for id_ in ids:
-            self.queue_hook.publish(
-                project=get_config('GCP_PROJECT'),
-                topic=topic,
-                data={'request_type': 'get-content', 'id': id_}
-            )
+        self.queue_hook.publish_many(
+            project=get_config('GCP_PROJECT'),
+            topic=topic,
+            messages=({'request_type': 'get-content', 'id': id_} for id_ in ids)
+        )
 
     def get_content(self, data, topic):
         id_ = data['id']
         res = self.paste_bin_hook.get_content(id_)
 
-        self.datalake_hook.send_to_landing_zone(
+        self.datalake_writer.send_to_landing_zone(
             data=res['response'],
             dataset='paste_bin_raw',
             table='content',
@@ -50,7 +50,7 @@ resource "google_cloudfunctions2_function" "paste_bin" {
         timeout_seconds       = 540
         environment_variables = {
             ENV                     = var.env
-            OPERATOR_IMPORT         = "from airless.operator.event import PasteBinOperator"
+            OPERATOR                = "src.operator.event:PasteBinOperator"
             GCP_REGION              = var.region
             GCP_PROJECT             = var.project_id
             LOG_LEVEL               = var.log_level
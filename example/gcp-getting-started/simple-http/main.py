@@ -2,14 +2,18 @@
 import json
 import functions_framework
 
+from airless.core.operator import get_operator, register_operator
 from airless.core.utils import get_config
 
-exec(f'{get_config("OPERATOR_IMPORT")} as op')
+# The operator is defined in this source code, so its import path from the configuration is registered
+register_operator(get_config('OPERATOR'), get_config('OPERATOR'))
+# The operator is created once per instance and reused by warm invocations
+operator = get_operator(get_config('OPERATOR'))()
 
 
 @functions_framework.http
 def route(request):
-    response = op().run(request)  # noqa
+    response = operator.run(request)
     code = response['code']
     content = response['response']
     headers = {'Content-Type': 'application/json; charset=utf-8'}
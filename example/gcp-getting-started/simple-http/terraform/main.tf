@@ -46,7 +46,7 @@ resource "google_cloudfunctions2_function" "paste_bin" {
         timeout_seconds       = 540
         environment_variables = {
             ENV                     = var.env
-            OPERATOR_IMPORT         = "from airless.operator.event import PasteBinOperator"
+            OPERATOR                = "src.operator.http:PasteBinOperator"
             GCP_REGION              = var.region
             GCP_PROJECT             = var.project_id
             LOG_LEVEL               = var.log_level
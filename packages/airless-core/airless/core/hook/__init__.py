@@ -1,18 +1,64 @@
-from .base import (BaseHook)
-from .datalake import (DatalakeHook)
-from .email import (EmailHook)
-from .file import (FileHook, FtpHook)
-from .queue import (QueueHook)
-from .secret import (SecretManagerHook)
-from .llm import (LLMHook)
+from typing import TYPE_CHECKING
+
+from airless.core.utils import lazy_exports
+
+if TYPE_CHECKING:
+    from .base import (BaseHook)
+    from .claim_check import (ClaimCheckHook, LocalClaimCheckHook)
+    from .datalake import (DatalakeHook)
+    from .datalake_writer import (DatalakeWriter)
+    from .email import (EmailHook)
+    from .file import (FileHook, FtpHook)
+    from .queue import (QueueHook, LocalQueueHook)
+    from .timer import (TimerHook, SqliteTimerHook)
+    from .secret import (SecretManagerHook)
+    from .state import (StateHook, MemoryStateHook, SqliteStateHook)
+    from .llm import (LLMHook)
+    from .registry import (HookRegistry, get_hook, register_hook)
 
 __all__ = [
     'BaseHook',
+    'ClaimCheckHook',
+    'LocalClaimCheckHook',
     'DatalakeHook',
+    'DatalakeWriter',
     'EmailHook',
     'FileHook',
     'FtpHook',
     'QueueHook',
+    'LocalQueueHook',
     'SecretManagerHook',
-    'LLMHook'
+    'StateHook',
+    'MemoryStateHook',
+    'SqliteStateHook',
+    'TimerHook',
+    'SqliteTimerHook',
+    'LLMHook',
+    'HookRegistry',
+    'get_hook',
+    'register_hook'
 ]
+
+# Submodules are only imported when one of their names is first accessed
+__getattr__, __dir__ = lazy_exports(__name__, {
+    'BaseHook': '.base',
+    'ClaimCheckHook': '.claim_check',
+    'LocalClaimCheckHook': '.claim_check',
+    'DatalakeHook': '.datalake',
+    'DatalakeWriter': '.datalake_writer',
+    'EmailHook': '.email',
+    'FileHook': '.file',
+    'FtpHook': '.file',
+    'QueueHook': '.queue',
+    'LocalQueueHook': '.queue',
+    'SecretManagerHook': '.secret',
+    'StateHook': '.state',
+    'MemoryStateHook': '.state',
+    'SqliteStateHook': '.state',
+    'TimerHook': '.timer',
+    'SqliteTimerHook': '.timer',
+    'LLMHook': '.llm',
+    'HookRegistry': '.registry',
+    'get_hook': '.registry',
+    'register_hook': '.registry'
+})
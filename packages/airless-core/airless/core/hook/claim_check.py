@@ -0,0 +1,101 @@
+import threading
+import time
+import uuid
+
+from typing import Dict, Tuple
+
+from airless.core.hook import BaseHook
+from airless.core.utils import get_config
+
+
+class ClaimCheckHook(BaseHook):
+    """Hook for storing message payloads that are too large to be sent through a queue.
+
+    The payload is stored once and the message only carries a claim, the
+    reference returned by `store`. Queues deliver messages at least once and
+    a topic may have several subscriptions, so consumers do not delete the
+    payload once they process the message. Payloads are kept for `ttl`
+    seconds, set by the environment variable `CLAIM_CHECK_TTL` and 7 days by
+    default, the maximum retention of a Pub/Sub subscription.
+    """
+
+    def __init__(self) -> None:
+        """Initializes the ClaimCheckHook."""
+        super().__init__()
+        self.ttl = float(get_config('CLAIM_CHECK_TTL', False, '604800'))
+
+    def store(self, payload: bytes) -> str:
+        """Stores a payload.
+
+        Args:
+            payload (bytes): The payload to store.
+
+        Raises:
+            NotImplementedError: This method needs to be implemented in a subclass.
+
+        Returns:
+            str: The claim of the payload.
+        """
+        raise NotImplementedError()
+
+    def load(self, claim: str) -> bytes:
+        """Loads a stored payload.
+
+        Args:
+            claim (str): The claim returned by `store`.
+
+        Raises:
+            NotImplementedError: This method needs to be implemented in a subclass.
+
+        Returns:
+            bytes: The payload.
+        """
+        raise NotImplementedError()
+
+
+class LocalClaimCheckHook(ClaimCheckHook):
+    """In-memory claim check store, useful to run pipelines locally and in tests.
+
+    Expired payloads are removed when a new payload is stored.
+    """
+
+    def __init__(self) -> None:
+        """Initializes the LocalClaimCheckHook."""
+        super().__init__()
+        self.payloads: Dict[str, Tuple[bytes, float]] = {}
+        self._lock = threading.Lock()
+
+    def store(self, payload: bytes) -> str:
+        """Stores a payload.
+
+        Args:
+            payload (bytes): The payload to store.
+
+        Returns:
+            str: The claim of the payload.
+        """
+        claim = uuid.uuid4().hex
+        now = time.time()
+        with self._lock:
+            for expired in [c for c, entry in self.payloads.items() if entry[1] <= now]:
+                del self.payloads[expired]
+            self.payloads[claim] = (payload, now + self.ttl)
+        return claim
+
+    def load(self, claim: str) -> bytes:
+        """Loads a stored payload.
+
+        Args:
+            claim (str): The claim returned by `store`.
+
+        Raises:
+            KeyError: If the payload does not exist or expired.
+
+        Returns:
+            bytes: The payload.
+        """
+        with self._lock:
+            payload, expires_at = self.payloads[claim]
+        if expires_at <= time.time():
+            raise KeyError(claim)
+        return payload
@@ -1,11 +1,10 @@
 
-import json
-
 from datetime import datetime
-from typing import Any, Dict, List, Optional, Tuple, Union
+from collections.abc import Iterator as IteratorABC
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
 
 from airless.core.hook import BaseHook
-from airless.core.utils import get_config
+from airless.core.utils import get_config, json_dumps_persisted
 
 
 class DatalakeHook(BaseHook):
@@ -50,10 +49,25 @@ class DatalakeHook(BaseHook):
         return {
             '_event_id': metadata['event_id'],
             '_resource': metadata['resource'],
-            '_json': json.dumps({'data': row, 'metadata': metadata}, default=str),
+            '_json': json_dumps_persisted({'data': row, 'metadata': metadata}),
             '_created_at': now
         }
 
+    def iter_rows(self, data: Any, metadata: Dict[str, Any], now: datetime) -> Iterator[Dict[str, Any]]:
+        """Prepares rows one at a time, so large inputs are never fully held in memory.
+
+        Args:
+            data (Any): The data to prepare, a list or an iterator of rows, or a single row.
+            metadata (Dict[str, Any]): The metadata for the rows.
+            now (datetime): The current timestamp.
+
+        Returns:
+            Iterator[Dict[str, Any]]: The prepared rows.
+        """
+        rows = data if isinstance(data, (list, IteratorABC)) else [data]
+        for row in rows:
+            yield self.prepare_row(row, metadata, now)
+
     def prepare_rows(self, data: Any, metadata: Dict[str, Any]) -> Tuple[List[Dict[str, Any]], datetime]:
         """Prepares multiple rows for insertion into the datalake.
 
@@ -65,10 +79,56 @@ class DatalakeHook(BaseHook):
             Tuple[List[Dict[str, Any]], datetime]: The prepared rows and the current timestamp.
         """
         now = datetime.now()
-        prepared_rows = data if isinstance(data, list) else [data]
-        return [self.prepare_row(row, metadata, now) for row in prepared_rows], now
+        return list(self.iter_rows(data, metadata, now)), now
+
+    def partition_name(self, now: datetime, time_partition: bool) -> Optional[str]:
+        """Builds the name of the partition where rows created at a time are written.
+
+        Args:
+            now (datetime): The time the rows were created.
+            time_partition (bool): Whether to use time partitioning.
+
+        Returns:
+            Optional[str]: The partition, like `date=2025-01-01`, or None without time partitioning.
+        """
+        return f'date={now.strftime("%Y-%m-%d")}' if time_partition else None
+
+    def write_rows(
+        self,
+        rows: Iterable[Dict[str, Any]],
+        dataset: str,
+        table: str,
+        partition: Optional[str] = None,
+        parquet_options: Optional[Dict[str, Any]] = None
+    ) -> Union[str, None]:
+        """Writes prepared rows to the landing zone in a single file.
+
+        This method must be implemented by the vendor specific class.
+
+        Args:
+            rows (Iterable[Dict[str, Any]]): The rows, as built by `prepare_row`.
+            dataset (str): The dataset name.
+            table (str): The table name.
+            partition (Optional[str]): The partition, as built by `partition_name`. Defaults to None.
+            parquet_options (Optional[Dict[str, Any]]): The codec, compression level, row group size,
+                dictionary encoding and statistics of parquet files. Defaults to None, which uses
+                the environment variables.
 
-    def send_to_landing_zone(self, data: Any, dataset: str, table: str, message_id: Optional[int], origin: Optional[str], time_partition: bool = False) -> Union[str, None]:
+        Returns:
+            Union[str, None]: The path to the uploaded file or None.
+        """
+        raise NotImplementedError('The vendor specific datalake class must implement this method')
+
+    def send_to_landing_zone(
+        self,
+        data: Any,
+        dataset: str,
+        table: str,
+        message_id: Optional[int],
+        origin: Optional[str],
+        time_partition: bool = False,
+        parquet_options: Optional[Dict[str, Any]] = None
+    ) -> Union[str, None]:
         """Sends data to the landing zone. This method must be implemented by the vendor specific class
 
         Args:
@@ -78,6 +138,9 @@ class DatalakeHook(BaseHook):
             message_id (Optional[int]): The message ID.
             origin (Optional[str]): The origin of the data.
             time_partition (bool, optional): Whether to use time partitioning. Defaults to False.
+            parquet_options (Optional[Dict[str, Any]]): The codec, compression level, row group size,
+                dictionary encoding and statistics of the parquet files of time partitioned data.
+                Defaults to None, which uses the environment variables.
 
         Returns:
             Union[str, None]: The path to the uploaded file or None.
@@ -85,6 +148,22 @@ class DatalakeHook(BaseHook):
 
         raise NotImplementedError('The vendor specific datalake class must implement this method')
 
+    def read_landing_zone(self, dataset: str, table: str, start: datetime, end: datetime) -> Iterator[Dict[str, Any]]:
+        """Reads the rows sent to the landing zone with `time_partition` between two dates.
+
+        This method must be implemented by the vendor specific class.
+
+        Args:
+            dataset (str): The dataset name.
+            table (str): The table name.
+            start (datetime): Rows created before this time are skipped.
+            end (datetime): Rows created after this time are skipped.
+
+        Returns:
+            Iterator[Dict[str, Any]]: The rows, as built by `prepare_row`.
+        """
+        raise NotImplementedError('The vendor specific datalake class must implement this method')
+
     def _validate_non_empty_data(self, data, dataset, table):
         if isinstance(data, list) and (len(data) == 0):
             raise Exception(f'Trying to send empty list to landing zone: {dataset}.{table}')
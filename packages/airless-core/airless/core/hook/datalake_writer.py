@@ -0,0 +1,393 @@
+import atexit
+import itertools
+import os
+import pickle
+import signal
+import tempfile
+import threading
+import time
+import weakref
+
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from airless.core.hook import BaseHook, DatalakeHook
+from airless.core.utils import get_config
+
+
+# Invocation, only set with flush_on_invocation, dataset, table and partition of a buffer
+BufferKey = Tuple[Any, str, str, Optional[str]]
+
+# Invocations of the current thread or coroutine, keyed by writer
+_invocations: ContextVar[Optional[weakref.WeakKeyDictionary]] = ContextVar('airless_datalake_invocations', default=None)
+
+
+class _Buffer:
+    """Rows waiting to be written to one partition of a table."""
+
+    def __init__(self) -> None:
+        self.rows = []
+        self.count = 0
+        self.memory_bytes = 0
+        self.total_bytes = 0
+        self.spill_path = None
+        self.created_at = time.monotonic()
+        self.parquet_options = None
+        self.invocations = weakref.WeakSet()
+
+
+class DatalakeWriter(BaseHook):
+    """Buffers rows sent to the datalake and writes them in larger files.
+
+    Each call to `send_to_landing_zone` writes one file, so operators that
+    process many small messages create many tiny files, which are slow and
+    expensive to list, load and query. The writer keeps the prepared rows of
+    each `(dataset, table, partition)` and writes them with a single call to
+    `DatalakeHook.write_rows` when the buffer reaches `max_rows` rows,
+    `max_bytes` bytes or is `max_age` seconds old.
+
+    When the rows in memory of all buffers exceed `max_memory` bytes, the
+    largest buffer is spilled to a temporary file, so memory stays bounded.
+    Buffers are flushed by `flush`, when the writer is used as a context
+    manager, when the process exits and, with `flush_on_invocation`, at the
+    end of every operator invocation. Buffers are also flushed on SIGTERM
+    once `install_shutdown_handler` is called.
+
+    Operators bind each invocation with `bind_invocation`. By default every
+    invocation keeps its own buffers and writes them when it ends, so the
+    rows of an event are written before it is acknowledged and never with
+    the rows of a concurrent invocation. Disabling `flush_on_invocation`
+    shares the buffers and writes larger files from several invocations,
+    but their rows are lost if the instance stops without flushing them.
+
+    The rows of a buffer whose write fails are dropped, instead of being
+    written twice when the events are retried, and the error is raised by
+    every invocation whose rows were in the buffer and did not end yet, so
+    their events fail. Rows of invocations that already ended are logged as
+    lost.
+    """
+
+    def __init__(
+        self,
+        datalake_hook: DatalakeHook,
+        max_rows: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        max_age: Optional[float] = None,
+        max_memory: Optional[int] = None,
+        flush_on_invocation: Optional[bool] = None,
+        spill_dir: Optional[str] = None
+    ) -> None:
+        """Initializes the DatalakeWriter.
+
+        Args:
+            datalake_hook (DatalakeHook): The hook that writes the files.
+            max_rows (Optional[int]): Rows that trigger a flush of a buffer. Defaults to the
+                environment variable `DATALAKE_WRITER_MAX_ROWS` or 100000.
+            max_bytes (Optional[int]): Bytes that trigger a flush of a buffer. Defaults to
+                `DATALAKE_WRITER_MAX_BYTES` or 64 MB.
+            max_age (Optional[float]): Seconds after which a buffer is flushed. Defaults to
+                `DATALAKE_WRITER_MAX_AGE` or 60.
+            max_memory (Optional[int]): Bytes kept in memory before buffers are spilled to disk.
+                Defaults to `DATALAKE_WRITER_MAX_MEMORY` or 32 MB.
+            flush_on_invocation (Optional[bool]): Whether all buffers are flushed at the end of
+                every invocation. Defaults to `DATALAKE_WRITER_FLUSH_ON_INVOCATION` or True.
+            spill_dir (Optional[str]): Directory of the spill files. Defaults to the temporary directory.
+        """
+        super().__init__()
+        self.datalake_hook = datalake_hook
+        self.max_rows = max_rows or int(get_config('DATALAKE_WRITER_MAX_ROWS', False, '100000'))
+        self.max_bytes = max_bytes or int(get_config('DATALAKE_WRITER_MAX_BYTES', False, str(64 * 1024 * 1024)))
+        self.max_age = max_age or float(get_config('DATALAKE_WRITER_MAX_AGE', False, '60'))
+        self.max_memory = max_memory or int(get_config('DATALAKE_WRITER_MAX_MEMORY', False, str(32 * 1024 * 1024)))
+        if flush_on_invocation is None:
+            flush_on_invocation = get_config('DATALAKE_WRITER_FLUSH_ON_INVOCATION', False, 'true').lower() == 'true'
+        self.flush_on_invocation = flush_on_invocation
+        self.spill_dir = spill_dir
+        self._buffers: Dict[BufferKey, _Buffer] = {}
+        self._errors = weakref.WeakKeyDictionary()
+        self._memory_bytes = 0
+        self._lock = threading.RLock()
+        _register(self)
+
+    def __enter__(self) -> 'DatalakeWriter':
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.flush()
+
+    def send_to_landing_zone(
+        self,
+        data: Any,
+        dataset: str,
+        table: str,
+        message_id: Optional[int],
+        origin: Optional[str],
+        time_partition: bool = False,
+        parquet_options: Optional[Dict[str, Any]] = None
+    ) -> None:
+        """Buffers data sent to the landing zone, with the same arguments as the `DatalakeHook`.
+
+        Args:
+            data (Any): The data to send.
+            dataset (str): The dataset name.
+            table (str): The table name.
+            message_id (Optional[int]): The message ID.
+            origin (Optional[str]): The origin of the data.
+            time_partition (bool, optional): Whether to use time partitioning. Defaults to False.
+            parquet_options (Optional[Dict[str, Any]]): The settings of the parquet files. The
+                options of the first call of each buffer are used. Defaults to None.
+        """
+        self.datalake_hook._validate_non_empty_data(data, dataset, table)
+        self.datalake_hook._dev_send_to_landing_zone(data, dataset, table)
+        if get_config('ENV') != 'prod':
+            return
+
+        metadata = self.datalake_hook.build_metadata(message_id, origin)
+        rows, now = self.datalake_hook.prepare_rows(data, metadata)
+        invocation = self.invocation
+        owner = invocation if self.flush_on_invocation else None
+        key = (owner, dataset, table, self.datalake_hook.partition_name(now, time_partition))
+
+        with self._lock:
+            buffer = self._buffers.get(key)
+            if buffer is None:
+                buffer = self._buffers[key] = _Buffer()
+                buffer.parquet_options = parquet_options
+            if invocation is not None:
+                buffer.invocations.add(invocation)
+            size = sum(self.estimate_size(row) for row in rows)
+            buffer.rows.extend(rows)
+            buffer.count += len(rows)
+            buffer.memory_bytes += size
+            buffer.total_bytes += size
+            self._memory_bytes += size
+
+            if (buffer.count >= self.max_rows) or (buffer.total_bytes >= self.max_bytes):
+                self._flush_key(key, invocation)
+            else:
+                while self._memory_bytes > self.max_memory:
+                    self._spill(max(self._buffers, key=lambda k: self._buffers[k].memory_bytes))
+
+        self.flush_expired()
+
+    def estimate_size(self, row: Dict[str, Any]) -> int:
+        """Estimates the bytes of a row once written.
+
+        Args:
+            row (Dict[str, Any]): The row.
+
+        Returns:
+            int: The estimated size.
+        """
+        return sum(len(v) if isinstance(v, (str, bytes)) else 8 for v in row.values())
+
+    @property
+    def invocation(self) -> Any:
+        """The invocation bound by the current thread or coroutine, None outside of an invocation."""
+        invocations = _invocations.get()
+        return None if invocations is None else invocations.get(self)
+
+    def bind_invocation(self, invocation: Any) -> None:
+        """Assigns the rows sent by the current thread or coroutine to an invocation.
+
+        Operators bind their invocation context at the beginning of every `run`,
+        so each invocation writes its own rows and raises the errors of the
+        buffers its rows were in.
+
+        Args:
+            invocation (Any): The invocation, an object that can be weakly referenced.
+        """
+        # The mapping is copied, so the invocations bound by the caller are not changed
+        invocations = weakref.WeakKeyDictionary(_invocations.get() or {})
+        invocations[self] = invocation
+        _invocations.set(invocations)
+
+    def flush(self) -> List[str]:
+        """Writes all buffers to the datalake.
+
+        Raises:
+            Exception: The first error writing a buffer, after the other buffers are written.
+
+        Returns:
+            List[str]: The paths of the written files.
+        """
+        with self._lock:
+            return self._flush_keys(list(self._buffers), self.invocation)
+
+    def flush_expired(self) -> List[str]:
+        """Writes the buffers older than `max_age` to the datalake.
+
+        Raises:
+            Exception: The first error writing a buffer, after the other buffers are written.
+
+        Returns:
+            List[str]: The paths of the written files.
+        """
+        invocation = self.invocation
+        with self._lock:
+            return self._flush_keys(self._expired_keys(invocation), invocation)
+
+    def end_invocation(self, invocation: Any = None) -> None:
+        """Flushes the buffers when an operator invocation ends, the buffers of the
+        invocation with `flush_on_invocation` and otherwise only the expired ones.
+
+        Args:
+            invocation (Any): The invocation that ends. Defaults to the invocation
+                bound by the current thread or coroutine.
+
+        Raises:
+            Exception: The error writing a buffer with rows of the invocation,
+                including buffers written by other invocations.
+        """
+        invocation = self.invocation if invocation is None else invocation
+        with self._lock:
+            try:
+                if self.flush_on_invocation:
+                    self._flush_keys([key for key in self._buffers if key[0] is invocation], invocation)
+                else:
+                    self._flush_keys(self._expired_keys(invocation), invocation)
+            finally:
+                error = None if invocation is None else self._errors.pop(invocation, None)
+        if error is not None:
+            raise error
+
+    def _expired_keys(self, invocation: Any) -> List[BufferKey]:
+        now = time.monotonic()
+        # Buffers of other invocations are written when they end
+        return [
+            key for key, buffer in self._buffers.items()
+            if (now - buffer.created_at >= self.max_age) and (key[0] is None or key[0] is invocation)
+        ]
+
+    def _flush_keys(self, keys: List[BufferKey], invocation: Any) -> List[str]:
+        paths = []
+        error = None
+        for key in keys:
+            try:
+                path = self._flush_key(key, invocation)
+            except Exception as e:
+                error = error or e
+                continue
+            if path:
+                paths.append(path)
+        if error is not None:
+            raise error
+        return paths
+
+    def _flush_key(self, key: BufferKey, invocation: Any = None) -> Optional[str]:
+        """Writes a buffer, raising its error when the rows of the invocation, or of
+        no invocation, were in it and leaving it to the other invocations otherwise."""
+        buffer = self._buffers.pop(key)
+        self._memory_bytes -= buffer.memory_bytes
+        # Spilled rows are streamed from disk while they are written
+        rows = itertools.chain(self._iter_spill(buffer), buffer.rows)
+        _, dataset, table, partition = key
+        try:
+            path = self.datalake_hook.write_rows(rows, dataset, table, partition, parquet_options=buffer.parquet_options)
+        except Exception as e:
+            # Keeping the rows would write them again with the retries of the events
+            self.logger.error(f'Dropped {buffer.count} buffered rows of {dataset}.{table} {partition or ""} after a failed write')
+            owners = list(buffer.invocations)
+            for owner in owners:
+                if owner is not invocation:
+                    self._errors.setdefault(owner, e)
+            if (invocation is None) or (invocation in owners):
+                raise
+            return None
+        finally:
+            if buffer.spill_path:
+                os.remove(buffer.spill_path)
+        self.logger.debug(f'Wrote {buffer.count} buffered rows to {dataset}.{table} {partition or ""}')
+        return path
+
+    def _spill(self, key: BufferKey) -> None:
+        buffer = self._buffers[key]
+        if buffer.spill_path is None:
+            fd, buffer.spill_path = tempfile.mkstemp(prefix='airless-datalake-', suffix='.spill', dir=self.spill_dir)
+            os.close(fd)
+        # Rows are only read back by this process, pickle keeps their types, like datetimes
+        with open(buffer.spill_path, 'ab') as f:
+            for row in buffer.rows:
+                pickle.dump(row, f, protocol=pickle.HIGHEST_PROTOCOL)
+        self._memory_bytes -= buffer.memory_bytes
+        buffer.rows = []
+        buffer.memory_bytes = 0
+
+    def _iter_spill(self, buffer: _Buffer) -> Iterator[Dict[str, Any]]:
+        if buffer.spill_path:
+            with open(buffer.spill_path, 'rb') as f:
+                while True:
+                    try:
+                        yield pickle.load(f)
+                    except EOFError:
+                        return
+
+    @staticmethod
+    def install_shutdown_handler() -> None:
+        """Flushes every writer when the process receives SIGTERM.
+
+        Runtimes like Cloud Run send SIGTERM before stopping an instance, but
+        the handler replaces the SIGTERM handler of the process, so it is only
+        installed when requested. The previous handler runs once the writers
+        are flushed. It must be called from the main thread.
+        """
+        global _sigterm_installed, _previous_sigterm
+        with _shutdown_lock:
+            if _sigterm_installed:
+                return
+            _previous_sigterm = signal.getsignal(signal.SIGTERM)
+            signal.signal(signal.SIGTERM, _handle_sigterm)
+            _sigterm_installed = True
+        threading.Thread(target=_flush_on_sigterm, name='airless-datalake-writer', daemon=True).start()
+
+
+_writers = weakref.WeakSet()
+_shutdown_lock = threading.Lock()
+_atexit_installed = False
+_sigterm_installed = False
+_previous_sigterm = None
+_stopping = threading.Event()
+_flushed = threading.Event()
+
+
+def _register(writer: DatalakeWriter) -> None:
+    """Keeps track of a writer so its buffers are flushed when the process exits."""
+    global _atexit_installed
+    _writers.add(writer)
+    with _shutdown_lock:
+        if not _atexit_installed:
+            _atexit_installed = True
+            atexit.register(_flush_all)
+
+
+def _handle_sigterm(signum, frame) -> None:
+    """Asks the shutdown thread to flush the writers and, once they are flushed, runs the previous handler.
+
+    The handler runs in the main thread between any two instructions, even
+    while a writer holds its lock, so it never writes the buffers itself.
+    """
+    if not _flushed.is_set():
+        _stopping.set()
+        return
+    if callable(_previous_sigterm):
+        _previous_sigterm(signum, frame)
+    elif _previous_sigterm != signal.SIG_IGN:
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        os.kill(os.getpid(), signal.SIGTERM)
+
+
+def _flush_on_sigterm() -> None:
+    """Flushes the writers once SIGTERM is received, then signals the process again to stop it."""
+    _stopping.wait()
+    _flush_all()
+    _flushed.set()
+    os.kill(os.getpid(), signal.SIGTERM)
+
+
+def _flush_all() -> None:
+    """Flushes every writer, logging the errors so the other writers are flushed."""
+    for writer in list(_writers):
+        try:
+            writer.flush()
+        except Exception as e:
+            writer.logger.error(f'Error flushing datalake writer on shutdown: {e}')
@@ -1,10 +1,10 @@
-from email import encoders
-from email.mime.text import MIMEText
-from email.mime.base import MIMEBase
-from email.mime.multipart import MIMEMultipart
+from typing import TYPE_CHECKING
 
 from airless.core.hook import BaseHook
 
+if TYPE_CHECKING:
+    from email.mime.multipart import MIMEMultipart
+
 
 class EmailHook(BaseHook):
     """EmailHook class to build and send email messages.
@@ -32,7 +32,7 @@ class EmailHook(BaseHook):
         sender: str,
         attachments: list = [],
         mime_type: str = 'plain',
-    ) -> MIMEMultipart:
+    ) -> 'MIMEMultipart':
         """Builds an email message with optional attachments.
 
         Args:
@@ -49,6 +49,10 @@ class EmailHook(BaseHook):
         Returns:
             MIMEMultipart: The constructed email message object.
         """
+        from email import encoders
+        from email.mime.text import MIMEText
+        from email.mime.base import MIMEBase
+        from email.mime.multipart import MIMEMultipart
 
         msg = MIMEMultipart()
         msg.attach(MIMEText(content, mime_type))
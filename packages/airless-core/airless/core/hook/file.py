@@ -1,16 +1,13 @@
-import json
-import ndjson
 import os
-import requests
 import re
 import uuid
 
 from datetime import datetime
-from dateutil import parser
 from ftplib import FTP
-from typing import Any
+from typing import Any, Union
 
 from airless.core.hook import BaseHook
+from airless.core.utils import json_dumps
 
 
 class FileHook(BaseHook):
@@ -49,17 +46,41 @@ class FileHook(BaseHook):
                 Defaults to `'w'`.
         """
 
-        use_ndjson = kwargs.get('use_ndjson', False)
         mode = kwargs.get('mode', 'w')
 
         with open(local_filepath, mode) as f:
-            if mode == 'wb':
-                f.write(data)
-            elif isinstance(data, (dict, list)):
-                dump = ndjson.dump if use_ndjson else json.dump
-                dump(data, f, default=str)
+            f.write(self.serialize(data, **kwargs))
+
+    def serialize(self, data: Any, **kwargs) -> Union[str, bytes]:
+        """
+        Converts data to the content `write` saves, so it can also be uploaded from memory.
+
+        Args:
+            data (Any):
+                The data to convert, with the same types accepted by `write`.
+        Kwargs:
+            use_ndjson (bool):
+                If `True` and the data is a dictionary or list, the data will be
+                converted to NDJSON format. Defaults to `False`.
+            mode (str):
+                With `'wb'` the data is returned as it is. Defaults to `'w'`.
+
+        Returns:
+            Union[str, bytes]: The content.
+        """
+        use_ndjson = kwargs.get('use_ndjson', False)
+        mode = kwargs.get('mode', 'w')
+
+        if mode == 'wb':
+            return data
+        elif isinstance(data, (dict, list)):
+            if use_ndjson:
+                records = data if isinstance(data, list) else [data]
+                return '\n'.join(json_dumps(record) for record in records)
             else:
-                f.write(str(data))
+                return json_dumps(data)
+        else:
+            return str(data)
 
     def extract_filename(self, filepath_or_url: str) -> str:
         """Extracts the filename from a filepath or URL.
@@ -110,6 +131,7 @@ class FileHook(BaseHook):
         Returns:
             str: The local filename where the downloaded file is saved.
         """
+        import requests
 
         with requests.get(
             url,
@@ -249,6 +271,7 @@ class FtpHook(FileHook):
                 - A list of files (dictionaries with 'name' and 'updated_at').
                 - A list of directories (dictionaries with 'name' and 'updated_at').
         """
+        from dateutil import parser
 
         lines = self.dir()
 
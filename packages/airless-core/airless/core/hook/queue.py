@@ -1,22 +1,355 @@
+import threading
+
+from collections import defaultdict
+from concurrent.futures import Future
+from contextvars import ContextVar
+from functools import partial
+from itertools import islice
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+from weakref import WeakKeyDictionary
+
 from airless.core.hook import BaseHook
+from airless.core.utils import compress, get_config
+
+# Pending messages of the current thread or coroutine, keyed by queue hook
+_pending: ContextVar[Optional[WeakKeyDictionary]] = ContextVar('airless_pending_messages', default=None)
 
 
 class QueueHook(BaseHook):
-    """Hook for interacting with a queue system."""
+    """Hook for interacting with a queue system.
+
+    Besides `publish`, which waits for each message to be sent, messages can
+    be published without blocking with `publish_async` and `publish_many`.
+    The hook keeps track of the pending messages and `flush` waits for all
+    of them, which operators do at the end of every `run`. The hook is shared
+    by the concurrent invocations of an operator, so each invocation binds its
+    own set of pending messages with `bind_pending`, and only waits for the
+    messages it published.
+
+    When a `claim_check_hook` is set, implementations that serialize messages
+    store payloads larger than `CLAIM_CHECK_THRESHOLD` bytes, 1 MB by default,
+    with `offload` and publish only the claim in the `claim_check` attribute.
+
+    Serialized messages can also be compressed with `gzip` or `zstd`, set by
+    the environment variable `QUEUE_COMPRESSION`, when they are larger than
+    `QUEUE_COMPRESSION_THRESHOLD` bytes, 1 KB by default. The algorithm is
+    sent in the `content_encoding` attribute and messages without it are
+    read as they are.
+
+    Selected metadata is promoted to message attributes by `promote_attributes`,
+    so consumers can route and filter messages without decoding their bodies.
+    The keys are set by the environment variable `QUEUE_PROMOTED_METADATA`,
+    `retries,origin,trace_id,schema_version` by default.
+
+    Only queues with scheduled delivery, with `SUPPORTS_DELAY` set, deliver
+    messages after a `delay`. The others publish them right away, so
+    operators schedule delayed messages with a `TimerHook` instead.
+    """
+
+    # Whether the queue delivers messages published with a delay only once it is over
+    SUPPORTS_DELAY = False
+    # Message attribute with the claim of a payload stored by the claim check hook
+    CLAIM_CHECK_ATTRIBUTE = 'claim_check'
+    # Message attribute with the algorithm used to compress the payload
+    CONTENT_ENCODING_ATTRIBUTE = 'content_encoding'
+    # Message attribute values are limited to 1024 bytes
+    MAX_ATTRIBUTE_SIZE = 1024
 
     def __init__(self) -> None:
         """Initializes the QueueHook."""
         super().__init__()
+        self._default_pending = set()
+        self._pending_lock = threading.Lock()
+        self.claim_check_hook = None
+        self.claim_check_threshold = int(get_config('CLAIM_CHECK_THRESHOLD', False, '1000000'))
+        self.compression = get_config('QUEUE_COMPRESSION', False)
+        self.compression_threshold = int(get_config('QUEUE_COMPRESSION_THRESHOLD', False, '1024'))
+        self.promoted_metadata = [
+            key.strip()
+            for key in get_config('QUEUE_PROMOTED_METADATA', False, 'retries,origin,trace_id,schema_version').split(',')
+            if key.strip()
+        ]
 
-    def publish(self, project: str, topic: str, data: dict) -> None:
+    def publish(self, project: str, topic: str, data: dict, delay: Optional[float] = None) -> None:
         """Publishes data to a specified topic.
 
         Args:
             project (str): The project name.
             topic (str): The topic to publish to.
             data (dict): The data to publish.
+            delay (Optional[float]): Number of seconds before the message should be processed,
+                only used by queues with `SUPPORTS_DELAY`. Implementations must not block the
+                caller while waiting. Defaults to None.
 
         Raises:
             NotImplementedError: This method needs to be implemented in a subclass.
         """
         raise NotImplementedError()
+
+    def publish_async(self, project: str, topic: str, data: dict, delay: Optional[float] = None) -> Future:
+        """Publishes data to a specified topic without waiting for it to be sent.
+
+        Implementations that support batching should override this method, the
+        default implementation publishes the message synchronously.
+
+        Args:
+            project (str): The project name.
+            topic (str): The topic to publish to.
+            data (dict): The data to publish.
+            delay (Optional[float]): Number of seconds before the message should be processed. Defaults to None.
+
+        Returns:
+            Future: A future resolved once the message is published.
+        """
+        future = Future()
+        try:
+            future.set_result(self.publish(project, topic, data, delay=delay))
+        except Exception as e:
+            future.set_exception(e)
+        return self.track(future)
+
+    def publish_many(
+        self,
+        project: str,
+        topic: str,
+        messages: Iterable[dict],
+        delay: Optional[float] = None,
+        batch_size: int = 1000
+    ) -> int:
+        """Publishes several messages to a topic and waits until all of them are sent.
+
+        The messages are consumed lazily, `batch_size` at a time, so a generator
+        of any size can be published with bounded memory.
+
+        Args:
+            project (str): The project name.
+            topic (str): The topic to publish to.
+            messages (Iterable[dict]): The data of each message.
+            delay (Optional[float]): Number of seconds before the messages should be processed. Defaults to None.
+            batch_size (int): Maximum number of messages waiting to be sent. Defaults to 1000.
+
+        Returns:
+            int: The number of published messages.
+        """
+        count = 0
+        iterator = iter(messages)
+        while True:
+            futures = [self.publish_async(project, topic, m, delay=delay) for m in islice(iterator, batch_size)]
+            if not futures:
+                return count
+
+            try:
+                for future in futures:
+                    future.result()
+            finally:
+                # Errors are raised here, so flush does not need to raise them again
+                pending = self.pending
+                with self._pending_lock:
+                    pending.difference_update(futures)
+            count += len(futures)
+
+    @property
+    def pending(self) -> Set[Any]:
+        """The messages published asynchronously by the current thread or coroutine
+        that were not flushed, either the set bound with `bind_pending` or one
+        shared by the code that runs outside of an invocation."""
+        bound = _pending.get()
+        pending = None if bound is None else bound.get(self)
+        return self._default_pending if pending is None else pending
+
+    def bind_pending(self, pending: Set[Any]) -> None:
+        """Tracks the messages published by the current thread or coroutine in a set.
+
+        Operators bind the set of their invocation context at the beginning of
+        every `run`, so concurrent invocations do not wait for nor raise the
+        errors of each other's messages.
+
+        Args:
+            pending (Set[Any]): The set where the pending messages are kept.
+        """
+        # The mapping is copied, so the sets bound by the caller are not changed
+        bound = WeakKeyDictionary(_pending.get() or {})
+        bound[self] = pending
+        _pending.set(bound)
+
+    def flush(self, timeout: Optional[float] = None, pending: Optional[Set[Any]] = None) -> None:
+        """Waits for the messages published asynchronously to be sent.
+
+        Args:
+            timeout (Optional[float]): Number of seconds to wait for each message. Defaults to None.
+            pending (Optional[Set[Any]]): The pending messages to wait for. Defaults to the
+                messages of the current thread or coroutine.
+
+        Raises:
+            Exception: The first error raised while publishing one of the messages since the last flush.
+        """
+        pending = self.pending if pending is None else pending
+        with self._pending_lock:
+            futures = list(pending)
+
+        errors = []
+        for future in futures:
+            try:
+                future.result(timeout=timeout)
+            except Exception as e:
+                errors.append(e)
+            with self._pending_lock:
+                pending.discard(future)
+
+        if errors:
+            raise errors[0]
+
+    def track(self, future: Any) -> Any:
+        """Keeps track of a future until it is done, so `flush` can wait for it.
+
+        Args:
+            future (Any): A future with `add_done_callback` and `result` methods.
+
+        Returns:
+            Any: The same future.
+        """
+        pending = self.pending
+        with self._pending_lock:
+            pending.add(future)
+        future.add_done_callback(partial(self._untrack, pending))
+        return future
+
+    def _untrack(self, pending: Set[Any], future: Any) -> None:
+        # Failed futures are kept so the error is raised by the next flush
+        if future.cancelled() or future.exception() is None:
+            with self._pending_lock:
+                pending.discard(future)
+
+    def promote_attributes(self, data: Any) -> Dict[str, str]:
+        """Builds the message attributes from the metadata of a message.
+
+        Each promoted key is read from the `metadata` of the message and then
+        from the message itself, as error messages keep the `origin` at the top
+        level. Only scalar values are promoted.
+
+        Args:
+            data (Any): The data of the message.
+
+        Returns:
+            Dict[str, str]: The attributes to add to the message.
+        """
+        if not isinstance(data, dict):
+            return {}
+
+        metadata = data.get('metadata')
+        if not isinstance(metadata, dict):
+            metadata = {}
+
+        attributes = {}
+        for key in self.promoted_metadata:
+            value = metadata.get(key, data.get(key))
+            if (value is None) or not isinstance(value, (str, int, float, bool)):
+                continue
+            value = str(value)
+            if len(value.encode('utf-8')) <= self.MAX_ATTRIBUTE_SIZE:
+                attributes[key] = value
+        return attributes
+
+    def compress(self, payload: bytes) -> Tuple[bytes, Dict[str, str]]:
+        """Compresses a serialized payload when compression is enabled and it is large enough.
+
+        Args:
+            payload (bytes): The serialized message.
+
+        Returns:
+            Tuple[bytes, Dict[str, str]]: The payload to publish and the attributes
+                to add to the message.
+        """
+        if (not self.compression) or (len(payload) < self.compression_threshold):
+            return payload, {}
+        return compress(payload, self.compression), {self.CONTENT_ENCODING_ATTRIBUTE: self.compression}
+
+    def offload(self, payload: bytes) -> Tuple[bytes, Dict[str, str]]:
+        """Stores a serialized payload with the claim check hook when it is too large.
+
+        Args:
+            payload (bytes): The serialized message.
+
+        Returns:
+            Tuple[bytes, Dict[str, str]]: The payload to publish, empty when it was
+                stored, and the attributes to add to the message.
+        """
+        if (self.claim_check_hook is None) or (len(payload) <= self.claim_check_threshold):
+            return payload, {}
+
+        claim = self.claim_check_hook.store(payload)
+        self.logger.debug(f'Payload of {len(payload)} bytes stored as {claim}')
+        return b'', {self.CLAIM_CHECK_ATTRIBUTE: claim}
+
+    def resolve(self, payload: bytes, attributes: dict) -> bytes:
+        """Loads the payload of a message that was offloaded.
+
+        Args:
+            payload (bytes): The payload received.
+            attributes (dict): The attributes of the message.
+
+        Raises:
+            ValueError: If the message has a claim but no claim check hook is set.
+
+        Returns:
+            bytes: The original payload.
+        """
+        claim = attributes.get(self.CLAIM_CHECK_ATTRIBUTE)
+        if not claim:
+            return payload
+        if self.claim_check_hook is None:
+            raise ValueError(f'Message payload is stored as {claim} but no claim check hook is set')
+        return self.claim_check_hook.load(claim)
+
+
+class LocalQueueHook(QueueHook):
+    """In-process queue, useful to run pipelines locally and in tests.
+
+    Messages are delivered to the callbacks subscribed to their topic, or kept
+    in `messages` when the topic has no subscriber. Delayed messages are
+    delivered by a timer thread, so publishing never blocks.
+    """
+
+    SUPPORTS_DELAY = True
+
+    def __init__(self) -> None:
+        """Initializes the LocalQueueHook."""
+        super().__init__()
+        self.messages: Dict[str, List[dict]] = defaultdict(list)
+        self.subscribers: Dict[str, List[Callable[[dict], None]]] = defaultdict(list)
+        self._lock = threading.Lock()
+
+    def subscribe(self, topic: str, callback: Callable[[dict], None]) -> None:
+        """Subscribes a callback to a topic.
+
+        Args:
+            topic (str): The topic to subscribe to.
+            callback (Callable[[dict], None]): Function called with the data of each message.
+        """
+        with self._lock:
+            self.subscribers[topic].append(callback)
+
+    def publish(self, project: str, topic: str, data: dict, delay: Optional[float] = None) -> None:
+        """Publishes data to a topic, delivering it after the delay.
+
+        Args:
+            project (str): The project name, not used by the local queue.
+            topic (str): The topic to publish to.
+            data (dict): The data to publish.
+            delay (Optional[float]): Number of seconds before the message is delivered. Defaults to None.
+        """
+        if delay and delay > 0:
+            timer = threading.Timer(delay, self._deliver, args=(topic, data))
+            timer.daemon = True
+            timer.start()
+        else:
+            self._deliver(topic, data)
+
+    def _deliver(self, topic: str, data: dict) -> None:
+        with self._lock:
+            callbacks = list(self.subscribers.get(topic, []))
+            if not callbacks:
+                self.messages[topic].append(data)
+
+        for callback in callbacks:
+            callback(data)
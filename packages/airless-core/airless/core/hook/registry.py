@@ -0,0 +1,57 @@
+from typing import Type, Union
+
+from airless.core.utils import EntryPointRegistry
+from airless.core.hook.base import BaseHook
+
+
+class HookRegistry(EntryPointRegistry):
+    """Registry of the hooks that can be built by name.
+
+    Packages declare their hooks as entry points of the `airless.hooks`
+    group, mapping a name to the import path of the hook class:
+
+        [project.entry-points."airless.hooks"]
+        GcsStateHook = "airless.google.cloud.storage.hook:GcsStateHook"
+
+    Packages use it to build the hooks of other packages they do not depend
+    on, like the GCS stores used by the Google Cloud operators, which are only
+    available when the storage package is installed. Hooks can also be
+    registered explicitly, with the class or its import path, `module:Class`,
+    to replace the installed ones.
+    """
+
+    ENTRY_POINT_GROUP = 'airless.hooks'
+    KIND = 'Hook'
+
+    def base_class(self) -> type:
+        """Gets the class every hook must subclass.
+
+        Returns:
+            type: `BaseHook`.
+        """
+        return BaseHook
+
+
+_registry = HookRegistry()
+
+
+def register_hook(name: str, target: Union[str, type]) -> None:
+    """Registers a hook in the process-wide hook registry.
+
+    Args:
+        name (str): The name used to reference the hook.
+        target (Union[str, type]): The hook class or its import path, `module:Class`.
+    """
+    _registry.register(name, target)
+
+
+def get_hook(name: str) -> Type:
+    """Gets a hook class from the process-wide hook registry.
+
+    Args:
+        name (str): The registered name of the hook.
+
+    Returns:
+        Type: The hook class.
+    """
+    return _registry.get(name)
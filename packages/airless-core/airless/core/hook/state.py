@@ -0,0 +1,258 @@
+import sqlite3
+import threading
+import time
+
+from collections import OrderedDict
+from typing import Any, List, Optional
+
+from airless.core.hook import BaseHook
+from airless.core.utils import get_config, json_dumps, json_loads
+
+
+class StateHook(BaseHook):
+    """Hook for a key-value store shared by the invocations of an operator.
+
+    Values are JSON serializable and may expire after a time to live, in
+    seconds. Expired keys behave as if they did not exist. Stores whose keys
+    survive the instance and are shared by every instance set `DURABLE`.
+    """
+
+    DURABLE = True
+
+    def __init__(self) -> None:
+        """Initializes the StateHook."""
+        super().__init__()
+
+    def get(self, key: str) -> Optional[Any]:
+        """Gets the value of a key.
+
+        Args:
+            key (str): The key.
+
+        Raises:
+            NotImplementedError: This method needs to be implemented in a subclass.
+
+        Returns:
+            Optional[Any]: The value, or None if the key does not exist or expired.
+        """
+        raise NotImplementedError()
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        """Sets the value of a key.
+
+        Args:
+            key (str): The key.
+            value (Any): The value.
+            ttl (Optional[float]): Number of seconds before the key expires. Defaults to None,
+                which never expires.
+
+        Raises:
+            NotImplementedError: This method needs to be implemented in a subclass.
+        """
+        raise NotImplementedError()
+
+    def delete(self, key: str) -> None:
+        """Deletes a key.
+
+        Args:
+            key (str): The key.
+
+        Raises:
+            NotImplementedError: This method needs to be implemented in a subclass.
+        """
+        raise NotImplementedError()
+
+    def keys(self, prefix: str = '') -> List[str]:
+        """Lists the keys starting with a prefix, in ascending order.
+
+        Implementations may return keys that already expired.
+
+        Args:
+            prefix (str): The prefix of the keys. Defaults to ''.
+
+        Raises:
+            NotImplementedError: This method needs to be implemented in a subclass.
+
+        Returns:
+            List[str]: The keys.
+        """
+        raise NotImplementedError()
+
+    def exists(self, key: str) -> bool:
+        """Checks if a key exists and did not expire.
+
+        Args:
+            key (str): The key.
+
+        Returns:
+            bool: Whether the key exists.
+        """
+        return self.get(key) is not None
+
+    def expires_at(self, ttl: Optional[float]) -> Optional[float]:
+        """Converts a time to live to the unix timestamp when the key expires.
+
+        Args:
+            ttl (Optional[float]): Number of seconds before the key expires.
+
+        Returns:
+            Optional[float]: The expiration timestamp, or None if the key never expires.
+        """
+        return None if ttl is None else time.time() + ttl
+
+
+class MemoryStateHook(StateHook):
+    """State store kept in the memory of the process.
+
+    The least recently used keys are discarded when the store is full, so it
+    only remembers the recent invocations of a warm instance.
+    """
+
+    DURABLE = False
+
+    def __init__(self, max_size: Optional[int] = None) -> None:
+        """Initializes the MemoryStateHook.
+
+        Args:
+            max_size (Optional[int]): Maximum number of keys. Defaults to the environment
+                variable `STATE_MEMORY_MAX_SIZE` or 10000.
+        """
+        super().__init__()
+        self.max_size = max_size or int(get_config('STATE_MEMORY_MAX_SIZE', False, '10000'))
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        """Gets the value of a key.
+
+        Args:
+            key (str): The key.
+
+        Returns:
+            Optional[Any]: The value, or None if the key does not exist or expired.
+        """
+        with self._lock:
+            item = self._items.get(key)
+            if item is None:
+                return None
+            value, expires_at = item
+            if (expires_at is not None) and (expires_at <= time.time()):
+                del self._items[key]
+                return None
+            self._items.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        """Sets the value of a key.
+
+        Args:
+            key (str): The key.
+            value (Any): The value.
+            ttl (Optional[float]): Number of seconds before the key expires. Defaults to None.
+        """
+        with self._lock:
+            self._items[key] = (value, self.expires_at(ttl))
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_size:
+                self._items.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        """Deletes a key.
+
+        Args:
+            key (str): The key.
+        """
+        with self._lock:
+            self._items.pop(key, None)
+
+    def keys(self, prefix: str = '') -> List[str]:
+        """Lists the keys starting with a prefix, in ascending order.
+
+        Args:
+            prefix (str): The prefix of the keys. Defaults to ''.
+
+        Returns:
+            List[str]: The keys.
+        """
+        now = time.time()
+        with self._lock:
+            return sorted(
+                key for key, (_, expires_at) in self._items.items()
+                if key.startswith(prefix) and ((expires_at is None) or (expires_at > now)))
+
+
+class SqliteStateHook(StateHook):
+    """State store backed by a SQLite database, for local runs and tests.
+
+    The store is only durable when it is kept in a file.
+    """
+
+    def __init__(self, path: Optional[str] = None) -> None:
+        """Initializes the SqliteStateHook.
+
+        Args:
+            path (Optional[str]): Path of the database file. Defaults to the environment
+                variable `STATE_SQLITE_PATH` or an in-memory database.
+        """
+        super().__init__()
+        self.path = path or get_config('STATE_SQLITE_PATH', False, ':memory:')
+        self.DURABLE = self.path != ':memory:'
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(self.path, check_same_thread=False)
+        with self._connection:
+            self._connection.execute(
+                'CREATE TABLE IF NOT EXISTS state (key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL)')
+
+    def get(self, key: str) -> Optional[Any]:
+        """Gets the value of a key.
+
+        Args:
+            key (str): The key.
+
+        Returns:
+            Optional[Any]: The value, or None if the key does not exist or expired.
+        """
+        with self._lock:
+            row = self._connection.execute(
+                'SELECT value FROM state WHERE key = ? AND (expires_at IS NULL OR expires_at > ?)',
+                (key, time.time())).fetchone()
+        return None if row is None else json_loads(row[0])
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        """Sets the value of a key.
+
+        Args:
+            key (str): The key.
+            value (Any): The value.
+            ttl (Optional[float]): Number of seconds before the key expires. Defaults to None.
+        """
+        with self._lock, self._connection:
+            self._connection.execute(
+                'INSERT OR REPLACE INTO state (key, value, expires_at) VALUES (?, ?, ?)',
+                (key, json_dumps(value), self.expires_at(ttl)))
+            # Expired keys are removed while writing, so the table does not grow forever
+            self._connection.execute('DELETE FROM state WHERE expires_at <= ?', (time.time(),))
+
+    def delete(self, key: str) -> None:
+        """Deletes a key.
+
+        Args:
+            key (str): The key.
+        """
+        with self._lock, self._connection:
+            self._connection.execute('DELETE FROM state WHERE key = ?', (key,))
+
+    def keys(self, prefix: str = '') -> List[str]:
+        """Lists the keys starting with a prefix, in ascending order.
+
+        Args:
+            prefix (str): The prefix of the keys. Defaults to ''.
+
+        Returns:
+            List[str]: The keys.
+        """
+        with self._lock:
+            rows = self._connection.execute(
+                'SELECT key FROM state WHERE substr(key, 1, ?) = ? AND (expires_at IS NULL OR expires_at > ?) ORDER BY key',
+                (len(prefix), prefix, time.time())).fetchall()
+        return [r[0] for r in rows]
@@ -0,0 +1,137 @@
+import sqlite3
+import threading
+import time
+import uuid
+
+from typing import Any, Dict, List, Optional
+
+from airless.core.hook import BaseHook
+from airless.core.utils import get_config, json_dumps, json_loads
+
+
+class TimerHook(BaseHook):
+    """Hook for storing messages that must be published at a later time.
+
+    Operators that need to wait schedule a timer and return right away
+    instead of sleeping. A sweeper publishes the timers once they are due
+    and acknowledges them afterwards, so a timer is never lost if publishing
+    fails, but it may be published more than once.
+
+    Each timer is a dictionary with the keys `id`, `due_at`, `project`,
+    `topic` and `data`.
+    """
+
+    def __init__(self) -> None:
+        """Initializes the TimerHook."""
+        super().__init__()
+
+    def schedule(self, due_at: float, topic: str, data: Any, project: Optional[str] = None) -> str:
+        """Schedules a message to be published to a topic.
+
+        Args:
+            due_at (float): The unix timestamp after which the message must be published.
+            topic (str): The topic to publish to.
+            data (Any): The data to publish.
+            project (Optional[str]): The project of the topic. Defaults to None.
+
+        Raises:
+            NotImplementedError: This method needs to be implemented in a subclass.
+
+        Returns:
+            str: The ID of the timer.
+        """
+        raise NotImplementedError()
+
+    def due(self, now: Optional[float] = None, limit: int = 500) -> List[Dict[str, Any]]:
+        """Lists the timers that are due, oldest first.
+
+        Args:
+            now (Optional[float]): The reference unix timestamp. Defaults to the current time.
+            limit (int): The maximum number of timers to return. Defaults to 500.
+
+        Raises:
+            NotImplementedError: This method needs to be implemented in a subclass.
+
+        Returns:
+            List[Dict[str, Any]]: The due timers.
+        """
+        raise NotImplementedError()
+
+    def ack(self, timer_ids: List[str]) -> None:
+        """Removes timers that were already published.
+
+        Args:
+            timer_ids (List[str]): The IDs of the published timers.
+
+        Raises:
+            NotImplementedError: This method needs to be implemented in a subclass.
+        """
+        raise NotImplementedError()
+
+
+class SqliteTimerHook(TimerHook):
+    """Timer store backed by a SQLite database, for local runs and tests."""
+
+    def __init__(self, path: Optional[str] = None) -> None:
+        """Initializes the SqliteTimerHook.
+
+        Args:
+            path (Optional[str]): Path of the database file. Defaults to the environment
+                variable `TIMER_SQLITE_PATH` or an in-memory database.
+        """
+        super().__init__()
+        self.path = path or get_config('TIMER_SQLITE_PATH', False, ':memory:')
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(self.path, check_same_thread=False)
+        with self._connection:
+            self._connection.execute(
+                'CREATE TABLE IF NOT EXISTS timers '
+                '(id TEXT PRIMARY KEY, due_at REAL NOT NULL, project TEXT, topic TEXT NOT NULL, data TEXT NOT NULL)')
+            self._connection.execute('CREATE INDEX IF NOT EXISTS timers_due_at ON timers (due_at)')
+
+    def schedule(self, due_at: float, topic: str, data: Any, project: Optional[str] = None) -> str:
+        """Schedules a message to be published to a topic.
+
+        Args:
+            due_at (float): The unix timestamp after which the message must be published.
+            topic (str): The topic to publish to.
+            data (Any): The data to publish.
+            project (Optional[str]): The project of the topic. Defaults to None.
+
+        Returns:
+            str: The ID of the timer.
+        """
+        timer_id = str(uuid.uuid4())
+        with self._lock, self._connection:
+            self._connection.execute(
+                'INSERT INTO timers (id, due_at, project, topic, data) VALUES (?, ?, ?, ?, ?)',
+                (timer_id, due_at, project, topic, json_dumps(data)))
+        return timer_id
+
+    def due(self, now: Optional[float] = None, limit: int = 500) -> List[Dict[str, Any]]:
+        """Lists the timers that are due, oldest first.
+
+        Args:
+            now (Optional[float]): The reference unix timestamp. Defaults to the current time.
+            limit (int): The maximum number of timers to return. Defaults to 500.
+
+        Returns:
+            List[Dict[str, Any]]: The due timers.
+        """
+        with self._lock:
+            rows = self._connection.execute(
+                'SELECT id, due_at, project, topic, data FROM timers WHERE due_at <= ? ORDER BY due_at LIMIT ?',
+                (now or time.time(), limit)).fetchall()
+        return [
+            {'id': r[0], 'due_at': r[1], 'project': r[2], 'topic': r[3], 'data': json_loads(r[4])}
+            for r in rows
+        ]
+
+    def ack(self, timer_ids: List[str]) -> None:
+        """Removes timers that were already published.
+
+        Args:
+            timer_ids (List[str]): The IDs of the published timers.
+        """
+        with self._lock, self._connection:
+            self._connection.executemany('DELETE FROM timers WHERE id = ?', [(i,) for i in timer_ids])
@@ -1,13 +1,47 @@
-from .base import (BaseHttpOperator, BaseFileOperator, BaseEventOperator)
-from .delay import (DelayOperator)
-from .error import (ErrorReprocessOperator)
-from .redirect import (RedirectOperator)
+from typing import TYPE_CHECKING
+
+from airless.core.utils import lazy_exports
+
+if TYPE_CHECKING:
+    from .context import (InvocationContext)
+    from .base import (BaseHttpOperator, BaseFileOperator, BaseEventOperator)
+    from .delay import (DelayOperator)
+    from .error import (ErrorReprocessOperator)
+    from .redirect import (RedirectOperator)
+    from .replay import (ErrorReplayOperator)
+    from .timer import (TimerSweepOperator)
+    from .registry import (OperatorRegistry, get_operator, register_operator)
+    from .router import (OperatorRouter)
 
 __all__ = [
+    'InvocationContext',
     'BaseHttpOperator',
     'BaseFileOperator',
     'BaseEventOperator',
     'DelayOperator',
     'ErrorReprocessOperator',
-    'RedirectOperator'
+    'RedirectOperator',
+    'ErrorReplayOperator',
+    'TimerSweepOperator',
+    'OperatorRegistry',
+    'get_operator',
+    'register_operator',
+    'OperatorRouter'
 ]
+
+# Submodules are only imported when one of their names is first accessed
+__getattr__, __dir__ = lazy_exports(__name__, {
+    'InvocationContext': '.context',
+    'BaseHttpOperator': '.base',
+    'BaseFileOperator': '.base',
+    'BaseEventOperator': '.base',
+    'DelayOperator': '.delay',
+    'ErrorReprocessOperator': '.error',
+    'RedirectOperator': '.redirect',
+    'ErrorReplayOperator': '.replay',
+    'TimerSweepOperator': '.timer',
+    'OperatorRegistry': '.registry',
+    'get_operator': '.registry',
+    'register_operator': '.registry',
+    'OperatorRouter': '.router'
+})
@@ -1,15 +1,19 @@
-
-import json
 import time
 import traceback
 
 from base64 import b64decode
+from contextvars import ContextVar
 
 from typing import Optional
+from weakref import WeakKeyDictionary
 
 from airless.core import BaseClass
-from airless.core.utils import get_config
+from airless.core.utils import RetryPolicy, decompress, exception_status, exception_types, get_config, json_loads
 from airless.core.hook import QueueHook
+from airless.core.operator.context import InvocationContext
+
+# Invocation contexts of the current thread or coroutine, keyed by operator
+_contexts: ContextVar[Optional[WeakKeyDictionary]] = ContextVar('airless_invocation_contexts', default=None)
 
 
 class BaseOperator(BaseClass):
@@ -20,10 +24,28 @@ class BaseOperator(BaseClass):
     files, and HTTP requests. It includes basic error handling 
     and message chaining functionalities.
 
+    The state of the event or request being processed is kept in an
+    `InvocationContext` bound to the current thread or coroutine, so
+    the same instance can process several invocations concurrently.
+
+    Event and file operators skip messages that were already processed when
+    an `idempotency_hook` is set. Pub/Sub delivers messages at least once, so
+    the ID of each message processed without errors is kept for
+    `IDEMPOTENCY_TTL` seconds, 7 days by default. The hook is created from the
+    environment variable `IDEMPOTENCY_STORE`, `memory` or `sqlite`, and vendors
+    may support other stores.
+
+    Operators can declare how their errors are retried by the
+    `ErrorReprocessOperator` with a `retry_policy`, which is sent with every
+    error along with the exception class, so permanent errors are not retried.
+
     Inherits from:
         BaseClass: The base class for the operator implementations.
     """
 
+    # Sent with the errors of the operator, a retry policy in the message metadata overrides it
+    retry_policy: Optional[RetryPolicy] = None
+
     def __init__(self):
         """Initializes the BaseOperator class.
 
@@ -33,8 +55,135 @@ class BaseOperator(BaseClass):
         super().__init__()
         self.queue_hook = QueueHook()  # Have to redefine this attribute for each vendor
         self.trigger_type = None
-        self.message_id = None
-        self.has_error = False
+
+        # Operators that buffer rows set a DatalakeWriter, which is flushed at the end of every run
+        self.datalake_writer = None
+
+        self.idempotency_hook = None
+        idempotency_store = get_config('IDEMPOTENCY_STORE', False)
+        if idempotency_store == 'memory':
+            from airless.core.hook import MemoryStateHook
+            self.idempotency_hook = MemoryStateHook()
+        elif idempotency_store == 'sqlite':
+            from airless.core.hook import SqliteStateHook
+            self.idempotency_hook = SqliteStateHook()
+
+    @property
+    def context(self) -> InvocationContext:
+        """The invocation context of the current thread or coroutine."""
+        contexts = _contexts.get()
+        context = None if contexts is None else contexts.get(self)
+        if context is None:
+            context = self.reset()
+        return context
+
+    @property
+    def message_id(self) -> Optional[int]:
+        """The ID of the message being processed by the current invocation."""
+        return self.context.message_id
+
+    @message_id.setter
+    def message_id(self, value: Optional[int]) -> None:
+        self.context.message_id = value
+
+    @property
+    def has_error(self) -> bool:
+        """Whether an error was reported during the current invocation."""
+        return self.context.has_error
+
+    @has_error.setter
+    def has_error(self, value: bool) -> None:
+        self.context.has_error = value
+
+    def reset(self) -> InvocationContext:
+        """Starts a new invocation context for the current thread or coroutine.
+
+        Hooks and vendor clients are created once in `__init__` and kept across
+        invocations, while the state describing the current trigger is replaced
+        at the beginning of every `run`. This allows a single instance to be
+        created per process and reused by warm instances.
+
+        Returns:
+            InvocationContext: The new invocation context.
+        """
+        context = InvocationContext(trigger_type=self.trigger_type)
+        # The mapping is copied, so the contexts bound by the caller are not changed
+        contexts = WeakKeyDictionary(_contexts.get() or {})
+        contexts[self] = context
+        _contexts.set(contexts)
+        # The queue hook is shared by concurrent invocations, so each one keeps its own pending messages
+        self.queue_hook.bind_pending(context.pending_messages)
+        if self.datalake_writer is not None:
+            self.datalake_writer.bind_invocation(context)
+        return context
+
+    def flush(self, context: Optional[InvocationContext] = None) -> None:
+        """Waits for the messages published asynchronously by an invocation to be sent.
+
+        It is called at the end of every `run`, so no message is left pending
+        when the instance goes idle, and also flushes the buffers of the
+        `datalake_writer` that are due. Only the messages of the invocation are
+        waited for, so concurrent invocations do not report each other's
+        errors. Publishing and writing errors are reported instead of raised.
+
+        Args:
+            context (Optional[InvocationContext]): The invocation being finished.
+                Defaults to the context of the current thread or coroutine.
+        """
+        context = context or self.context
+        try:
+            self.queue_hook.flush(pending=context.pending_messages)
+        except Exception as e:
+            self.report_error(f'Error publishing messages: {str(e)}\n{traceback.format_exc()}', context=context, exception=e)
+
+        if self.datalake_writer is not None:
+            try:
+                self.datalake_writer.end_invocation(context)
+            except Exception as e:
+                self.report_error(f'Error writing to the datalake: {str(e)}\n{traceback.format_exc()}', context=context, exception=e)
+
+    def idempotency_key(self, context: InvocationContext) -> Optional[str]:
+        """Builds the key of an invocation in the idempotency store.
+
+        Args:
+            context (InvocationContext): The invocation.
+
+        Returns:
+            Optional[str]: The key, or None when the invocation has no message ID.
+        """
+        if context.message_id is None:
+            return None
+        return f'idempotency/{self.__class__.__name__}/{context.message_id}'
+
+    def is_processed(self, context: InvocationContext) -> bool:
+        """Checks if the message of an invocation was already processed.
+
+        Args:
+            context (InvocationContext): The invocation.
+
+        Returns:
+            bool: Whether the message was processed without errors before.
+        """
+        key = self.idempotency_key(context)
+        if (self.idempotency_hook is None) or (key is None):
+            return False
+        return self.idempotency_hook.exists(key)
+
+    def mark_processed(self, context: InvocationContext) -> None:
+        """Records that the message of an invocation was processed without errors.
+
+        Args:
+            context (InvocationContext): The invocation.
+        """
+        key = self.idempotency_key(context)
+        if (self.idempotency_hook is None) or (key is None) or context.has_error:
+            return
+        try:
+            ttl = float(get_config('IDEMPOTENCY_TTL', False, '604800'))
+            self.idempotency_hook.set(key, {'processed_at': time.time()}, ttl=ttl)
+        except Exception as e:
+            # The message was processed, a duplicate is better than an error
+            self.logger.warning(f'Could not mark message {context.message_id} as processed: {e}')
 
     def extract_message_id(self, cloud_event) -> Optional[int]:
         """Extracts the message ID from the cloud event.
@@ -54,27 +203,41 @@ class BaseOperator(BaseClass):
                 return None
         return None
 
-    def report_error(self, message: str, data: dict=None):
+    def report_error(self, message: str, data: dict=None, context: Optional[InvocationContext] = None, exception: Optional[BaseException] = None):
         """Reports an error by logging it and publishing to a queue.
 
         Args:
             message (str): The error message to report.
             data (dict, optional): Additional data associated with the error. Defaults to None.
+            context (Optional[InvocationContext]): The invocation the error belongs to.
+                Defaults to the context of the current thread or coroutine.
+            exception (Optional[BaseException]): The exception that caused the error, its class
+                is sent as `error_type` so the error operator does not parse the traceback. Defaults to None.
         """
+        context = context or self.context
+
         if get_config('ENV') == 'prod':
             self.logger.error(f'Error {message}')
         else:
             self.logger.error(f'[DEV] Error {message}')
 
-        error_obj = self.build_error_message(message, data)
+        error_obj = self.build_error_message(message, data, context)
+        if exception is not None:
+            error_obj['error_types'] = exception_types(exception)
+            error_obj['error_type'] = error_obj['error_types'][0]
+            status = exception_status(exception)
+            if status is not None:
+                error_obj['error_status'] = status
+        if self.retry_policy is not None:
+            error_obj['retry_policy'] = self.retry_policy.to_dict()
         self.queue_hook.publish(
             project=None,
             topic=get_config('QUEUE_TOPIC_ERROR'),
             data=error_obj)
 
-        self.has_error = True
+        context.has_error = True
 
-    def build_error_message(self, message: str, data: dict):
+    def build_error_message(self, message: str, data: dict, context: Optional[InvocationContext] = None):
         """Builds an error message.
 
         This method needs to be implemented in subclasses.
@@ -82,6 +245,7 @@ class BaseOperator(BaseClass):
         Args:
             message (str): The error message.
             data (dict): The associated data.
+            context (Optional[InvocationContext]): The invocation the error belongs to.
 
         Raises:
             NotImplementedError: This method should be implemented by subclasses.
@@ -134,8 +298,16 @@ class BaseFileOperator(BaseOperator):
         super().__init__()
 
         self.trigger_type = 'file'
-        self.trigger_origin = None
-        self.cloud_event = None
+
+    @property
+    def trigger_origin(self) -> Optional[str]:
+        """The `bucket/filepath` of the file that triggered the current invocation."""
+        return self.context.origin
+
+    @property
+    def cloud_event(self):
+        """The cloud event that triggered the current invocation."""
+        return self.context.trigger
 
     def execute(self, bucket: str, filepath: str):
         """Executes file processing logic.
@@ -157,36 +329,48 @@ class BaseFileOperator(BaseOperator):
         Args:
             cloud_event (CloudEvent): The cloud event containing metadata about the file.
         """
+        context = self.reset()
         self.logger.debug(cloud_event)
         try:
-            self.message_id = self.extract_message_id(cloud_event)
-            self.cloud_event = cloud_event
+            context.message_id = self.extract_message_id(cloud_event)
+            context.trigger = cloud_event
+            context.data = cloud_event.data
             trigger_file_bucket = cloud_event['bucket']
             trigger_file_path = cloud_event.data['name']
-            self.trigger_origin = f'{trigger_file_bucket}/{trigger_file_path}'
+            context.origin = f'{trigger_file_bucket}/{trigger_file_path}'
+            if self.is_processed(context):
+                self.logger.info(f'Event {context.message_id} was already processed')
+                return
             self.execute(trigger_file_bucket, trigger_file_path)
 
         except Exception as e:
-            self.report_error(f'{str(e)}\n{traceback.format_exc()}')
+            self.report_error(f'{str(e)}\n{traceback.format_exc()}', context=context, exception=e)
+
+        finally:
+            self.flush(context)
 
-    def build_error_message(self, message: str, data: dict) -> dict:
+        self.mark_processed(context)
+
+    def build_error_message(self, message: str, data: dict, context: Optional[InvocationContext] = None) -> dict:
         """Builds an error message specific to file operations.
 
         Args:
             message (str): The error message.
             data (dict): The associated data.
+            context (Optional[InvocationContext]): The invocation the error belongs to.
 
         Returns:
             dict: A constructed error message.
         """
+        context = context or self.context
         return {
             'input_type': self.trigger_type,
-            'origin': self.trigger_origin,
+            'origin': context.origin,
             'error': message,
-            'event_id': self.message_id,
+            'event_id': context.message_id,
             'data': {
-                'attributes': self.cloud_event._attributes,
-                'data': data or self.cloud_event.data
+                'attributes': context.trigger._attributes,
+                'data': data or context.trigger.data
             }
         }
 
@@ -205,8 +389,23 @@ class BaseEventOperator(BaseOperator):
         super().__init__()
 
         self.trigger_type = 'event'
-        self.trigger_event_topic = None
-        self.trigger_event_data = None
+        # Delayed tasks are scheduled as timers when the queue has no scheduled delivery
+        self.timer_hook = None
+
+    @property
+    def trigger_event_topic(self) -> Optional[str]:
+        """The topic of the event that triggered the current invocation."""
+        return self.context.origin
+
+    @property
+    def trigger_event_data(self) -> Optional[dict]:
+        """The decoded data of the event that triggered the current invocation."""
+        return self.context.data
+
+    @property
+    def trigger_event_attributes(self) -> dict:
+        """The attributes of the message that triggered the current invocation."""
+        return self.context.attributes
 
     def execute(self, data: dict, topic: str):
         """Executes event processing logic.
@@ -229,54 +428,132 @@ class BaseEventOperator(BaseOperator):
             cloud_event (CloudEvent): The cloud event containing metadata about the event.
         """
 
+        context = self.reset()
         self.logger.debug(cloud_event)
         try:
-            self.message_id = self.extract_message_id(cloud_event)
-            decoded_data = b64decode(cloud_event.data['message']['data']).decode('utf-8')
-            self.trigger_event_data = json.loads(decoded_data)
-            self.trigger_event_topic = cloud_event['source'].split('/')[-1]
-
-            self.execute(self.trigger_event_data, self.trigger_event_topic)
-
-            if not self.has_error:
-                tasks = self.trigger_event_data.get('metadata', {}).get('run_next', [])
+            context.message_id = self.extract_message_id(cloud_event)
+            context.trigger = cloud_event
+            context.origin = cloud_event['source'].split('/')[-1]
+            context.attributes = cloud_event.data['message'].get('attributes') or {}
+            if not self.accept(context.attributes, context.origin):
+                self.logger.debug(f'Message skipped by its attributes {context.attributes}')
+                return
+            if self.is_processed(context):
+                self.logger.info(f'Message {context.message_id} was already processed')
+                return
+            context.data = self.decode_message(cloud_event.data['message'], context.attributes)
+
+            self.execute(context.data, context.origin)
+
+            if not context.has_error:
+                tasks = context.data.get('metadata', {}).get('run_next', [])
                 self.run_next(tasks)
 
         except Exception as e:
-            self.report_error(f'{str(e)}\n{traceback.format_exc()}')
+            self.report_error(f'{str(e)}\n{traceback.format_exc()}', context=context, exception=e)
+
+        finally:
+            self.flush(context)
+
+        self.mark_processed(context)
+
+    def accept(self, attributes: dict, topic: str) -> bool:
+        """Decides whether a message is processed before its body is decoded.
+
+        Publishers promote selected metadata, such as `retries`, `origin`,
+        `trace_id` and `schema_version`, to message attributes, so operators can
+        override this method to filter messages without decoding large bodies.
+        All messages are processed by default.
+
+        Args:
+            attributes (dict): The attributes of the message.
+            topic (str): The topic from which the message is received.
+
+        Returns:
+            bool: Whether the message must be processed.
+        """
+        return True
+
+    def decode_message(self, message: dict, attributes: dict) -> dict:
+        """Decodes the data of a queue message.
+
+        Payloads stored with a claim check are loaded from the claim check hook
+        of the queue hook, and compressed payloads are decompressed. Stored
+        payloads are not released once processed, since the message may be
+        delivered again or to other subscriptions, they expire after
+        `CLAIM_CHECK_TTL` seconds. Messages
+        without these attributes are decoded as they are.
+
+        Args:
+            message (dict): The message, with the base64 encoded payload in `data`.
+            attributes (dict): The attributes of the message.
+
+        Returns:
+            dict: The decoded data.
+        """
+        payload = b64decode(message.get('data') or '')
+        if attributes.get(QueueHook.CLAIM_CHECK_ATTRIBUTE):
+            payload = self.queue_hook.resolve(payload, attributes)
+        if attributes.get(QueueHook.CONTENT_ENCODING_ATTRIBUTE):
+            payload = decompress(payload, attributes[QueueHook.CONTENT_ENCODING_ATTRIBUTE])
+        return json_loads(payload)
 
     def run_next(self, tasks: list) -> None:
         """Executes the next tasks in the pipeline.
 
+        The operator never waits before publishing the tasks, so the instance
+        is released right away. The delay can be set for each task with the
+        `delay` key and defaults, when missing or null, to the `RUN_NEXT_DELAY`
+        environment variable, or 10 seconds. Delayed tasks are published with the delay when the
+        queue supports scheduled delivery, and are otherwise scheduled with the
+        `timer_hook` and published by the timer sweep once they are due. Without
+        either, tasks are published right away.
+
         Args:
             tasks (list): A list of tasks to execute next.
         """
+        if not tasks:
+            return
+
+        default_delay = float(get_config('RUN_NEXT_DELAY', False, '10'))
 
-        if tasks:
-            time.sleep(10)
         for t in tasks:
-            self.queue_hook.publish(
+            delay = t.get('delay')
+            if delay is None:
+                delay = default_delay
+            if (delay > 0) and (not self.queue_hook.SUPPORTS_DELAY) and (self.timer_hook is not None):
+                self.timer_hook.schedule(
+                    due_at=time.time() + delay,
+                    topic=t['topic'],
+                    data=t['data'],
+                    project=t.get('project'))
+                continue
+
+            # The messages are sent together and run waits for them when flushing
+            self.queue_hook.publish_async(
                 project=t.get('project'),
                 topic=t['topic'],
-                data=t['data'])
+                data=t['data'],
+                delay=delay if self.queue_hook.SUPPORTS_DELAY else None)
 
-    def build_error_message(self, message: str, data: dict) -> dict:
+    def build_error_message(self, message: str, data: dict, context: Optional[InvocationContext] = None) -> dict:
         """Builds an error message specific to event operations.
 
         Args:
             message (str): The error message.
             data (dict): The associated data.
+            context (Optional[InvocationContext]): The invocation the error belongs to.
 
         Returns:
             dict: A constructed error message.
         """
-
+        context = context or self.context
         return {
             'input_type': self.trigger_type,
-            'origin': self.trigger_event_topic,
+            'origin': context.origin,
             'error': message,
-            'event_id': self.message_id,
-            'data': data or self.trigger_event_data
+            'event_id': context.message_id,
+            'data': data or context.data
         }
 
 
@@ -294,8 +571,16 @@ class BaseHttpOperator(BaseOperator):
         super().__init__()
 
         self.trigger_type = 'http'
-        self.trigger_base_url = None
-        self.trigger_request = None
+
+    @property
+    def trigger_base_url(self) -> Optional[str]:
+        """The base url of the request that triggered the current invocation."""
+        return self.context.origin
+
+    @property
+    def trigger_request(self) -> Optional[dict]:
+        """A summary of the request that triggered the current invocation."""
+        return self.context.data
 
     def execute(self, request):
         """Executes HTTP request processing logic.
@@ -316,36 +601,43 @@ class BaseHttpOperator(BaseOperator):
         Args:
             request (Request): The HTTP request object.
         """
+        context = self.reset()
         self.logger.debug(request)
         try:
-            self.trigger_request = {
+            context.trigger = request
+            context.data = {
                 'url': request.base_url,
                 'method': request.method,
                 'form': request.form.to_dict(),
                 'args': request.args.to_dict(),
                 'data': request.data.decode('utf-8')
             }
-            self.trigger_base_url = request.base_url
+            context.origin = request.base_url
 
             return self.execute(request)
 
         except Exception as e:
-            self.report_error(f'{str(e)}\n{traceback.format_exc()}')
+            self.report_error(f'{str(e)}\n{traceback.format_exc()}', context=context, exception=e)
+
+        finally:
+            self.flush(context)
 
-    def build_error_message(self, message: str, request) -> dict:
+    def build_error_message(self, message: str, request, context: Optional[InvocationContext] = None) -> dict:
         """Builds an error message specific to HTTP operations.
 
         Args:
             message (str): The error message.
             request (Request): The HTTP request object.
+            context (Optional[InvocationContext]): The invocation the error belongs to.
 
         Returns:
             dict: A constructed error message.
         """
+        context = context or self.context
         return {
             'input_type': self.trigger_type,
-            'origin': self.trigger_base_url,
+            'origin': context.origin,
             'error': message,
             'event_id': int(time.time() * 1000),
-            'data': request or self.trigger_request
+            'data': request or context.data
         }
@@ -0,0 +1,51 @@
+
+from typing import Any, Optional
+
+
+class InvocationContext:
+    """Holds the state of a single operator invocation.
+
+    Operators keep hooks and vendor clients on the instance, while everything
+    related to the event or request being processed lives in an invocation
+    context. Each call to `run` creates a new context, which allows a single
+    operator instance to process several events concurrently in threads or
+    coroutines.
+
+    Attributes:
+        trigger_type (str): The type of trigger, `event`, `file` or `http`.
+        message_id (Optional[int]): The ID of the message being processed.
+        origin (Optional[str]): Where the invocation came from, the topic for
+            events, the `bucket/filepath` for files and the base url for HTTP requests.
+        data (Any): The payload of the invocation.
+        trigger (Any): The raw trigger, the cloud event or the HTTP request.
+        attributes (dict): The attributes of the message that triggered an event invocation.
+        has_error (bool): Whether an error was reported during the invocation.
+        pending_messages (set): The messages published asynchronously by the invocation
+            that were not sent yet, flushed at the end of `run`.
+    """
+
+    def __init__(
+        self,
+        trigger_type: Optional[str] = None,
+        message_id: Optional[int] = None,
+        origin: Optional[str] = None,
+        data: Any = None,
+        trigger: Any = None
+    ) -> None:
+        """Initializes the InvocationContext.
+
+        Args:
+            trigger_type (Optional[str]): The type of trigger. Defaults to None.
+            message_id (Optional[int]): The ID of the message. Defaults to None.
+            origin (Optional[str]): The origin of the invocation. Defaults to None.
+            data (Any): The payload of the invocation. Defaults to None.
+            trigger (Any): The raw trigger. Defaults to None.
+        """
+        self.trigger_type = trigger_type
+        self.message_id = message_id
+        self.origin = origin
+        self.data = data
+        self.trigger = trigger
+        self.attributes = {}
+        self.has_error = False
+        self.pending_messages = set()
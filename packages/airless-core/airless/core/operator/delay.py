@@ -7,18 +7,21 @@ from airless.core.operator import BaseEventOperator
 class DelayOperator(BaseEventOperator):
     """Introduces a delay in the processing pipeline.
 
-    This operator sleeps for a specified amount of time in seconds.
-    The maximum delay is capped at 500 seconds.
+    When a `timer_hook` is set, the next tasks are scheduled to be published
+    once the delay is over and the operator returns right away. Otherwise the
+    operator sleeps for a specified amount of time in seconds, capped at 500
+    seconds.
     """
 
     def __init__(self):
         """Initializes the DelayOperator."""
         super().__init__()
+        self.timer_hook = None
 
     def execute(self, data: dict, topic: str) -> None:
         """Executes the delay operation.
 
-        The function sleeps for the number of seconds specified, capping the maximum wait time at 500 seconds.
+        Without a timer hook, the function sleeps for the number of seconds specified, capping the maximum wait time at 500 seconds.
 
         Args:
             data: A dictionary containing a key 'seconds' which determines how many seconds the operator should wait.
@@ -29,5 +32,28 @@ class DelayOperator(BaseEventOperator):
         """
 
         seconds = data['seconds']
+        if self.timer_hook is not None:
+            self.schedule_next(data, max(seconds, 0))
+            return
+
         seconds = max(min(seconds, 500), 0)
         time.sleep(seconds)
+
+    def schedule_next(self, data: dict, seconds: float) -> None:
+        """Schedules the next tasks of the pipeline to run after the delay.
+
+        The tasks are removed from the message metadata, so they are not
+        published again when the execution finishes.
+
+        Args:
+            data (dict): The event data with the next tasks in `metadata.run_next`.
+            seconds (float): Number of seconds to wait before publishing the tasks.
+        """
+        tasks = data.get('metadata', {}).pop('run_next', [])
+        due_at = time.time() + seconds
+        for t in tasks:
+            self.timer_hook.schedule(
+                due_at=due_at,
+                topic=t['topic'],
+                data=t['data'],
+                project=t.get('project'))
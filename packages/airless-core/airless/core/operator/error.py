@@ -1,12 +1,15 @@
 
 import json
 import time
+import uuid
+
+from datetime import datetime
 
 from typing import Dict, Any, Optional
 
 from airless.core.hook import DatalakeHook
 from airless.core.operator import BaseEventOperator
-from airless.core.utils import get_config
+from airless.core.utils import RetryPolicy, error_fingerprint, get_config, parse_error
 
 
 class ErrorReprocessOperator(BaseEventOperator):
@@ -15,7 +18,37 @@ class ErrorReprocessOperator(BaseEventOperator):
     This operator manages the retry logic for events that fail.
     It can reprocess events based on configured retries and intervals,
     and if the maximum retries are exceeded, it saves the error
-    details to the datalake
+    details to the datalake. When a `timer_hook` is set, the retries
+    are scheduled instead of waiting for the interval.
+
+    Retries follow the `RetryPolicy` sent by the operator that failed,
+    overridden by the `retry_policy` of the message metadata. Errors whose
+    `error_type` the policy classifies as permanent are saved right away.
+    Errors reported without `error_type` are classified by their traceback.
+
+    Errors are always saved to the datalake, but notifications can be
+    aggregated by setting the environment variable `ERROR_DIGEST_WINDOW` to a
+    number of seconds. Errors with the same fingerprint, the origin and the
+    normalized exception, are counted in the `state_hook` and only the first
+    one of each window is notified right away. A digest with the count and
+    some samples is sent at the end of the window, scheduled with the
+    `timer_hook` when set, otherwise when the same error happens in a later
+    window. Counts are approximate when several instances run concurrently.
+    A store kept in the memory of an instance would notify the first error of
+    every instance, so digests stay disabled unless the `state_hook` is durable.
+
+    A circuit breaker per origin stops retrying an origin that keeps failing
+    when the environment variable `CIRCUIT_BREAKER_THRESHOLD` is set. After
+    that many consecutive failures, less than `CIRCUIT_BREAKER_COOLDOWN`
+    seconds apart, the circuit opens and the retries are parked in the
+    `state_hook` instead of being republished. A sweep, triggered by the
+    message `{"circuit_sweep": true}` and scheduled with the `timer_hook`,
+    releases one parked message as a probe once the cooldown is over. When
+    no error of the origin arrives during another cooldown the circuit
+    closes and the parked messages are released, otherwise it opens again.
+    Parked messages would be lost by a store kept in the memory of an
+    instance and never released without a sweep, so the breaker stays
+    disabled unless the `state_hook` is durable and a `timer_hook` is set.
     """
     
     def __init__(self):
@@ -26,6 +59,13 @@ class ErrorReprocessOperator(BaseEventOperator):
         """
         super().__init__()
         self.datalake_hook = DatalakeHook()
+        self.timer_hook = None
+        self.digest_window = int(get_config('ERROR_DIGEST_WINDOW', False, '0'))
+        self.circuit_threshold = int(get_config('CIRCUIT_BREAKER_THRESHOLD', False, '0'))
+        self.circuit_cooldown = int(get_config('CIRCUIT_BREAKER_COOLDOWN', False, '300'))
+        self.state_hook = None
+        self._digest_refused = False
+        self._circuit_refused = False
 
     def execute(self, data, topic):
         """Executes the error processing logic for the given data.
@@ -43,7 +83,15 @@ class ErrorReprocessOperator(BaseEventOperator):
         error details to the datalake if maximum retries have
         been exceeded.
         """
-        
+
+        if 'error_digest' in data:
+            self.send_digest(data['error_digest'])
+            return
+
+        if data.get('circuit_sweep'):
+            self.sweep_circuits()
+            return
+
         project = data.get('project')
 
         input_type = data['input_type']
@@ -63,24 +111,40 @@ class ErrorReprocessOperator(BaseEventOperator):
                     # message_id_int remains None
 
         original_data = data['data']
-        metadata = original_data.get('metadata', {})
+        # Messages whose payload could not be decoded, like an expired claim check, cannot be retried
+        metadata = (original_data or {}).get('metadata', {})
 
-        retry_interval = metadata.get('retry_interval', 5)
         retries = metadata.get('retries', 0)
-        max_retries = metadata.get('max_retries', 2)
-        max_interval = metadata.get('max_interval', 480)
+        policy = RetryPolicy.from_metadata(metadata, data.get('retry_policy'))
+        error_types = data.get('error_types') or [data.get('error_type') or parse_error(data.get('error', ''))[0]]
         error_dataset = metadata.get('dataset')
         error_table = metadata.get('table')
 
-        if (input_type == 'event') and (retries < max_retries) and (origin != topic):
-            time.sleep(min(retry_interval ** retries, max_interval))
+        if (input_type == 'event') and (original_data is not None) and (origin != topic) and policy.should_retry(retries, error_types, data.get('error_status')):
+            interval = policy.backoff(retries)
             original_data.setdefault('metadata', {})['retries'] = retries + 1
-            self.queue_hook.publish(
-                project=project or get_config('ERROR_OPERATOR_PROJECT', False),  # if not set, defaults to the function project
-                topic=origin,
-                data=original_data)
+            project = project or get_config('ERROR_OPERATOR_PROJECT', False)  # if not set, defaults to the function project
+
+            if self.trip(origin=origin, project=project, data=original_data):
+                return
+
+            if self.timer_hook is not None:
+                self.timer_hook.schedule(
+                    due_at=time.time() + interval,
+                    topic=origin,
+                    data=original_data,
+                    project=project)
+            else:
+                time.sleep(interval)
+                self.queue_hook.publish(
+                    project=project,
+                    topic=origin,
+                    data=original_data)
 
         else:
+            if (input_type == 'event') and policy.is_permanent(error_types, data.get('error_status')):
+                self.logger.info(f'Error {error_types[0]} of {origin} is permanent, it is not retried')
+
             self.datalake_hook.send_to_landing_zone(
                 data=data,
                 dataset=error_dataset or get_config('ERROR_DATASET'),
@@ -89,8 +153,271 @@ class ErrorReprocessOperator(BaseEventOperator):
                 origin=origin,
                 time_partition=True)
 
-            self._notify_email(origin=origin, message_id=message_id_int, data=data)
-            self._notify_slack(origin=origin, message_id=message_id_int, data=data)
+            if self.aggregate(origin=origin, message_id=message_id_int, data=data):
+                self._notify_email(origin=origin, message_id=message_id_int, data=data)
+                self._notify_slack(origin=origin, message_id=message_id_int, data=data)
+
+    def aggregate(self, origin: str, message_id: Optional[int], data: Dict[str, Any]) -> bool:
+        """Counts an error in the digest of its fingerprint for the current window.
+
+        Args:
+            origin (str): The origin of the error.
+            message_id (Optional[int]): The ID of the message.
+            data (Dict[str, Any]): The error message.
+
+        Returns:
+            bool: Whether the error must be notified right away, which is the case
+                for the first error of each fingerprint in a window.
+        """
+        if not self.digest_enabled():
+            return True
+
+        fingerprint = error_fingerprint(origin, data.get('error', ''))
+        window_start = int(time.time() // self.digest_window * self.digest_window)
+        key = self.digest_key(fingerprint, window_start)
+        ttl = self.digest_window * 3
+
+        digest = self.state_hook.get(key)
+        if digest is not None:
+            digest['count'] += 1
+            if len(digest['samples']) < int(get_config('ERROR_DIGEST_SAMPLES', False, '5')):
+                digest['samples'].append(message_id)
+            self.state_hook.set(key, digest, ttl=ttl)
+            return False
+
+        error_type, error_message = parse_error(data.get('error', ''))
+        self.state_hook.set(key, {
+            'fingerprint': fingerprint,
+            'origin': origin,
+            'error_type': error_type,
+            'error_message': error_message,
+            'window_start': window_start,
+            'count': 1,
+            'samples': [message_id]
+        }, ttl=ttl)
+
+        if self.timer_hook is not None:
+            self.timer_hook.schedule(
+                due_at=window_start + self.digest_window,
+                topic=get_config('QUEUE_TOPIC_ERROR'),
+                data={'error_digest': key})
+        else:
+            self.send_digest(self.digest_key(fingerprint, window_start - self.digest_window))
+        return True
+
+    def digest_enabled(self) -> bool:
+        """Checks if the error digests are enabled and can run with the configured hooks.
+
+        Returns:
+            bool: Whether `ERROR_DIGEST_WINDOW` is set and the `state_hook` is durable.
+        """
+        if self.digest_window <= 0:
+            return False
+        if (self.state_hook is None) or (not self.state_hook.DURABLE):
+            if not self._digest_refused:
+                self.logger.error(
+                    'The error digests are disabled, they require a durable state store, every error is notified')
+                self._digest_refused = True
+            return False
+        return True
+
+    def trip(self, origin: str, project: Optional[str], data: Dict[str, Any]) -> bool:
+        """Counts a failure of an origin and parks the message if its circuit is open.
+
+        Args:
+            origin (str): The topic where the message failed.
+            project (Optional[str]): The project of the topic.
+            data (Dict[str, Any]): The message to retry.
+
+        Returns:
+            bool: Whether the message was parked instead of retried.
+        """
+        if not self.circuit_enabled():
+            return False
+
+        now = time.time()
+        key = self.circuit_key(origin)
+        circuit = self.state_hook.get(key) or {'state': 'closed', 'failures': 0, 'last_failure_at': 0}
+
+        if circuit['state'] == 'closed':
+            if now - circuit['last_failure_at'] > self.circuit_cooldown:
+                circuit['failures'] = 0
+            circuit['failures'] += 1
+            circuit['last_failure_at'] = now
+            if circuit['failures'] < self.circuit_threshold:
+                self.state_hook.set(key, circuit)
+                return False
+            self.logger.warning(f'Opening the circuit of {origin} after {circuit["failures"]} consecutive failures')
+            self.open_circuit(key, circuit, now)
+
+        elif circuit['state'] == 'half_open':
+            self.logger.warning(f'Probe of {origin} failed, opening the circuit again')
+            self.open_circuit(key, circuit, now)
+
+        self.park(origin=origin, project=project, data=data)
+        return True
+
+    def circuit_enabled(self) -> bool:
+        """Checks if the circuit breaker is enabled and can run with the configured hooks.
+
+        Returns:
+            bool: Whether `CIRCUIT_BREAKER_THRESHOLD` is set, the `state_hook` is durable
+                and a `timer_hook` is set.
+        """
+        if self.circuit_threshold <= 0:
+            return False
+        if (self.state_hook is None) or (not self.state_hook.DURABLE) or (self.timer_hook is None):
+            if not self._circuit_refused:
+                self.logger.error(
+                    'The circuit breaker is disabled, it requires a durable state store and a timer store')
+                self._circuit_refused = True
+            return False
+        return True
+
+    def open_circuit(self, key: str, circuit: Dict[str, Any], now: float) -> None:
+        """Opens a circuit and schedules the sweep that probes it after the cooldown.
+
+        Args:
+            key (str): The state key of the circuit.
+            circuit (Dict[str, Any]): The circuit.
+            now (float): The current unix timestamp.
+        """
+        circuit.update(state='open', opened_at=now, last_failure_at=now)
+        self.state_hook.set(key, circuit)
+        self.schedule_sweep(now + self.circuit_cooldown)
+
+    def schedule_sweep(self, due_at: float) -> None:
+        """Schedules a sweep of the circuits.
+
+        Args:
+            due_at (float): The unix timestamp when the sweep runs.
+        """
+        self.timer_hook.schedule(
+            due_at=due_at,
+            topic=get_config('QUEUE_TOPIC_ERROR'),
+            data={'circuit_sweep': True})
+
+    def park(self, origin: str, project: Optional[str], data: Dict[str, Any]) -> None:
+        """Keeps a message in the state store until the circuit of its origin closes.
+
+        Args:
+            origin (str): The topic of the message.
+            project (Optional[str]): The project of the topic.
+            data (Dict[str, Any]): The message.
+        """
+        # Keys start with the time so parked messages are released in order
+        key = f'{self.parked_prefix(origin)}{int(time.time() * 1000):015d}-{uuid.uuid4().hex}'
+        self.state_hook.set(key, {'project': project, 'topic': origin, 'data': data})
+
+    def release(self, origin: str, limit: Optional[int] = None) -> int:
+        """Publishes the parked messages of an origin back to it.
+
+        Args:
+            origin (str): The topic of the messages.
+            limit (Optional[int]): Maximum number of messages to release. Defaults to None,
+                which releases all of them.
+
+        Returns:
+            int: The number of messages released.
+        """
+        released = 0
+        for key in self.state_hook.keys(self.parked_prefix(origin))[:limit]:
+            parked = self.state_hook.get(key)
+            if parked is None:
+                continue
+            self.queue_hook.publish(project=parked['project'], topic=parked['topic'], data=parked['data'])
+            self.state_hook.delete(key)
+            released += 1
+        return released
+
+    def sweep_circuits(self) -> None:
+        """Probes the open circuits whose cooldown is over and closes the ones whose probe succeeded."""
+        if not self.circuit_enabled():
+            return
+
+        now = time.time()
+        for key in self.state_hook.keys('circuit/'):
+            circuit = self.state_hook.get(key)
+            if circuit is None:
+                continue
+            origin = key[len('circuit/'):]
+
+            if (circuit['state'] == 'open') and (now >= circuit['opened_at'] + self.circuit_cooldown):
+                if self.release(origin, limit=1) == 0:
+                    self.state_hook.delete(key)
+                    continue
+                self.logger.info(f'Probing the circuit of {origin}')
+                circuit.update(state='half_open', probe_at=now)
+                self.state_hook.set(key, circuit)
+                self.schedule_sweep(now + self.circuit_cooldown)
+
+            elif (circuit['state'] == 'half_open') and (now >= circuit['probe_at'] + self.circuit_cooldown):
+                # No error arrived since the probe, the circuit is closed before releasing
+                self.state_hook.delete(key)
+                released = self.release(origin)
+                self.logger.info(f'Closed the circuit of {origin}, released {released} parked messages')
+
+    def circuit_key(self, origin: str) -> str:
+        """Builds the state key of the circuit of an origin.
+
+        Args:
+            origin (str): The origin.
+
+        Returns:
+            str: The key.
+        """
+        return f'circuit/{origin}'
+
+    def parked_prefix(self, origin: str) -> str:
+        """Builds the prefix of the state keys of the messages parked for an origin.
+
+        Args:
+            origin (str): The origin.
+
+        Returns:
+            str: The prefix.
+        """
+        return f'circuit-parked/{origin}/'
+
+    def digest_key(self, fingerprint: str, window_start: int) -> str:
+        """Builds the state key of the digest of a fingerprint in a window.
+
+        Args:
+            fingerprint (str): The error fingerprint.
+            window_start (int): The unix timestamp when the window starts.
+
+        Returns:
+            str: The key.
+        """
+        return f'error-digest/{fingerprint}/{window_start}'
+
+    def send_digest(self, key: str) -> None:
+        """Notifies the errors of a window that were not notified yet.
+
+        Args:
+            key (str): The state key of the digest.
+        """
+        if self.state_hook is None:
+            return
+        digest = self.state_hook.get(key)
+        if digest is None:
+            return
+        self.state_hook.delete(key)
+
+        # The first error of the window was already notified
+        if digest['count'] <= 1:
+            return
+
+        window_end = digest['window_start'] + self.digest_window
+        subject = f'{digest["origin"]} | {digest["count"]} errors {digest["error_type"]}'
+        content = (
+            f'Origin: {digest["origin"]}\nFingerprint: {digest["fingerprint"]}\n'
+            f'Window: {datetime.fromtimestamp(digest["window_start"])} - {datetime.fromtimestamp(window_end)}\n'
+            f'Errors: {digest["count"]}\nSample message IDs: {digest["samples"]}\n\n'
+            f'{digest["error_type"]}: {digest["error_message"]}'
+        )
+        self._send_email(origin=digest['origin'], subject=subject, content=content)
+        self._send_slack(origin=digest['origin'], message=f'{subject}\n\n{content}')
 
     def _notify_email(self, origin: str, message_id: Optional[int], data: Dict[str, Any]) -> None:
         """Sends an error notification to email if the env var `QUEUE_TOPIC_EMAIL_SEND` is defined
@@ -100,13 +427,26 @@ class ErrorReprocessOperator(BaseEventOperator):
             message_id (Optional[int]): The ID of the message.
             data (Dict[str, Any]): The data related to the error.
         """
+        self._send_email(
+            origin=origin,
+            subject=f'{origin} | {message_id}',
+            content=f'Input Type: {data.get("input_type")} Origin: {origin}\nMessage ID: {message_id}\n\n {json.dumps(data.get("data"))}\n\n{data.get("error")}')
+
+    def _send_email(self, origin: str, subject: str, content: str) -> None:
+        """Sends an email if the env var `QUEUE_TOPIC_EMAIL_SEND` is defined
+
+        Args:
+            origin (str): The origin of the error, errors of the email topic are not sent by email.
+            subject (str): The subject of the email.
+            content (str): The content of the email.
+        """
         email_send_topic = get_config('QUEUE_TOPIC_EMAIL_SEND', False)
         if email_send_topic and (origin != email_send_topic):
             email_message = {
                 'sender': get_config('EMAIL_SENDER_ERROR'),
                 'recipients': eval(get_config('EMAIL_RECIPIENTS_ERROR')),
-                'subject': f'{origin} | {message_id}',
-                'content': f'Input Type: {data["input_type"]} Origin: {origin}\nMessage ID: {message_id}\n\n {json.dumps(data["data"])}\n\n{data["error"]}'
+                'subject': subject,
+                'content': content
             }
             self.queue_hook.publish(
                 project=get_config('EMAIL_OPERATOR_PROJECT', False),  # if not set, defaults to the function project
@@ -121,11 +461,22 @@ class ErrorReprocessOperator(BaseEventOperator):
             message_id (Optional[int]): The ID of the message.
             data (Dict[str, Any]): The data related to the error.
         """
+        self._send_slack(
+            origin=origin,
+            message=f'{origin} | {message_id}\n\n{json.dumps(data.get("data"))}\n\n{data.get("error")}')
+
+    def _send_slack(self, origin: str, message: str) -> None:
+        """Sends a Slack message if the env var `QUEUE_TOPIC_SLACK_SEND` is defined
+
+        Args:
+            origin (str): The origin of the error, errors of the Slack topic are not sent to Slack.
+            message (str): The message.
+        """
         slack_send_topic = get_config('QUEUE_TOPIC_SLACK_SEND', False)
         if slack_send_topic and (origin != slack_send_topic):
             slack_message = {
                 'channels': eval(get_config('SLACK_CHANNELS_ERROR')),
-                'message': f'{origin} | {message_id}\n\n{json.dumps(data["data"])}\n\n{data["error"]}'
+                'message': message
             }
             self.queue_hook.publish(
                 project=get_config('SLACK_OPERATOR_PROJECT', False),  # if not set, defaults to the function project
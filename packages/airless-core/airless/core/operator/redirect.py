@@ -1,7 +1,10 @@
 
-from typing import Any
+from itertools import chain, islice, product
+from math import ceil, prod
+from typing import Any, Iterator, Optional
 
 from airless.core.operator import BaseEventOperator
+from airless.core.utils import get_config
 
 
 class RedirectOperator(BaseEventOperator):
@@ -11,6 +14,26 @@ class RedirectOperator(BaseEventOperator):
     messages to another topic.
 
     This operator takes a dictionary of event data and publishes messages to a specified topic.
+
+    When the number of messages to publish is above the shard threshold, set by
+    the `shard_threshold` key of the event or the environment variable
+    `REDIRECT_SHARD_THRESHOLD`, the largest list of values is split into shards
+    and one redirect is published back to the operator topic for each shard.
+    The expansion then runs as a tree across many instances in parallel and
+    each leaf publishes its own slice. The number of shards per redirect is
+    capped by `REDIRECT_MAX_SHARDS`, 100 by default.
+
+    Instead of inlining its `values`, a param may reference a file with a
+    `source`, for instance `{"key": "id", "source": {"bucket": "b", "filepath":
+    "ids.ndjson"}}`. The values are then read while the messages are published,
+    so fan-outs are no longer limited by the size of the event. Reading sources
+    is vendor specific and is implemented by `read_values`.
+
+    With sharding enabled, the values of a source are read in chunks of about
+    `shard_threshold` messages and each chunk is published as a shard with
+    inline values, so the largest fan-outs are also split. The number of these
+    shards is only known once the source is read, so they are not capped by
+    `REDIRECT_MAX_SHARDS`. A source that fits in one chunk is inlined instead.
     """
 
     def __init__(self):
@@ -26,7 +49,8 @@ class RedirectOperator(BaseEventOperator):
                 - project (str): The project where the destination queue is hosted.
                 - topic (str): The queue topic to which the newly generated messages will be published.
                 - messages (list): A list of initial messages to publish.
-                - params (list of dict): A list of parameters to modify the messages.
+                - params (list of dict): A list of parameters to modify the messages, each
+                    with a `key` and either a list of `values` or a `source` to read them from.
             topic (str): The topic to publish the messages to.
 
         Returns:
@@ -38,10 +62,245 @@ class RedirectOperator(BaseEventOperator):
         messages = data.get('messages', [{}])
         params = data.get('params', [])
 
-        messages = self.add_params_to_messages(messages, params)
+        shard_threshold = int(data.get('shard_threshold') or get_config('REDIRECT_SHARD_THRESHOLD', False, '0'))
+        if shard_threshold > 0:
+            # The shards are processed by this same operator
+            for index in [i for i, param in enumerate(params) if 'source' in param]:
+                params = self.shard_source(data, params, index, shard_threshold, topic)
+                if params is None:
+                    return
+
+            if self.count_messages(messages, params) > shard_threshold:
+                self.queue_hook.publish_many(None, topic, self.shard({**data, 'params': params}, shard_threshold))
+                return
+
+        # Messages are generated while they are published, so the cross product
+        # of the params is never held in memory
+        messages = self.expand_messages(messages, params)
+
+        self.queue_hook.publish_many(to_project, to_topic, messages)
+
+    def count_messages(self, messages: list, params: list) -> int:
+        """
+        Counts the messages generated by a redirect.
+
+        The values of params read from a source are not known in advance, so each
+        of these params is counted as a single value. With sharding enabled the
+        sources are split by `shard_source` before the messages are counted.
+
+        Args:
+            messages (list): A list of initial messages.
+            params (list of dict): A list of parameter dictionaries, each containing
+                a key and a list of values.
+
+        Returns:
+            int: The number of messages.
+        """
+
+        return len(messages) * prod(len(param['values']) for param in params if 'values' in param)
+
+    def shard_source(self, data: dict, params: list, index: int, shard_threshold: int, topic: str) -> Optional[list]:
+        """
+        Splits a redirect into shards over the values of a param read from a source.
+
+        The source is read once, in chunks of values that generate about
+        `shard_threshold` messages each, and every chunk is published as a shard
+        with the chunk as the inline `values` of the param, while the rest of the
+        source is still being read.
+
+        Args:
+            data (dict): The redirect event data.
+            params (list of dict): The params of the redirect, with the sources already inlined.
+            index (int): The position of the param read from a source.
+            shard_threshold (int): The number of messages a redirect publishes by itself.
+            topic (str): The topic of this operator, where the shards are published.
 
-        for msg in messages:
-            self.queue_hook.publish(to_project, to_topic, msg)
+        Returns:
+            Optional[list]: The params with the values of the source inlined when they fit in a
+                single chunk, otherwise None, once the shards are published.
+        """
+
+        param = {k: v for k, v in params[index].items() if k != 'source'}
+        chunk_size = max(shard_threshold // max(self.count_messages(data.get('messages', [{}]), params), 1), 1)
+        values = iter(self.read_values(params[index]['source']))
+        chunks = iter(lambda: list(islice(values, chunk_size)), [])
+
+        first = next(chunks, [])
+        second = next(chunks, None)
+        if second is None:
+            return [{**param, 'values': first} if i == index else p for i, p in enumerate(params)]
+
+        base = self.shard_base(data)
+        shards = (
+            {**base, 'params': [{**param, 'values': chunk} if i == index else p for i, p in enumerate(params)]}
+            for chunk in chain([first, second], chunks)
+        )
+        self.queue_hook.publish_many(None, topic, shards)
+        return None
+
+    def shard_base(self, data: dict) -> dict:
+        """
+        Builds the event data shared by the shards of a redirect.
+
+        Args:
+            data (dict): The redirect event data.
+
+        Returns:
+            dict: The event data without the next tasks, which only run once after
+                the original redirect.
+        """
+
+        base = data.copy()
+        metadata = {k: v for k, v in data.get('metadata', {}).items() if k != 'run_next'}
+        if metadata:
+            base['metadata'] = metadata
+        else:
+            base.pop('metadata', None)
+        return base
+
+    def shard(self, data: dict, shard_threshold: int) -> Iterator[dict]:
+        """
+        Splits a redirect into smaller redirects over the largest list of values.
+
+        Params read from a source are never split, every shard reads the whole source.
+
+        Args:
+            data (dict): The redirect event data.
+            shard_threshold (int): The number of messages a redirect publishes by itself.
+
+        Yields:
+            dict: The event data of each shard, without the next tasks, which only
+                run once after the original redirect.
+        """
+
+        messages = data.get('messages', [{}])
+        params = data.get('params', [])
+        axes = [messages] + [param.get('values', []) for param in params]
+        axis_index = max(range(len(axes)), key=lambda i: len(axes[i]))
+        axis = axes[axis_index]
+
+        total = self.count_messages(messages, params)
+        # At least two shards, otherwise the same redirect would be published again
+        max_shards = max(int(get_config('REDIRECT_MAX_SHARDS', False, '100')), 2)
+        shard_count = min(len(axis), ceil(total / shard_threshold), max_shards)
+        shard_size = ceil(len(axis) / shard_count)
+
+        base = self.shard_base(data)
+        for start in range(0, len(axis), shard_size):
+            shard = base.copy()
+            if axis_index == 0:
+                shard['messages'] = axis[start:start + shard_size]
+            else:
+                shard['params'] = [
+                    {**param, 'values': axis[start:start + shard_size]} if i == axis_index - 1 else param
+                    for i, param in enumerate(params)
+                ]
+            yield shard
+
+    def expand_messages(self, messages: list, params: list) -> Iterator[dict]:
+        """
+        Lazily generates every combination of the messages with the values of the params.
+
+        The combinations are yielded in the same order as `add_params_to_messages`
+        returns them, and each generated message is built with a single copy of
+        the nested dictionaries it changes.
+
+        `itertools.product` keeps a copy of every list of values, so params read
+        from a source are expanded by `iter_product` instead, which streams the
+        values of the first source and reads every other source once.
+
+        Args:
+            messages (list): A list of initial messages.
+            params (list of dict): A list of parameter dictionaries, each containing
+                a key and either a list of values or a source.
+
+        Yields:
+            dict: A message with one value of each param added.
+        """
+
+        keys = [param['key'].split('.') for param in params]
+        if all('values' in param for param in params):
+            combinations = product(messages, *[param['values'] for param in params])
+        else:
+            combinations = self.iter_product(messages, params)
+
+        for message, *values in combinations:
+            yield self.build_message(message, keys, values)
+
+    def iter_product(self, messages: list, params: list) -> Iterator[tuple]:
+        """
+        Lazily generates every combination of the messages with the values of params read from sources.
+
+        Each source is read once. The values of the first param read from a
+        source are streamed in the outermost loop, while the values of the other
+        sources are kept in memory, so the largest source should come first. The
+        combinations are yielded in a different order than `itertools.product`.
+
+        Args:
+            messages (list): A list of initial messages.
+            params (list of dict): A list of parameter dictionaries, with at least one source.
+
+        Yields:
+            tuple: A message and one value of each param.
+        """
+
+        streamed = next(i for i, param in enumerate(params) if 'source' in param)
+        axes = [messages] + [
+            param['values'] if 'values' in param else list(self.read_values(param['source']))
+            for i, param in enumerate(params) if i != streamed
+        ]
+        for value in self.read_values(params[streamed]['source']):
+            for message, *values in product(*axes):
+                values.insert(streamed, value)
+                yield (message, *values)
+
+    def read_values(self, source: dict) -> Iterator[Any]:
+        """
+        Reads the values of a param from a file.
+
+        Args:
+            source (dict): The location of the values, as defined by each vendor.
+
+        Raises:
+            NotImplementedError: This method needs to be implemented in a subclass.
+
+        Yields:
+            Any: The values of the param.
+        """
+        raise NotImplementedError()
+
+    def build_message(self, message: dict, keys: list, values: list) -> dict:
+        """
+        Builds a message with several values added at their key paths.
+
+        Only the dictionaries along the key paths are copied, the rest of the
+        message is shared with the original one.
+
+        Args:
+            message (dict): The original message.
+            keys (list): The key path of each value, as lists of keys.
+            values (list): The values to add.
+
+        Returns:
+            dict: A new message with the values added.
+        """
+
+        new_message = message.copy()
+        copied = {id(new_message)}
+        for key_path, value in zip(keys, values):
+            obj = new_message
+            for key in key_path[:-1]:
+                nested_obj = obj.get(key)
+                if not isinstance(nested_obj, dict):
+                    nested_obj = {}
+                    copied.add(id(nested_obj))
+                elif id(nested_obj) not in copied:
+                    nested_obj = nested_obj.copy()
+                    copied.add(id(nested_obj))
+                obj[key] = nested_obj
+                obj = nested_obj
+            obj[key_path[-1]] = value
+        return new_message
 
     def add_params_to_messages(self, messages: list, params: list) -> list:
         """
@@ -56,9 +315,7 @@ class RedirectOperator(BaseEventOperator):
             list: A list of messages with the parameters added.
         """
 
-        for param in params:
-            messages = self.add_param_to_messages(messages, param)
-        return messages
+        return list(self.expand_messages(messages, params))
 
     def add_param_to_messages(self, messages: list, param: dict) -> list:
         """
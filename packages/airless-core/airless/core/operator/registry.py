@@ -0,0 +1,57 @@
+from typing import Type, Union
+
+from airless.core.utils import EntryPointRegistry
+from airless.core.operator.base import BaseOperator
+
+
+class OperatorRegistry(EntryPointRegistry):
+    """Registry of the operators that can be run by name.
+
+    Packages declare their operators as entry points of the `airless.operators`
+    group, mapping a name to the import path of the operator class:
+
+        [project.entry-points."airless.operators"]
+        GoogleDelayOperator = "airless.google.cloud.core.operator:GoogleDelayOperator"
+
+    Operators that are not installed as entry points, like the ones defined in
+    the deployment source code, must be registered explicitly, with the class
+    or its import path, `module:Class`. Operator classes are only imported when
+    they are first requested, and only subclasses of `BaseOperator` are
+    returned, so a name never imports or instantiates anything else.
+    """
+
+    ENTRY_POINT_GROUP = 'airless.operators'
+    KIND = 'Operator'
+
+    def base_class(self) -> type:
+        """Gets the class every operator must subclass.
+
+        Returns:
+            type: `BaseOperator`.
+        """
+        return BaseOperator
+
+
+_registry = OperatorRegistry()
+
+
+def register_operator(name: str, target: Union[str, type]) -> None:
+    """Registers an operator in the process-wide operator registry.
+
+    Args:
+        name (str): The name used to reference the operator.
+        target (Union[str, type]): The operator class or its import path, `module:Class`.
+    """
+    _registry.register(name, target)
+
+
+def get_operator(name: str) -> Type:
+    """Gets an operator class from the process-wide operator registry.
+
+    Args:
+        name (str): The registered name of the operator.
+
+    Returns:
+        Type: The operator class.
+    """
+    return _registry.get(name)
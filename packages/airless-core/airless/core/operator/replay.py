@@ -0,0 +1,199 @@
+
+import argparse
+import copy
+
+from collections import deque
+from datetime import datetime
+from itertools import islice
+from typing import Any, Dict, Iterator, List, Optional
+
+from airless.core.hook import DatalakeHook
+from airless.core.operator import BaseEventOperator
+from airless.core.utils import RateLimiter, error_fingerprint, get_config, json_loads
+
+
+class ErrorReplayOperator(BaseEventOperator):
+    """Republishes the errors saved to the datalake by the `ErrorReprocessOperator`.
+
+    Errors of events that exceeded their retries are read from the landing
+    zone of `ERROR_DATASET`.`ERROR_TABLE` between two dates, optionally
+    filtered by origin and fingerprint, and their original messages are
+    published back to the origin topic with `retries` reset to 0.
+
+    Messages are published at most `rate` per second, with at most
+    `concurrency` of them waiting to be sent, set by the environment variables
+    `ERROR_REPLAY_RATE` and `ERROR_REPLAY_CONCURRENCY` or by the request, so a
+    large backlog does not overwhelm the origin and the APIs it calls. Replays
+    that take longer than the function timeout can be run with `cli`.
+    """
+
+    def __init__(self):
+        """Initializes the ErrorReplayOperator."""
+        super().__init__()
+        self.datalake_hook = DatalakeHook()  # Have to redefine this attribute for each vendor
+
+    def execute(self, data: dict, topic: str) -> None:
+        """Replays the errors selected by the request.
+
+        Args:
+            data (dict): The request, with `start` and optionally `end`, both ISO dates,
+                `origin`, `fingerprint`, `limit`, `rate`, `concurrency`, `dataset`, `table`
+                and `dry_run`.
+            topic (str): The topic from which the event is received.
+        """
+        replayed = self.replay(
+            start=datetime.fromisoformat(data['start']),
+            end=datetime.fromisoformat(data['end']) if data.get('end') else None,
+            origin=data.get('origin'),
+            fingerprint=data.get('fingerprint'),
+            limit=data.get('limit'),
+            rate=data.get('rate'),
+            concurrency=data.get('concurrency'),
+            dataset=data.get('dataset'),
+            table=data.get('table'),
+            dry_run=data.get('dry_run', False))
+        self.logger.info(f'Replayed {replayed} errors')
+
+    def read_errors(
+        self,
+        start: datetime,
+        end: Optional[datetime] = None,
+        origin: Optional[str] = None,
+        fingerprint: Optional[str] = None,
+        dataset: Optional[str] = None,
+        table: Optional[str] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """Reads the error messages that can be replayed.
+
+        Only errors of events are returned, errors of files and HTTP requests
+        do not have a topic to be published to. Errors without the original
+        message, such as those of events that could not be decoded, are
+        logged and skipped.
+
+        Args:
+            start (datetime): The first error time.
+            end (Optional[datetime]): The last error time. Defaults to now.
+            origin (Optional[str]): Only errors of this origin. Defaults to None.
+            fingerprint (Optional[str]): Only errors with this `error_fingerprint`. Defaults to None.
+            dataset (Optional[str]): The dataset of the errors. Defaults to `ERROR_DATASET`.
+            table (Optional[str]): The table of the errors. Defaults to `ERROR_TABLE`.
+
+        Returns:
+            Iterator[Dict[str, Any]]: The error messages sent to the `ErrorReprocessOperator`.
+        """
+        rows = self.datalake_hook.read_landing_zone(
+            dataset=dataset or get_config('ERROR_DATASET'),
+            table=table or get_config('ERROR_TABLE'),
+            start=start,
+            end=end or datetime.now())
+
+        for row in rows:
+            if origin and (row['_resource'] != origin):
+                continue
+            error = json_loads(row['_json'])['data']
+            if error.get('input_type') != 'event':
+                continue
+            if fingerprint and (error_fingerprint(error.get('origin', 'undefined'), error.get('error', '')) != fingerprint):
+                continue
+            if not isinstance(error.get('data'), dict):
+                # Events that could not be decoded have no message to be republished
+                self.logger.warning(f'Skipping error of event {row["_event_id"]} from {row["_resource"]} without a message')
+                continue
+            yield error
+
+    def rebuild_message(self, error: Dict[str, Any]) -> Dict[str, Any]:
+        """Rebuilds the original message of an error, with its retries reset.
+
+        Args:
+            error (Dict[str, Any]): The error message.
+
+        Returns:
+            Dict[str, Any]: The original message.
+        """
+        message = copy.deepcopy(error['data'])
+        message.setdefault('metadata', {})['retries'] = 0
+        return message
+
+    def replay(
+        self,
+        start: datetime,
+        end: Optional[datetime] = None,
+        origin: Optional[str] = None,
+        fingerprint: Optional[str] = None,
+        limit: Optional[int] = None,
+        rate: Optional[float] = None,
+        concurrency: Optional[int] = None,
+        dataset: Optional[str] = None,
+        table: Optional[str] = None,
+        dry_run: bool = False
+    ) -> int:
+        """Republishes the original messages of the errors to their origin.
+
+        Args:
+            start (datetime): The first error time.
+            end (Optional[datetime]): The last error time. Defaults to now.
+            origin (Optional[str]): Only errors of this origin. Defaults to None.
+            fingerprint (Optional[str]): Only errors with this fingerprint. Defaults to None.
+            limit (Optional[int]): Maximum number of errors to replay. Defaults to None.
+            rate (Optional[float]): Maximum messages per second. Defaults to `ERROR_REPLAY_RATE` or 100.
+            concurrency (Optional[int]): Maximum messages waiting to be sent. Defaults to
+                `ERROR_REPLAY_CONCURRENCY` or 100.
+            dataset (Optional[str]): The dataset of the errors. Defaults to `ERROR_DATASET`.
+            table (Optional[str]): The table of the errors. Defaults to `ERROR_TABLE`.
+            dry_run (bool): Only counts the errors, without publishing them. Defaults to False.
+
+        Returns:
+            int: The number of errors replayed.
+        """
+        limiter = RateLimiter(rate or float(get_config('ERROR_REPLAY_RATE', False, '100')))
+        concurrency = concurrency or int(get_config('ERROR_REPLAY_CONCURRENCY', False, '100'))
+        default_project = get_config('ERROR_OPERATOR_PROJECT', False)  # if not set, defaults to the function project
+
+        errors = islice(self.read_errors(start, end, origin, fingerprint, dataset, table), limit)
+        pending = deque()
+        replayed = 0
+        for error in errors:
+            replayed += 1
+            if dry_run:
+                continue
+
+            limiter.acquire()
+            pending.append(self.queue_hook.publish_async(
+                project=error.get('project') or default_project,
+                topic=error['origin'],
+                data=self.rebuild_message(error)))
+            if len(pending) >= concurrency:
+                pending.popleft().result()
+
+        for future in pending:
+            future.result()
+        return replayed
+
+    @classmethod
+    def cli(cls, argv: Optional[List[str]] = None) -> int:
+        """Replays errors from the command line, for replays longer than the function timeout.
+
+        Args:
+            argv (Optional[List[str]]): The command line arguments. Defaults to `sys.argv`.
+
+        Returns:
+            int: The number of errors replayed.
+        """
+        parser = argparse.ArgumentParser(description='Republishes the errors saved to the datalake to their origin.')
+        parser.add_argument('--start', required=True, type=datetime.fromisoformat, help='First error time, ISO format')
+        parser.add_argument('--end', type=datetime.fromisoformat, help='Last error time, ISO format. Defaults to now')
+        parser.add_argument('--origin', help='Only errors of this origin topic')
+        parser.add_argument('--fingerprint', help='Only errors with this fingerprint')
+        parser.add_argument('--limit', type=int, help='Maximum number of errors to replay')
+        parser.add_argument('--rate', type=float, help='Maximum messages per second')
+        parser.add_argument('--concurrency', type=int, help='Maximum messages waiting to be sent')
+        parser.add_argument('--dataset', help='Dataset of the errors. Defaults to ERROR_DATASET')
+        parser.add_argument('--table', help='Table of the errors. Defaults to ERROR_TABLE')
+        parser.add_argument('--dry-run', action='store_true', help='Only count the errors')
+        args = parser.parse_args(argv)
+
+        operator = cls()
+        replayed = operator.replay(**vars(args))
+        operator.queue_hook.flush()
+        print(f'{"Found" if args.dry_run else "Replayed"} {replayed} errors')
+        return replayed
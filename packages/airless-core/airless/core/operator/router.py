@@ -0,0 +1,170 @@
+import json
+import threading
+
+from contextvars import ContextVar
+from typing import Dict, Optional
+
+from airless.core import BaseClass
+from airless.core.hook import QueueHook
+from airless.core.utils import RetryPolicy, get_config
+from airless.core.operator.base import BaseEventOperator, BaseOperator
+from airless.core.operator.registry import OperatorRegistry, _registry
+
+
+# The error that prevented the router from finding the operator of the current event
+_routing_error: ContextVar[Optional[Exception]] = ContextVar('airless_routing_error', default=None)
+
+
+class UnroutedEventOperator(BaseEventOperator):
+    """Reports the events the router could not find an operator for.
+
+    The event is decoded like any other, and the routing error is raised by
+    `execute`, so it is reported to `QUEUE_TOPIC_ERROR` with the data of the
+    message, which can be replayed once the routes are fixed.
+    """
+
+    # The same event would fail to be routed again until the configuration changes
+    retry_policy = RetryPolicy(permanent=['KeyError', 'TypeError', 'ImportError', 'AttributeError'])
+
+    def execute(self, data: dict, topic: str) -> None:
+        """Raises the routing error of the current event.
+
+        Args:
+            data (dict): The data of the message.
+            topic (str): The topic from which the message is received.
+        """
+        raise _routing_error.get() or KeyError(f'No operator found for the event from {topic}')
+
+
+class OperatorRouter(BaseClass):
+    """Dispatches cloud events to the operator responsible for them.
+
+    A single deployment can host several operators, which avoids a separate
+    cold-starting function for each low-traffic operator. The operator of an
+    event is resolved, in order, from:
+
+      - The message attribute named `route_attribute`, for Pub/Sub events.
+      - The routes, which map a topic or a bucket to an operator.
+      - The default operator.
+
+    Operators are referenced by their registered name, see `OperatorRegistry`,
+    and are only imported and instantiated when the first event for them
+    arrives. Each operator instance is then reused by the following
+    invocations. The routes and the default operator may also be import paths,
+    `module:Class`, which are registered when the router is created, while
+    message attributes can only name registered operators.
+
+    Events without an operator, or whose operator cannot be loaded, are logged
+    and reported to `QUEUE_TOPIC_ERROR` with the `queue_hook`, like the errors
+    of the operators, instead of being dropped.
+    """
+
+    def __init__(
+        self,
+        routes: Optional[Dict[str, str]] = None,
+        default: Optional[str] = None,
+        route_attribute: Optional[str] = None,
+        registry: Optional[OperatorRegistry] = None,
+        queue_hook: Optional[QueueHook] = None
+    ) -> None:
+        """Initializes the OperatorRouter.
+
+        Note:
+            When not set explicitly, the arguments are read from the environment variables:
+
+              - OPERATOR_ROUTES: A JSON object mapping topics or buckets to operators.
+              - OPERATOR: The default operator.
+              - OPERATOR_ROUTE_ATTRIBUTE: The message attribute with the operator, defaults to `operator`.
+
+        Args:
+            routes (Optional[Dict[str, str]]): Maps a topic or bucket to an operator. Defaults to None.
+            default (Optional[str]): The operator used when no route matches. Defaults to None.
+            route_attribute (Optional[str]): The message attribute that names the operator. Defaults to None.
+            registry (Optional[OperatorRegistry]): The registry used to find the operators.
+                Defaults to the process-wide registry.
+            queue_hook (Optional[QueueHook]): The queue where events that cannot be routed are
+                reported, the queue of the vendor. Defaults to None, the `QueueHook` base class.
+        """
+        super().__init__()
+        self.routes = routes if routes is not None else json.loads(get_config('OPERATOR_ROUTES', False, '{}'))
+        self.default = default or get_config('OPERATOR', False)
+        self.route_attribute = route_attribute or get_config('OPERATOR_ROUTE_ATTRIBUTE', False, 'operator')
+        self.registry = registry or _registry
+        self._operators: Dict[str, BaseOperator] = {}
+        self._lock = threading.Lock()
+        self.unrouted_operator = UnroutedEventOperator()
+        if queue_hook is not None:
+            self.unrouted_operator.queue_hook = queue_hook
+
+        # Import paths are only trusted in the configuration, not in the messages
+        for name in [*self.routes.values(), self.default]:
+            if name and (':' in name):
+                self.registry.register(name, name)
+
+    def resolve(self, cloud_event) -> str:
+        """Finds the operator responsible for a cloud event.
+
+        Args:
+            cloud_event (CloudEvent): The cloud event to route.
+
+        Raises:
+            KeyError: If no operator matches the event.
+
+        Returns:
+            str: The name of the operator.
+        """
+        data = cloud_event.data if isinstance(cloud_event.data, dict) else {}
+        attributes = (data.get('message') or {}).get('attributes') or {}
+        if attributes.get(self.route_attribute):
+            return attributes[self.route_attribute]
+
+        origin = (cloud_event.get('source') or '').split('/')[-1]
+        if origin in self.routes:
+            return self.routes[origin]
+
+        if self.default:
+            return self.default
+
+        raise KeyError(f'No operator found for the event from {origin}')
+
+    def get_operator(self, name: str) -> BaseOperator:
+        """Gets the operator instance for a name, creating it on first use.
+
+        Args:
+            name (str): The registered name of the operator.
+
+        Returns:
+            BaseOperator: The operator instance shared by all invocations.
+        """
+        operator = self._operators.get(name)
+        if operator is not None:
+            return operator
+
+        with self._lock:
+            operator = self._operators.get(name)
+            if operator is None:
+                self.logger.debug(f'Loading operator {name}')
+                operator = self.registry.get(name)()
+                self._operators[name] = operator
+        return operator
+
+    def run(self, cloud_event) -> None:
+        """Runs the operator responsible for a cloud event.
+
+        Events that cannot be routed are reported to `QUEUE_TOPIC_ERROR`.
+
+        Args:
+            cloud_event (CloudEvent): The cloud event to process.
+        """
+        try:
+            operator = self.get_operator(self.resolve(cloud_event))
+        except (KeyError, TypeError, ImportError, AttributeError) as e:
+            self.logger.error(f'Could not route the event {cloud_event.get("id")}: {e}')
+            token = _routing_error.set(e)
+            try:
+                self.unrouted_operator.run(cloud_event)
+            finally:
+                _routing_error.reset(token)
+            return
+
+        operator.run(cloud_event)
@@ -0,0 +1,49 @@
+
+from airless.core.hook import TimerHook
+from airless.core.operator import BaseEventOperator
+
+
+class TimerSweepOperator(BaseEventOperator):
+    """Publishes the timers that are due.
+
+    This operator is meant to be triggered periodically, for instance by a
+    scheduler publishing to its topic every minute. Timers are published in
+    batches and only acknowledged after they are published, so the delays are
+    as precise as the sweep interval.
+    """
+
+    def __init__(self):
+        """Initializes the TimerSweepOperator."""
+        super().__init__()
+        self.timer_hook = TimerHook()  # Have to redefine this attribute for each vendor
+
+    def execute(self, data: dict, topic: str) -> None:
+        """Publishes all due timers.
+
+        Args:
+            data (dict): The event data, optionally with `batch_size`, the number of
+                timers published at a time. Defaults to 500.
+            topic (str): The topic from which the event is received.
+        """
+        batch_size = data.get('batch_size', 500)
+
+        published = 0
+        while True:
+            timers = self.timer_hook.due(limit=batch_size)
+            futures = [
+                self.queue_hook.publish_async(
+                    project=timer['project'],
+                    topic=timer['topic'],
+                    data=timer['data'])
+                for timer in timers
+            ]
+            # Timers are only acknowledged once they are published, the ones that
+            # failed are kept for the next sweep and the error is reported on flush
+            acked = [t['id'] for t, f in zip(timers, futures) if f.exception() is None]
+            self.timer_hook.ack(acked)
+            published += len(acked)
+
+            if len(timers) < batch_size or len(acked) < len(timers):
+                break
+
+        self.logger.debug(f'Published {published} due timers')
@@ -1,7 +1,37 @@
+from .client import (ClientRegistry, clear_clients, get_client)
+from .codec import (JsonCodec, get_json_codec, set_json_codec, json_dumpb, json_dumps, json_dumps_persisted, json_loads)
+from .compression import (compress, decompress)
 from .config import (get_config)
 from .enum import (BaseEnum)
+from .fingerprint import (error_fingerprint, normalize_error_message, parse_error)
+from .lazy import (imported_modules, lazy_exports)
+from .rate_limit import (RateLimiter)
+from .registry import (EntryPointRegistry)
+from .retry import (RetryPolicy, exception_status, exception_types)
 
 __all__ = [
+    'ClientRegistry',
+    'clear_clients',
+    'get_client',
+    'JsonCodec',
+    'get_json_codec',
+    'set_json_codec',
+    'json_dumpb',
+    'json_dumps',
+    'json_dumps_persisted',
+    'json_loads',
+    'compress',
+    'decompress',
     'get_config',
-    'BaseEnum'
+    'BaseEnum',
+    'error_fingerprint',
+    'normalize_error_message',
+    'parse_error',
+    'imported_modules',
+    'lazy_exports',
+    'RateLimiter',
+    'EntryPointRegistry',
+    'RetryPolicy',
+    'exception_status',
+    'exception_types'
 ]
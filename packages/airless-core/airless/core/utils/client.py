@@ -0,0 +1,83 @@
+import threading
+
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+
+class ClientRegistry:
+    """Thread-safe registry of vendor clients shared by all hooks of a process.
+
+    Clients are created lazily on the first request for a given client type and
+    project and the same instance is returned afterwards, so several hooks of the
+    same operator share gRPC channels, HTTP sessions and credential caches.
+    """
+
+    def __init__(self) -> None:
+        """Initializes the ClientRegistry."""
+        self._clients: Dict[Tuple[Hashable, Optional[Hashable]], Any] = {}
+        self._locks: Dict[Tuple[Hashable, Optional[Hashable]], threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    def get(self, client_type: Hashable, project: Optional[Hashable] = None, factory: Optional[Callable[[], Any]] = None) -> Any:
+        """Gets the client for a client type and project, creating it if needed.
+
+        Args:
+            client_type (Hashable): The client class, or any hashable identifying the client.
+            project (Optional[Hashable]): The project the client is bound to. Defaults to None,
+                which means the default project resolved by the vendor library.
+            factory (Optional[Callable[[], Any]]): Function that builds the client. Defaults to
+                calling `client_type` with the `project` keyword argument when a project is set.
+
+        Returns:
+            Any: The shared client instance.
+        """
+        key = (client_type, project)
+        client = self._clients.get(key)
+        if client is not None:
+            return client
+
+        with self._lock:
+            lock = self._locks.setdefault(key, threading.Lock())
+
+        # A lock per key prevents building the same client twice without
+        # blocking the creation of unrelated clients
+        with lock:
+            client = self._clients.get(key)
+            if client is None:
+                client = self._build(client_type, project, factory)
+                self._clients[key] = client
+        return client
+
+    def clear(self) -> None:
+        """Removes all clients from the registry."""
+        with self._lock:
+            self._clients.clear()
+            self._locks.clear()
+
+    def _build(self, client_type: Hashable, project: Optional[Hashable], factory: Optional[Callable[[], Any]]) -> Any:
+        if factory:
+            return factory()
+        if project:
+            return client_type(project=project)
+        return client_type()
+
+
+_registry = ClientRegistry()
+
+
+def get_client(client_type: Hashable, project: Optional[Hashable] = None, factory: Optional[Callable[[], Any]] = None) -> Any:
+    """Gets a vendor client from the process-wide client registry.
+
+    Args:
+        client_type (Hashable): The client class, or any hashable identifying the client.
+        project (Optional[Hashable]): The project the client is bound to. Defaults to None.
+        factory (Optional[Callable[[], Any]]): Function that builds the client. Defaults to None.
+
+    Returns:
+        Any: The shared client instance.
+    """
+    return _registry.get(client_type, project, factory)
+
+
+def clear_clients() -> None:
+    """Removes all clients from the process-wide client registry."""
+    _registry.clear()
@@ -0,0 +1,216 @@
+import json
+import threading
+
+from typing import Any, Optional, Union
+
+from .config import get_config
+
+
+JSON_CODECS = ('orjson', 'msgspec', 'json')
+
+
+class JsonCodec:
+    """Encodes and decodes JSON with the fastest library installed.
+
+    `orjson` is used when installed, then `msgspec` and finally the standard
+    library. The library can be forced with the environment variable
+    `JSON_CODEC`. Every library produces the same compact output, and values
+    that are not JSON serializable are converted with `str`, like
+    `json.dumps(default=str)`, so datetimes keep their `str` format.
+
+    `msgspec` always encodes datetimes in ISO format, so it is only used to
+    decode. `orjson` reads integers above 64 bits as floats, set `JSON_CODEC`
+    to `json` if the payloads carry them.
+
+    The JSON saved in the `_json` columns of the datalake and BigQuery is
+    encoded by `dumps_persisted` exactly like `json.dumps(default=str)` did,
+    with spaces after separators and escaped non-ASCII characters, so rows
+    written by previous versions compare equal. Setting the environment
+    variable `JSON_PERSISTED_COMPACT` to `true` writes them with the compact
+    output of the codec instead, which is faster but changes the stored text.
+    """
+
+    def __init__(self, name: Optional[str] = None) -> None:
+        """Initializes the JsonCodec.
+
+        Args:
+            name (Optional[str]): The library to use, one of `orjson`, `msgspec`
+                or `json`. Defaults to `JSON_CODEC` or the fastest library installed.
+
+        Raises:
+            ValueError: If the library is not supported.
+        """
+        self.name = name or get_config('JSON_CODEC', False) or self.detect()
+        if self.name not in JSON_CODECS:
+            raise ValueError(f'Unsupported JSON codec {self.name}, use one of {JSON_CODECS}')
+        self.persisted_compact = get_config('JSON_PERSISTED_COMPACT', False, 'false').lower() == 'true'
+
+        self._dumpb = self._dumpb_stdlib
+        self._loads = json.loads
+        if self.name == 'orjson':
+            import orjson
+            self._orjson = orjson
+            # Datetimes and dataclasses are passed to `str` like the standard library does
+            self._orjson_options = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS
+            self._dumpb = self._dumpb_orjson
+            self._loads = orjson.loads
+        elif self.name == 'msgspec':
+            import msgspec
+            self._loads = msgspec.json.decode
+
+    @staticmethod
+    def detect() -> str:
+        """Finds the fastest JSON library installed.
+
+        Returns:
+            str: The name of the library.
+        """
+        import importlib.util
+
+        for name in JSON_CODECS[:-1]:
+            if importlib.util.find_spec(name) is not None:
+                return name
+        return 'json'
+
+    def dumpb(self, obj: Any) -> bytes:
+        """Encodes an object as UTF-8 JSON.
+
+        Args:
+            obj (Any): The object to encode.
+
+        Returns:
+            bytes: The encoded object.
+        """
+        return self._dumpb(obj)
+
+    def dumps(self, obj: Any) -> str:
+        """Encodes an object as a JSON string.
+
+        Args:
+            obj (Any): The object to encode.
+
+        Returns:
+            str: The encoded object.
+        """
+        return self._dumpb(obj).decode('utf-8')
+
+    def dumps_persisted(self, obj: Any) -> str:
+        """Encodes an object as the JSON string saved in the datalake and BigQuery.
+
+        Args:
+            obj (Any): The object to encode.
+
+        Returns:
+            str: The encoded object, like `json.dumps(default=str)` unless
+                `JSON_PERSISTED_COMPACT` is set.
+        """
+        if self.persisted_compact:
+            return self.dumps(obj)
+        return json.dumps(obj, default=str)
+
+    def loads(self, data: Union[str, bytes]) -> Any:
+        """Decodes a JSON document.
+
+        Args:
+            data (Union[str, bytes]): The document to decode.
+
+        Returns:
+            Any: The decoded object.
+        """
+        try:
+            return self._loads(data)
+        except ValueError:
+            # The standard library also accepts NaN and Infinity, and raises the usual error otherwise
+            return json.loads(data)
+
+    def _dumpb_stdlib(self, obj: Any) -> bytes:
+        return json.dumps(obj, default=str, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+    def _dumpb_orjson(self, obj: Any) -> bytes:
+        try:
+            return self._orjson.dumps(obj, default=str, option=self._orjson_options)
+        except TypeError:
+            # Integers above 64 bits and keys orjson cannot convert
+            return self._dumpb_stdlib(obj)
+
+
+_codec: Optional[JsonCodec] = None
+_codec_lock = threading.Lock()
+
+
+def get_json_codec() -> JsonCodec:
+    """Gets the JSON codec of the process, created on first use.
+
+    Returns:
+        JsonCodec: The JSON codec.
+    """
+    global _codec
+    if _codec is None:
+        with _codec_lock:
+            if _codec is None:
+                _codec = JsonCodec()
+    return _codec
+
+
+def set_json_codec(name: Optional[str] = None) -> JsonCodec:
+    """Replaces the JSON codec of the process.
+
+    Args:
+        name (Optional[str]): The library to use. Defaults to `JSON_CODEC` or the
+            fastest library installed.
+
+    Returns:
+        JsonCodec: The new JSON codec.
+    """
+    global _codec
+    with _codec_lock:
+        _codec = JsonCodec(name)
+    return _codec
+
+
+def json_dumpb(obj: Any) -> bytes:
+    """Encodes an object as UTF-8 JSON with the codec of the process.
+
+    Args:
+        obj (Any): The object to encode.
+
+    Returns:
+        bytes: The encoded object.
+    """
+    return get_json_codec().dumpb(obj)
+
+
+def json_dumps(obj: Any) -> str:
+    """Encodes an object as a JSON string with the codec of the process.
+
+    Args:
+        obj (Any): The object to encode.
+
+    Returns:
+        str: The encoded object.
+    """
+    return get_json_codec().dumps(obj)
+
+
+def json_dumps_persisted(obj: Any) -> str:
+    """Encodes an object as the JSON string saved in the datalake and BigQuery.
+
+    Args:
+        obj (Any): The object to encode.
+
+    Returns:
+        str: The encoded object.
+    """
+    return get_json_codec().dumps_persisted(obj)
+
+
+def json_loads(data: Union[str, bytes]) -> Any:
+    """Decodes a JSON document with the codec of the process.
+
+    Args:
+        data (Union[str, bytes]): The document to decode.
+
+    Returns:
+        Any: The decoded object.
+    """
+    return get_json_codec().loads(data)
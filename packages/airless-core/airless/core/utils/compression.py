@@ -0,0 +1,48 @@
+import gzip
+
+
+COMPRESSION_ENCODINGS = ('gzip', 'zstd')
+
+
+def compress(payload: bytes, encoding: str) -> bytes:
+    """Compresses a payload.
+
+    Args:
+        payload (bytes): The payload to compress.
+        encoding (str): The compression algorithm, `gzip` or `zstd`. `zstd`
+            requires the `zstandard` package.
+
+    Raises:
+        ValueError: If the encoding is not supported.
+
+    Returns:
+        bytes: The compressed payload.
+    """
+    if encoding == 'gzip':
+        # The lowest level is several times faster and compresses JSON almost as well
+        return gzip.compress(payload, compresslevel=1, mtime=0)
+    if encoding == 'zstd':
+        import zstandard
+        return zstandard.ZstdCompressor(level=3).compress(payload)
+    raise ValueError(f'Unsupported compression {encoding}, use one of {COMPRESSION_ENCODINGS}')
+
+
+def decompress(payload: bytes, encoding: str) -> bytes:
+    """Decompresses a payload.
+
+    Args:
+        payload (bytes): The compressed payload.
+        encoding (str): The compression algorithm, `gzip` or `zstd`.
+
+    Raises:
+        ValueError: If the encoding is not supported.
+
+    Returns:
+        bytes: The original payload.
+    """
+    if encoding == 'gzip':
+        return gzip.decompress(payload)
+    if encoding == 'zstd':
+        import zstandard
+        return zstandard.ZstdDecompressor().decompress(payload)
+    raise ValueError(f'Unsupported compression {encoding}, use one of {COMPRESSION_ENCODINGS}')
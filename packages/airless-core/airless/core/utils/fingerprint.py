@@ -0,0 +1,64 @@
+import hashlib
+import re
+
+from typing import Tuple
+
+
+_EXCEPTION_LINE = re.compile(r'^([A-Za-z_][\w.]*)(?::\s*(.*))?$')
+_VARIABLE_PARTS = [
+    (re.compile(r'[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}'), '<uuid>'),
+    (re.compile(r'https?://\S+'), '<url>'),
+    (re.compile(r'0x[0-9a-fA-F]+'), '<hex>'),
+    (re.compile(r'\d+(\.\d+)?'), '<n>'),
+]
+
+
+def parse_error(error: str) -> Tuple[str, str]:
+    """Extracts the exception type and message from an error reported by an operator.
+
+    Errors are reported as the exception message followed by the traceback,
+    whose last line without indentation is `ExceptionType: message`.
+
+    Args:
+        error (str): The error text.
+
+    Returns:
+        Tuple[str, str]: The exception type, `Error` when unknown, and the message.
+    """
+    lines = [line for line in (error or '').strip().splitlines() if line.strip()]
+    if any(line.startswith('Traceback') for line in lines):
+        for line in reversed(lines):
+            match = _EXCEPTION_LINE.match(line)
+            if match and not line.startswith(' '):
+                return match.group(1), (match.group(2) or '').strip()
+    return 'Error', lines[0].strip() if lines else ''
+
+
+def normalize_error_message(message: str, max_length: int = 200) -> str:
+    """Replaces the variable parts of an error message, like IDs, numbers and urls.
+
+    Args:
+        message (str): The error message.
+        max_length (int): The maximum length of the normalized message. Defaults to 200.
+
+    Returns:
+        str: The normalized message.
+    """
+    for pattern, placeholder in _VARIABLE_PARTS:
+        message = pattern.sub(placeholder, message)
+    return message[:max_length]
+
+
+def error_fingerprint(origin: str, error: str) -> str:
+    """Builds a fingerprint shared by the errors with the same cause.
+
+    Args:
+        origin (str): The topic or resource where the error happened.
+        error (str): The error text.
+
+    Returns:
+        str: The fingerprint.
+    """
+    error_type, message = parse_error(error)
+    key = f'{origin}|{error_type}|{normalize_error_message(message)}'
+    return hashlib.sha1(key.encode('utf-8')).hexdigest()[:16]
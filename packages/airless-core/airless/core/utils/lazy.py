@@ -0,0 +1,72 @@
+import json
+import sys
+
+from importlib import import_module
+from typing import Callable, Dict, List, Tuple
+
+
+def lazy_exports(module_name: str, exports: Dict[str, str]) -> Tuple[Callable[[str], object], Callable[[], List[str]]]:
+    """Builds the PEP 562 `__getattr__` and `__dir__` functions of a package.
+
+    The names exported by the package are only imported from their submodule
+    when they are first accessed, so importing a package does not import every
+    dependency of every submodule.
+
+    Example:
+        __getattr__, __dir__ = lazy_exports(__name__, {'QueueHook': '.queue'})
+
+    Args:
+        module_name (str): The name of the package, usually `__name__`.
+        exports (Dict[str, str]): Maps each exported name to the submodule that defines it.
+            Relative submodule names are resolved from the package.
+
+    Returns:
+        Tuple[Callable[[str], object], Callable[[], List[str]]]: The `__getattr__` and
+            `__dir__` functions to set on the package.
+    """
+
+    def __getattr__(name: str) -> object:
+        submodule = exports.get(name)
+        if submodule is None:
+            raise AttributeError(f'module {module_name!r} has no attribute {name!r}')
+
+        value = getattr(import_module(submodule, module_name), name)
+        # Cache the value on the package so the next lookup does not go through __getattr__
+        setattr(sys.modules[module_name], name, value)
+        return value
+
+    def __dir__() -> List[str]:
+        return sorted(set(vars(sys.modules[module_name])) | set(exports))
+
+    return __getattr__, __dir__
+
+
+_IMPORT_SCRIPT = """
+import json, sys
+before = set(sys.modules)
+{statement}
+print(json.dumps(sorted(set(sys.modules) - before)))
+"""
+
+
+def imported_modules(statement: str) -> List[str]:
+    """Lists the modules imported by a statement in a new interpreter.
+
+    Modules already imported by the caller, like those loaded by other tests,
+    would hide imports that happen on a cold start, so the statement is run
+    in a subprocess.
+
+    Example:
+        self.assertNotIn('pyarrow', imported_modules('from airless.google.cloud.storage.hook import GcsHook'))
+
+    Args:
+        statement (str): The Python statement to run, usually an import.
+
+    Returns:
+        List[str]: The names of the modules added to `sys.modules` by the statement.
+    """
+    # Only needed by tests, so importing the package does not import it
+    import subprocess
+
+    output = subprocess.check_output([sys.executable, '-c', _IMPORT_SCRIPT.format(statement=statement)], text=True)
+    return json.loads(output.strip().splitlines()[-1])
@@ -0,0 +1,52 @@
+import threading
+import time
+
+from typing import Optional
+
+
+class RateLimiter:
+    """Token bucket that limits how many operations run per second.
+
+    Tokens are refilled continuously at `rate` per second, up to `burst`, and
+    `acquire` waits until there is one available. It is thread safe, so it can
+    be shared by several workers calling the same API.
+    """
+
+    def __init__(self, rate: Optional[float], burst: Optional[int] = None) -> None:
+        """Initializes the RateLimiter.
+
+        Args:
+            rate (Optional[float]): Number of operations per second. A rate of None or 0
+                does not limit the operations.
+            burst (Optional[int]): Maximum number of operations run at once after an idle
+                period. Defaults to one second of operations.
+        """
+        self.rate = rate or 0
+        self.burst = burst or max(1, int(self.rate))
+        self._tokens = float(self.burst)
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens: int = 1) -> float:
+        """Waits until the operations are allowed.
+
+        Args:
+            tokens (int): Number of operations. Defaults to 1.
+
+        Returns:
+            float: The number of seconds waited.
+        """
+        if self.rate <= 0:
+            return 0
+
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated_at) * self.rate)
+            self._updated_at = now
+            # Tokens are taken right away, so concurrent callers wait in turns
+            self._tokens -= tokens
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0
+
+        if wait > 0:
+            time.sleep(wait)
+        return wait
@@ -0,0 +1,117 @@
+import threading
+
+from importlib import import_module
+from typing import Dict, List, Optional, Type, Union
+
+
+class EntryPointRegistry:
+    """Registry of classes that can be referenced by name.
+
+    Packages declare their classes as entry points of the `ENTRY_POINT_GROUP`
+    of the registry, mapping a name to the import path of the class:
+
+        [project.entry-points."airless.operators"]
+        GoogleDelayOperator = "airless.google.cloud.core.operator:GoogleDelayOperator"
+
+    Classes that are not installed as entry points must be registered
+    explicitly, with the class or its import path, `module:Class`. Classes are
+    only imported when they are first requested, and only subclasses of
+    `base_class` are returned, so a name never imports or instantiates
+    anything else.
+    """
+
+    # Entry point group read by the registry
+    ENTRY_POINT_GROUP: str = ''
+    # Name of the registered classes in error messages
+    KIND: str = 'Class'
+
+    def __init__(self) -> None:
+        """Initializes the EntryPointRegistry."""
+        self._targets: Dict[str, Union[str, type]] = {}
+        self._entry_points_loaded = False
+        self._lock = threading.Lock()
+
+    def base_class(self) -> type:
+        """Gets the class every registered class must subclass.
+
+        Returns:
+            type: The base class.
+        """
+        return object
+
+    def register(self, name: str, target: Union[str, type]) -> None:
+        """Registers a class.
+
+        Args:
+            name (str): The name used to reference the class.
+            target (Union[str, type]): The class or its import path, `module:Class`.
+        """
+        with self._lock:
+            self._targets[name] = target
+
+    def names(self) -> List[str]:
+        """Lists the names of the registered classes.
+
+        Returns:
+            List[str]: The registered names, including the installed entry points.
+        """
+        self._load_entry_points()
+        return sorted(self._targets)
+
+    def get(self, name: str) -> Type:
+        """Gets a class, importing it if needed.
+
+        Args:
+            name (str): The registered name of the class.
+
+        Raises:
+            KeyError: If the name is not registered.
+            TypeError: If the registered target is not a subclass of `base_class`.
+
+        Returns:
+            Type: The class.
+        """
+        target = self._find(name)
+        if target is None:
+            raise KeyError(f'{self.KIND} {name} is not registered')
+
+        if isinstance(target, str):
+            target = self._import(target)
+        if not (isinstance(target, type) and issubclass(target, self.base_class())):
+            raise TypeError(f'{name} is not a {self.base_class().__name__}')
+
+        with self._lock:
+            self._targets[name] = target
+        return target
+
+    def _find(self, name: str) -> Optional[Union[str, type]]:
+        target = self._targets.get(name)
+        if target is None:
+            self._load_entry_points()
+            target = self._targets.get(name)
+        return target
+
+    def _load_entry_points(self) -> None:
+        if self._entry_points_loaded:
+            return
+
+        # importlib.metadata loads the email package, so it is only imported when a name is resolved
+        from importlib.metadata import entry_points
+
+        eps = entry_points()
+        # Python 3.9 returns a dict of groups while newer versions support select
+        if hasattr(eps, 'select'):
+            eps = eps.select(group=self.ENTRY_POINT_GROUP)
+        else:
+            eps = eps.get(self.ENTRY_POINT_GROUP, [])
+
+        with self._lock:
+            for ep in eps:
+                # Classes registered explicitly take precedence over installed ones
+                self._targets.setdefault(ep.name, ep.value)
+            self._entry_points_loaded = True
+
+    def _import(self, path: str) -> type:
+        module_name, _, class_name = path.partition(':')
+        module = import_module(module_name)
+        return getattr(module, class_name)
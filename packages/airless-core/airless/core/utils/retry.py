@@ -0,0 +1,200 @@
+import random
+
+from typing import Any, Dict, List, Optional
+
+
+RETRY_STRATEGIES = ('exponential', 'fixed', 'none')
+
+
+def exception_types(exception: BaseException) -> List[str]:
+    """Lists the names of the class of an exception and of its base classes.
+
+    Builtin exceptions are named by their class name, like `KeyError`, and the
+    others by their module and class name, like `requests.exceptions.HTTPError`.
+
+    Args:
+        exception (BaseException): The exception.
+
+    Returns:
+        List[str]: The names, from the class of the exception to `Exception`.
+    """
+    names = []
+    for cls in type(exception).__mro__:
+        if cls in (BaseException, object):
+            continue
+        names.append(cls.__qualname__ if cls.__module__ == 'builtins' else f'{cls.__module__}.{cls.__qualname__}')
+    return names
+
+
+def exception_status(exception: BaseException) -> Optional[int]:
+    """Finds the HTTP status code of an exception raised by an HTTP client.
+
+    Args:
+        exception (BaseException): The exception.
+
+    Returns:
+        Optional[int]: The status code, or None if the exception does not have one.
+    """
+    response = getattr(exception, 'response', None)
+    for status in (getattr(response, 'status_code', None), getattr(exception, 'status_code', None), getattr(exception, 'code', None)):
+        if isinstance(status, int) and (100 <= status <= 599):
+            return status
+    return None
+
+
+class RetryPolicy:
+    """Decides whether a failed event is retried and how long to wait.
+
+    Exceptions are classified by name, matching the class of the exception or
+    any of its base classes. Permanent errors and HTTP statuses are never
+    retried, and when `retriable` is set only those errors are retried. The
+    number of retries can also be capped per exception.
+
+    The backoff is `exponential`, `interval ** retries` like the
+    `ErrorReprocessOperator` always did, `fixed` or `none`, limited to
+    `max_interval` seconds. `jitter` waits a random time between 0 and the
+    backoff, so messages that failed together are not retried together.
+    """
+
+    def __init__(
+        self,
+        max_retries: int = 2,
+        strategy: str = 'exponential',
+        interval: float = 5,
+        max_interval: float = 480,
+        jitter: bool = False,
+        retriable: Optional[List[str]] = None,
+        permanent: Optional[List[str]] = None,
+        permanent_status: Optional[List[Any]] = None,
+        max_retries_by_type: Optional[Dict[str, int]] = None
+    ) -> None:
+        """Initializes the RetryPolicy.
+
+        Args:
+            max_retries (int): Maximum number of retries. Defaults to 2.
+            strategy (str): The backoff, `exponential`, `fixed` or `none`. Defaults to `exponential`.
+            interval (float): The base of the exponential backoff or the fixed interval, in seconds.
+                Defaults to 5.
+            max_interval (float): Maximum number of seconds between retries. Defaults to 480.
+            jitter (bool): Whether to wait a random time up to the backoff. Defaults to False.
+            retriable (Optional[List[str]]): Only these exceptions are retried. Defaults to None,
+                which retries every exception that is not permanent.
+            permanent (Optional[List[str]]): Exceptions that are never retried. Defaults to None.
+            permanent_status (Optional[List[Any]]): HTTP statuses that are never retried, either
+                codes like `404` or classes like `4xx`. Defaults to None.
+            max_retries_by_type (Optional[Dict[str, int]]): Maximum number of retries of each
+                exception. Defaults to None.
+
+        Raises:
+            ValueError: If the strategy is not supported.
+        """
+        if strategy not in RETRY_STRATEGIES:
+            raise ValueError(f'Unsupported retry strategy {strategy}, use one of {RETRY_STRATEGIES}')
+        self.max_retries = max_retries
+        self.strategy = strategy
+        self.interval = interval
+        self.max_interval = max_interval
+        self.jitter = jitter
+        self.retriable = retriable or []
+        self.permanent = permanent or []
+        self.permanent_status = [str(s).lower() for s in permanent_status or []]
+        self.max_retries_by_type = max_retries_by_type or {}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'RetryPolicy':
+        """Builds a policy from a dictionary, ignoring unknown keys.
+
+        Args:
+            data (Dict[str, Any]): The policy, as returned by `to_dict`.
+
+        Returns:
+            RetryPolicy: The policy.
+        """
+        keys = cls().to_dict().keys()
+        return cls(**{k: v for k, v in data.items() if k in keys})
+
+    @classmethod
+    def from_metadata(cls, metadata: Dict[str, Any], default: Optional[Dict[str, Any]] = None) -> 'RetryPolicy':
+        """Builds the policy of a message.
+
+        The `retry_policy` of the message metadata overrides the default policy,
+        usually the one of the operator that failed, and the legacy metadata keys
+        `max_retries`, `retry_interval` and `max_interval` override both.
+
+        Args:
+            metadata (Dict[str, Any]): The metadata of the message.
+            default (Optional[Dict[str, Any]]): The default policy. Defaults to None.
+
+        Returns:
+            RetryPolicy: The policy.
+        """
+        policy = {**(default or {}), **metadata.get('retry_policy', {})}
+        for key, policy_key in (('max_retries', 'max_retries'), ('retry_interval', 'interval'), ('max_interval', 'max_interval')):
+            if key in metadata:
+                policy[policy_key] = metadata[key]
+        return cls.from_dict(policy)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Converts the policy to a dictionary that can be sent in a message.
+
+        Returns:
+            Dict[str, Any]: The policy.
+        """
+        return {
+            'max_retries': self.max_retries,
+            'strategy': self.strategy,
+            'interval': self.interval,
+            'max_interval': self.max_interval,
+            'jitter': self.jitter,
+            'retriable': self.retriable,
+            'permanent': self.permanent,
+            'permanent_status': self.permanent_status,
+            'max_retries_by_type': self.max_retries_by_type
+        }
+
+    def is_permanent(self, error_types: List[str], status: Optional[int] = None) -> bool:
+        """Checks if an error can never succeed when retried.
+
+        Args:
+            error_types (List[str]): The names of the exception class and its base classes.
+            status (Optional[int]): The HTTP status of the error. Defaults to None.
+
+        Returns:
+            bool: Whether the error is permanent.
+        """
+        if any(t in self.permanent for t in error_types):
+            return True
+        if (status is not None) and ((str(status) in self.permanent_status) or (f'{str(status)[0]}xx' in self.permanent_status)):
+            return True
+        return bool(self.retriable) and not any(t in self.retriable for t in error_types)
+
+    def should_retry(self, retries: int, error_types: List[str], status: Optional[int] = None) -> bool:
+        """Checks if an error is retried.
+
+        Args:
+            retries (int): The number of times the message was already retried.
+            error_types (List[str]): The names of the exception class and its base classes.
+            status (Optional[int]): The HTTP status of the error. Defaults to None.
+
+        Returns:
+            bool: Whether the message is retried.
+        """
+        if self.is_permanent(error_types, status):
+            return False
+        caps = [self.max_retries_by_type[t] for t in error_types if t in self.max_retries_by_type]
+        return retries < (caps[0] if caps else self.max_retries)
+
+    def backoff(self, retries: int) -> float:
+        """Calculates the number of seconds to wait before a retry.
+
+        Args:
+            retries (int): The number of times the message was already retried.
+
+        Returns:
+            float: The number of seconds.
+        """
+        if self.strategy == 'none':
+            return 0
+        interval = self.interval if self.strategy == 'fixed' else self.interval ** retries
+        interval = min(interval, self.max_interval)
+        return random.uniform(0, interval) if self.jitter else interval
@@ -0,0 +1,72 @@
+"""Compares the JSON codecs on payloads similar to the ones airless handles.
+
+Usage:
+    python benchmarks/json_codec.py [--number 2000]
+"""
+import argparse
+import importlib.util
+import timeit
+import traceback
+
+from datetime import datetime
+
+from airless.core.utils import JsonCodec
+
+
+def build_payloads() -> dict:
+    """Builds a queue message, a datalake row and an error message."""
+    tasks = [{'topic': f'topic-{i}', 'data': {'url': f'https://example.com/{i}', 'page': i}} for i in range(5)]
+    data = {'url': 'https://example.com', 'params': {'start': '2025-01-01', 'end': '2025-01-31'}}
+    for task in reversed(tasks):
+        data = {**task['data'], 'metadata': {'run_next': [{'topic': task['topic'], 'data': data}]}}
+
+    row = {
+        'data': {
+            'id': 123456789,
+            'name': 'Product name with ação',
+            'price': 1234.56,
+            'tags': ['a', 'b', 'c'],
+            'attributes': {f'attribute_{i}': i * 1.5 for i in range(30)},
+            'updated_at': datetime(2025, 1, 1, 9, 30)
+        },
+        'metadata': {'event_id': 1234, 'resource': 'local'}
+    }
+
+    try:
+        raise ValueError('Error!')
+    except ValueError:
+        stack = traceback.format_exc()
+    error = {
+        'input_type': 'event',
+        'origin': 'topic',
+        'error': stack * 20,
+        'event_id': 1234,
+        'data': {'rows': [row['data']] * 200}
+    }
+
+    return {'message': data, 'row': row, 'error': error}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--number', type=int, default=2000, help='Number of runs of each operation')
+    args = parser.parse_args()
+
+    codecs = [name for name in ('orjson', 'msgspec') if importlib.util.find_spec(name)] + ['json']
+    payloads = build_payloads()
+    baseline = JsonCodec('json')
+
+    print(f'{"payload":<10}{"bytes":>10}{"codec":>10}{"dumps us":>12}{"loads us":>12}{"speedup":>10}')
+    for payload_name, payload in payloads.items():
+        encoded = baseline.dumpb(payload)
+        base_time = None
+        for name in reversed(codecs):
+            codec = JsonCodec(name)
+            dumps = timeit.timeit(lambda: codec.dumpb(payload), number=args.number) / args.number * 1e6
+            loads = timeit.timeit(lambda: codec.loads(encoded), number=args.number) / args.number * 1e6
+            base_time = base_time or (dumps + loads)
+            print(f'{payload_name:<10}{len(encoded):>10}{name:>10}{dumps:>12.1f}{loads:>12.1f}{base_time / (dumps + loads):>9.1f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -1,9 +1,15 @@
 
+import importlib.util
+import json
 import unittest
 
 from datetime import datetime
 
 from airless.core.hook import DatalakeHook
+from airless.core.utils import set_json_codec
+
+
+CODECS = [name for name in ('orjson', 'msgspec') if importlib.util.find_spec(name)] + ['json']
 
 
 class TestDatalakeHook(unittest.TestCase):
@@ -28,6 +34,32 @@ class TestDatalakeHook(unittest.TestCase):
 
         assert metadata == {'event_id': 1234, 'resource': 'local'}
 
+    def test_iter_rows(self):
+        """Test preparing rows lazily from an iterator"""
+        metadata = {'event_id': 1234, 'resource': 'local'}
+        now = datetime(2025, 1, 1, 9, 30, 0)
+        consumed = []
+
+        def generate():
+            for i in range(3):
+                consumed.append(i)
+                yield {'id': i}
+
+        rows = self.datalake_hook.iter_rows(generate(), metadata, now)
+        self.assertEqual(consumed, [])
+
+        first = next(rows)
+        self.assertEqual(consumed, [0])
+        self.assertEqual(json.loads(first['_json'])['data'], {'id': 0})
+        self.assertEqual(len(list(rows)), 2)
+
+    def test_prepare_rows_single_row(self):
+        """Test that a single row is prepared as a list with one row"""
+        rows, now = self.datalake_hook.prepare_rows({'foo': 'bar'}, {'event_id': 1, 'resource': 'local'})
+
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows[0]['_created_at'], now)
+
     def test_prepare_row(self):
         """Test method to prepare rows to be inserted to datalake"""
         metadata = {
@@ -50,6 +82,21 @@ class TestDatalakeHook(unittest.TestCase):
 
         assert actual_output == expected_output
 
+    def test_prepare_row_keeps_json_format(self):
+        """Test that the persisted JSON is the same with every codec"""
+        row = {'name': 'ação', 'updated_at': datetime(2025, 1, 1, 9, 30)}
+        metadata = {'event_id': 1234, 'resource': 'local'}
+        expected = json.dumps({'data': row, 'metadata': metadata}, default=str)
+
+        for name in CODECS:
+            with self.subTest(codec=name):
+                set_json_codec(name)
+                try:
+                    actual = self.datalake_hook.prepare_row(row, metadata, datetime.now())['_json']
+                finally:
+                    set_json_codec()
+                self.assertEqual(actual, expected)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,266 @@
+
+import os
+import signal
+import tempfile
+import unittest
+from unittest.mock import MagicMock, patch
+
+from airless.core.hook import DatalakeHook, DatalakeWriter
+from airless.core.hook import datalake_writer
+from airless.core.operator.context import InvocationContext
+
+
+class TestDatalakeWriter(unittest.TestCase):
+
+    def setUp(self):
+        self.datalake_hook = DatalakeHook()
+        self.written = []
+
+        def write_rows(rows, dataset, table, partition, parquet_options=None):
+            self.written.append(list(rows))
+            return f'{dataset}/{table}/{len(self.written[-1])}'
+
+        self.datalake_hook.write_rows = MagicMock(side_effect=write_rows)
+        self.spill_dir = tempfile.mkdtemp()
+        self.env = patch.dict(os.environ, {'ENV': 'prod'})
+        self.env.start()
+
+    def tearDown(self):
+        self.env.stop()
+
+    def build_writer(self, **kwargs):
+        options = {'max_rows': 100, 'max_bytes': 10 ** 6, 'max_age': 60, 'max_memory': 10 ** 6, 'flush_on_invocation': False}
+        options.update(kwargs)
+        return DatalakeWriter(self.datalake_hook, spill_dir=self.spill_dir, **options)
+
+    def send(self, writer, data, table='table', time_partition=True):
+        writer.send_to_landing_zone(data=data, dataset='dataset', table=table, message_id=1, origin='topic', time_partition=time_partition)
+
+    def written_rows(self, call_index=0):
+        return [r['_json'] for r in self.written[call_index]]
+
+    def test_flush_on_max_rows(self):
+        writer = self.build_writer(max_rows=3)
+
+        self.send(writer, [{'id': 1}, {'id': 2}])
+        self.datalake_hook.write_rows.assert_not_called()
+        self.send(writer, {'id': 3})
+
+        self.datalake_hook.write_rows.assert_called_once()
+        _, dataset, table, partition = self.datalake_hook.write_rows.call_args.args
+        self.assertEqual(len(self.written[0]), 3)
+        self.assertEqual((dataset, table), ('dataset', 'table'))
+        self.assertTrue(partition.startswith('date='))
+        self.assertEqual(writer.flush(), [])
+
+    def test_parquet_options(self):
+        writer = self.build_writer()
+        options = {'compression': 'zstd', 'row_group_size': 1000}
+
+        writer.send_to_landing_zone(
+            data={'id': 1}, dataset='dataset', table='table', message_id=1, origin='topic',
+            time_partition=True, parquet_options=options)
+        self.send(writer, {'id': 2})
+        writer.flush()
+
+        self.assertEqual(self.datalake_hook.write_rows.call_args.kwargs['parquet_options'], options)
+        self.assertEqual(len(self.written[0]), 2)
+
+    def test_flush_on_max_bytes(self):
+        writer = self.build_writer(max_bytes=200)
+
+        self.send(writer, {'text': 'a' * 100})
+        self.datalake_hook.write_rows.assert_not_called()
+        self.send(writer, {'text': 'a' * 100})
+
+        self.datalake_hook.write_rows.assert_called_once()
+
+    def test_buffers_per_table_and_partition(self):
+        writer = self.build_writer()
+
+        self.send(writer, {'id': 1}, table='a')
+        self.send(writer, {'id': 2}, table='b')
+        self.send(writer, {'id': 3}, table='a', time_partition=False)
+        self.send(writer, {'id': 4}, table='a')
+
+        self.assertEqual(sorted(writer.flush()), ['dataset/a/1', 'dataset/a/2', 'dataset/b/1'])
+
+    def test_flush_expired(self):
+        with patch('time.monotonic', return_value=1000):
+            writer = self.build_writer(max_age=60)
+            self.send(writer, {'id': 1})
+        with patch('time.monotonic', return_value=1030):
+            self.send(writer, {'id': 2}, table='other')
+            writer.end_invocation()
+        self.datalake_hook.write_rows.assert_not_called()
+
+        with patch('time.monotonic', return_value=1060):
+            writer.end_invocation()
+        self.assertEqual(self.datalake_hook.write_rows.call_args.args[2], 'table')
+
+    def test_flush_on_invocation(self):
+        writer = self.build_writer(flush_on_invocation=True)
+        self.send(writer, {'id': 1})
+
+        writer.end_invocation()
+
+        self.datalake_hook.write_rows.assert_called_once()
+
+    def test_flush_on_invocation_writes_only_its_rows(self):
+        writer = self.build_writer(flush_on_invocation=True)
+        first, second = InvocationContext(), InvocationContext()
+
+        writer.bind_invocation(first)
+        self.send(writer, {'id': 1})
+        writer.bind_invocation(second)
+        self.send(writer, {'id': 2})
+
+        writer.end_invocation(first)
+        self.assertEqual(self.written_rows(), [f'{{"data": {{"id": 1}}, "metadata": {{"event_id": 1, "resource": "topic"}}}}'])
+
+        writer.end_invocation()
+        self.assertEqual(self.datalake_hook.write_rows.call_count, 2)
+        self.assertEqual(writer.flush(), [])
+
+    def test_flush_on_invocation_skips_expired_buffers_of_other_invocations(self):
+        writer = self.build_writer(flush_on_invocation=True, max_age=60)
+        first, second = InvocationContext(), InvocationContext()
+
+        with patch('time.monotonic', return_value=1000):
+            writer.bind_invocation(first)
+            self.send(writer, {'id': 1})
+        with patch('time.monotonic', return_value=1060):
+            writer.bind_invocation(second)
+            self.send(writer, {'id': 2}, table='other')
+
+        self.datalake_hook.write_rows.assert_not_called()
+
+    def test_failed_write_raised_by_every_invocation(self):
+        writer = self.build_writer(max_rows=2)
+        first, second = InvocationContext(), InvocationContext()
+        self.datalake_hook.write_rows.side_effect = Exception('Unavailable')
+
+        writer.bind_invocation(first)
+        self.send(writer, {'id': 1})
+        writer.bind_invocation(second)
+        with self.assertRaises(Exception):
+            self.send(writer, {'id': 2})
+
+        # The rows of the first invocation were in the failed buffer
+        with self.assertRaises(Exception):
+            writer.end_invocation(first)
+        writer.end_invocation(first)
+        writer.end_invocation(second)
+
+    def test_failed_write_of_other_invocations_not_raised(self):
+        writer = self.build_writer(max_age=60)
+        first, second = InvocationContext(), InvocationContext()
+        self.datalake_hook.write_rows.side_effect = Exception('Unavailable')
+
+        with patch('time.monotonic', return_value=1000):
+            writer.bind_invocation(first)
+            self.send(writer, {'id': 1})
+        with patch('time.monotonic', return_value=1060):
+            writer.bind_invocation(second)
+            writer.end_invocation(second)
+
+        self.datalake_hook.write_rows.assert_called_once()
+        with self.assertRaises(Exception):
+            writer.end_invocation(first)
+
+    def test_spill_to_disk(self):
+        writer = self.build_writer(max_memory=150)
+
+        for i in range(4):
+            self.send(writer, {'id': i, 'text': 'a' * 50})
+        self.assertEqual(len(os.listdir(self.spill_dir)), 1)
+        self.assertLessEqual(writer._memory_bytes, 150)
+
+        writer.flush()
+
+        self.assertEqual(self.written_rows(), [f'{{"data": {{"id": {i}, "text": "{"a" * 50}"}}, "metadata": {{"event_id": 1, "resource": "topic"}}}}' for i in range(4)])
+        self.assertEqual(os.listdir(self.spill_dir), [])
+
+    def test_flush_on_invocation_by_default(self):
+        writer = DatalakeWriter(self.datalake_hook)
+        self.assertTrue(writer.flush_on_invocation)
+
+        with patch.dict(os.environ, {'DATALAKE_WRITER_FLUSH_ON_INVOCATION': 'false'}):
+            writer = DatalakeWriter(self.datalake_hook)
+        self.assertFalse(writer.flush_on_invocation)
+
+    def test_failed_write_drops_rows(self):
+        writer = self.build_writer(max_memory=50)
+        self.send(writer, {'id': 1, 'text': 'a' * 50}, table='a')
+        self.send(writer, {'id': 2}, table='b')
+        self.datalake_hook.write_rows.side_effect = [Exception('Unavailable'), 'dataset/b/1']
+
+        # The other buffers are still written before the error is raised
+        with self.assertRaises(Exception):
+            writer.flush()
+        self.assertEqual(self.datalake_hook.write_rows.call_count, 2)
+
+        # The event is retried, so the rows are not written again
+        self.datalake_hook.write_rows.side_effect = None
+        self.assertEqual(writer.flush(), [])
+        self.assertEqual(writer._memory_bytes, 0)
+        self.assertEqual(os.listdir(self.spill_dir), [])
+
+    def test_context_manager(self):
+        with self.build_writer() as writer:
+            self.send(writer, {'id': 1})
+            self.datalake_hook.write_rows.assert_not_called()
+
+        self.datalake_hook.write_rows.assert_called_once()
+
+    @patch('threading.Thread')
+    @patch('signal.signal')
+    def test_install_shutdown_handler(self, mock_signal, mock_thread):
+        with patch.object(datalake_writer, '_sigterm_installed', False), patch.object(datalake_writer, '_previous_sigterm', None):
+            self.build_writer()
+            # Writers do not replace the SIGTERM handler of the process
+            mock_signal.assert_not_called()
+
+            DatalakeWriter.install_shutdown_handler()
+            DatalakeWriter.install_shutdown_handler()
+
+        mock_signal.assert_called_once_with(signal.SIGTERM, datalake_writer._handle_sigterm)
+        mock_thread.return_value.start.assert_called_once_with()
+
+    @patch('os.kill')
+    def test_sigterm(self, mock_kill):
+        writer = self.build_writer()
+        self.send(writer, {'id': 1})
+        previous = MagicMock()
+
+        with patch.object(datalake_writer, '_previous_sigterm', previous), \
+                patch.object(datalake_writer, '_stopping') as stopping, \
+                patch.object(datalake_writer, '_flushed') as flushed:
+            flushed.is_set.return_value = False
+            # The handler may interrupt a writer, so it only asks the shutdown thread to flush
+            datalake_writer._handle_sigterm(signal.SIGTERM, None)
+            stopping.set.assert_called_once_with()
+            self.datalake_hook.write_rows.assert_not_called()
+            previous.assert_not_called()
+
+            datalake_writer._flush_on_sigterm()
+            self.datalake_hook.write_rows.assert_called_once()
+            flushed.set.assert_called_once_with()
+            mock_kill.assert_called_once_with(os.getpid(), signal.SIGTERM)
+
+            flushed.is_set.return_value = True
+            datalake_writer._handle_sigterm(signal.SIGTERM, None)
+            previous.assert_called_once_with(signal.SIGTERM, None)
+
+    def test_not_buffered_in_dev(self):
+        writer = self.build_writer()
+
+        with patch.dict(os.environ, {'ENV': 'dev'}):
+            self.send(writer, {'id': 1})
+
+        self.assertEqual(writer.flush(), [])
+        self.datalake_hook.write_rows.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()
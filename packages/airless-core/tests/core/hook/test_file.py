@@ -1,7 +1,10 @@
 
 # import os
+import json
 import unittest
 
+from datetime import datetime
+
 from unittest.mock import patch, MagicMock, mock_open
 
 from airless.core.hook.file import FileHook, FtpHook
@@ -12,25 +15,31 @@ class TestFileHook(unittest.TestCase):
     def setUp(self):
         self.file_hook = FileHook()
     
-    @patch('json.dump')
     @patch('builtins.open', new_callable=mock_open)
-    def test_write_json(self, mock_file, mock_json_dump):
-        data = {'key': 'value'}
+    def test_write_json(self, mock_file):
+        data = {'key': 'value', 'date': datetime(2025, 1, 1)}
         local_filepath = 'test.json'
         self.file_hook.write(local_filepath, data)
 
         mock_file.assert_called_once_with(local_filepath, 'w')
-        mock_json_dump.assert_called_once_with(data, mock_file(), default=str)
+        written = ''.join(c.args[0] for c in mock_file().write.call_args_list)
+        self.assertEqual(json.loads(written), {'key': 'value', 'date': '2025-01-01 00:00:00'})
 
-    @patch('ndjson.dump')
     @patch('builtins.open', new_callable=mock_open)
-    def test_write_ndjson(self, mock_file, mocK_ndjson_dump):
+    def test_write_ndjson(self, mock_file):
         data = [{'key': 'value1'}, {'key': 'value2'}]
         local_filepath = 'test.ndjson'
         self.file_hook.write(local_filepath, data, use_ndjson=True)
 
         mock_file.assert_called_once_with(local_filepath, 'w')
-        mocK_ndjson_dump.assert_called_once_with(data, mock_file(), default=str)
+        written = ''.join(c.args[0] for c in mock_file().write.call_args_list)
+        self.assertEqual([json.loads(line) for line in written.splitlines()], data)
+
+    def test_serialize(self):
+        self.assertEqual(self.file_hook.serialize({'key': 'value'}), '{"key":"value"}')
+        self.assertEqual(self.file_hook.serialize([{'a': 1}, {'a': 2}], use_ndjson=True), '{"a":1}\n{"a":2}')
+        self.assertEqual(self.file_hook.serialize('text'), 'text')
+        self.assertEqual(self.file_hook.serialize(b'bytes', mode='wb'), b'bytes')
 
     def test_extract_filename(self):
         url = 'http://example.com/path/to/file.txt?query=123'
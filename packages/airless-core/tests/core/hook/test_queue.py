@@ -0,0 +1,163 @@
+
+import threading
+import time
+import unittest
+
+from unittest.mock import MagicMock
+
+from airless.core.hook import LocalClaimCheckHook, LocalQueueHook, QueueHook
+
+
+class TestQueueHook(unittest.TestCase):
+
+    def test_offload_small_payload(self):
+        hook = QueueHook()
+        hook.claim_check_hook = LocalClaimCheckHook()
+
+        self.assertEqual(hook.offload(b'{}'), (b'{}', {}))
+        self.assertEqual(hook.claim_check_hook.payloads, {})
+
+    def test_offload_and_resolve_large_payload(self):
+        hook = QueueHook()
+        hook.claim_check_hook = LocalClaimCheckHook()
+        hook.claim_check_threshold = 10
+        payload = b'{"key": "a large value"}'
+
+        data, attributes = hook.offload(payload)
+
+        self.assertEqual(data, b'')
+        self.assertEqual(hook.resolve(data, attributes), payload)
+        # The payload is kept for the redeliveries of the message
+        self.assertEqual(hook.resolve(data, attributes), payload)
+
+    def test_compress_large_payload(self):
+        hook = QueueHook()
+        hook.compression = 'gzip'
+        hook.compression_threshold = 100
+
+        self.assertEqual(hook.compress(b'{}'), (b'{}', {}))
+        data, attributes = hook.compress(b'{}' * 100)
+        self.assertEqual(attributes, {'content_encoding': 'gzip'})
+        self.assertLess(len(data), 200)
+
+    def test_promote_attributes(self):
+        hook = QueueHook()
+        data = {
+            'origin': 'topic-a',
+            'metadata': {'retries': 2, 'trace_id': 'abc', 'run_next': [], 'schema_version': None},
+        }
+
+        self.assertEqual(hook.promote_attributes(data), {'retries': '2', 'origin': 'topic-a', 'trace_id': 'abc'})
+        self.assertEqual(hook.promote_attributes(['not', 'a', 'dict']), {})
+        self.assertEqual(hook.promote_attributes({'metadata': {'trace_id': 'x' * 2000}}), {})
+
+    def test_resolve_without_claim_check_hook(self):
+        with self.assertRaises(ValueError):
+            QueueHook().resolve(b'', {'claim_check': 'claim'})
+
+
+class TestLocalClaimCheckHook(unittest.TestCase):
+
+    def test_expired_payload(self):
+        hook = LocalClaimCheckHook()
+        hook.ttl = 0
+        claim = hook.store(b'payload')
+
+        with self.assertRaises(KeyError):
+            hook.load(claim)
+
+        hook.store(b'other')
+        self.assertNotIn(claim, hook.payloads)
+
+
+class TestLocalQueueHook(unittest.TestCase):
+
+    def setUp(self):
+        self.hook = LocalQueueHook()
+
+    def test_publish_without_subscriber(self):
+        self.hook.publish(None, 'topic', {'key': 'value'})
+        self.assertEqual(self.hook.messages['topic'], [{'key': 'value'}])
+
+    def test_publish_to_subscriber(self):
+        received = []
+        self.hook.subscribe('topic', received.append)
+
+        self.hook.publish(None, 'topic', {'key': 'value'})
+
+        self.assertEqual(received, [{'key': 'value'}])
+        self.assertEqual(self.hook.messages['topic'], [])
+
+    def test_publish_with_delay_does_not_block(self):
+        delivered = threading.Event()
+        self.hook.subscribe('topic', lambda data: delivered.set())
+
+        start = time.time()
+        self.hook.publish(None, 'topic', {'key': 'value'}, delay=0.2)
+
+        self.assertLess(time.time() - start, 0.1)
+        self.assertFalse(delivered.is_set())
+        self.assertTrue(delivered.wait(timeout=2))
+
+
+    def test_publish_many(self):
+        count = self.hook.publish_many(None, 'topic', ({'i': i} for i in range(3)))
+
+        self.assertEqual(count, 3)
+        self.assertEqual(self.hook.messages['topic'], [{'i': 0}, {'i': 1}, {'i': 2}])
+
+    def test_publish_many_in_batches(self):
+        def messages():
+            for i in range(5):
+                # No more than one batch is consumed ahead of the published messages
+                self.assertGreaterEqual(len(self.hook.messages['topic']), i - 2)
+                yield {'i': i}
+
+        self.assertEqual(self.hook.publish_many(None, 'topic', messages(), batch_size=2), 5)
+        self.assertEqual(len(self.hook.messages['topic']), 5)
+
+    def test_flush_raises_publish_errors(self):
+        self.hook.subscribe('topic', MagicMock(side_effect=Exception('Error!')))
+
+        future = self.hook.publish_async(None, 'topic', {})
+
+        self.assertIsNotNone(future.exception())
+        with self.assertRaises(Exception):
+            self.hook.flush()
+        # The error is only raised once
+        self.hook.flush()
+
+    def test_publish_many_raises_errors_once(self):
+        self.hook.subscribe('topic', MagicMock(side_effect=Exception('Error!')))
+
+        with self.assertRaises(Exception):
+            self.hook.publish_many(None, 'topic', [{}])
+        self.hook.flush()
+
+    def test_flush_only_waits_for_bound_messages(self):
+        self.hook.subscribe('failing', MagicMock(side_effect=Exception('Error!')))
+        errors = {}
+
+        def invocation(name, topic):
+            self.hook.bind_pending(set())
+            self.hook.publish_async(None, topic, {})
+            try:
+                self.hook.flush()
+            except Exception as e:
+                errors[name] = e
+
+        threads = [
+            threading.Thread(target=invocation, args=('failing', 'failing')),
+            threading.Thread(target=invocation, args=('ok', 'topic'))
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        # The error is only raised by the invocation that published the message
+        self.assertEqual(list(errors), ['failing'])
+        self.hook.flush()
+
+if __name__ == '__main__':
+    unittest.main()
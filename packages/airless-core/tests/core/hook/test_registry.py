@@ -0,0 +1,45 @@
+import unittest
+
+from unittest.mock import MagicMock, patch
+
+from airless.core.hook import HookRegistry, MemoryStateHook, get_hook, register_hook
+
+
+class TestHookRegistry(unittest.TestCase):
+
+    def setUp(self):
+        self.registry = HookRegistry()
+
+    def test_get_registered_class(self):
+        self.registry.register('state', MemoryStateHook)
+        self.assertIs(self.registry.get('state'), MemoryStateHook)
+
+    def test_get_import_path(self):
+        self.registry.register('state', 'airless.core.hook:MemoryStateHook')
+        self.assertIs(self.registry.get('state'), MemoryStateHook)
+
+    def test_get_not_a_hook(self):
+        self.registry.register('json', 'json:JSONDecoder')
+        with self.assertRaises(TypeError):
+            self.registry.get('json')
+
+    @patch('importlib.metadata.entry_points')
+    def test_get_entry_point(self, mock_entry_points):
+        entry_point = MagicMock(value='airless.core.hook:MemoryStateHook')
+        entry_point.name = 'InstalledStateHook'
+        mock_entry_points.return_value.select.return_value = [entry_point]
+
+        self.assertIs(self.registry.get('InstalledStateHook'), MemoryStateHook)
+        mock_entry_points.return_value.select.assert_called_once_with(group='airless.hooks')
+
+    def test_get_missing(self):
+        with self.assertRaisesRegex(KeyError, 'Hook missing is not registered'):
+            self.registry.get('missing')
+
+    def test_process_registry(self):
+        register_hook('TestStateHook', MemoryStateHook)
+        self.assertIs(get_hook('TestStateHook'), MemoryStateHook)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,66 @@
+
+import time
+import unittest
+
+from unittest.mock import patch
+
+from airless.core.hook import MemoryStateHook, SqliteStateHook
+
+
+class StateHookTests:
+
+    def build_hook(self):
+        raise NotImplementedError()
+
+    def setUp(self):
+        self.hook = self.build_hook()
+
+    def test_set_and_get(self):
+        self.hook.set('key', {'value': 1})
+
+        self.assertEqual(self.hook.get('key'), {'value': 1})
+        self.assertTrue(self.hook.exists('key'))
+        self.assertIsNone(self.hook.get('missing'))
+
+    def test_ttl(self):
+        self.hook.set('key', 'value', ttl=10)
+        self.assertEqual(self.hook.get('key'), 'value')
+
+        with patch('time.time', return_value=time.time() + 11):
+            self.assertIsNone(self.hook.get('key'))
+
+    def test_delete(self):
+        self.hook.set('key', 'value')
+        self.hook.delete('key')
+        self.hook.delete('key')
+
+        self.assertFalse(self.hook.exists('key'))
+
+    def test_keys(self):
+        self.hook.set('a/2', 2)
+        self.hook.set('b/1', 1)
+
+        self.assertEqual(self.hook.keys('a/'), ['a/2'])
+        self.assertEqual(self.hook.keys(), ['a/2', 'b/1'])
+
+
+class TestMemoryStateHook(StateHookTests, unittest.TestCase):
+
+    def build_hook(self):
+        return MemoryStateHook(max_size=2)
+
+    def test_discards_least_recently_used(self):
+        self.hook.set('a', 1)
+        self.hook.set('b', 2)
+        self.hook.get('a')
+        self.hook.set('c', 3)
+
+        self.assertEqual(self.hook.get('a'), 1)
+        self.assertIsNone(self.hook.get('b'))
+        self.assertEqual(self.hook.get('c'), 3)
+
+
+class TestSqliteStateHook(StateHookTests, unittest.TestCase):
+
+    def build_hook(self):
+        return SqliteStateHook(':memory:')
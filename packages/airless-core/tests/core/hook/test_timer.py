@@ -0,0 +1,42 @@
+
+import time
+import unittest
+
+from airless.core.hook import SqliteTimerHook
+
+
+class TestSqliteTimerHook(unittest.TestCase):
+
+    def setUp(self):
+        self.hook = SqliteTimerHook(':memory:')
+
+    def test_due(self):
+        now = time.time()
+        late = self.hook.schedule(now + 60, 'topic-late', {'key': 'late'})
+        second = self.hook.schedule(now - 5, 'topic-b', {'key': 'b'}, project='project-b')
+        first = self.hook.schedule(now - 10, 'topic-a', {'key': 'a'})
+
+        timers = self.hook.due(now)
+
+        self.assertEqual([t['id'] for t in timers], [first, second])
+        self.assertEqual(timers[1]['project'], 'project-b')
+        self.assertEqual(timers[1]['topic'], 'topic-b')
+        self.assertEqual(timers[1]['data'], {'key': 'b'})
+        self.assertEqual([t['id'] for t in self.hook.due(now + 61)], [first, second, late])
+
+    def test_due_limit(self):
+        now = time.time()
+        for i in range(5):
+            self.hook.schedule(now - i, 'topic', {'i': i})
+
+        self.assertEqual(len(self.hook.due(now, limit=2)), 2)
+
+    def test_ack(self):
+        now = time.time()
+        timer_id = self.hook.schedule(now - 1, 'topic', {})
+        self.hook.ack([timer_id])
+        self.assertEqual(self.hook.due(now), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
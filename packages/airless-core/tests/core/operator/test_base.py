@@ -1,10 +1,17 @@
 
+import gc
+import gzip
 import os
+import threading
+import time
 import unittest
+import weakref
 
+from base64 import b64encode
 from cloudevents.http import CloudEvent
 from unittest.mock import MagicMock, patch
 
+from airless.core.hook import LocalClaimCheckHook, LocalQueueHook, MemoryStateHook, QueueHook
 from airless.core.operator.base import BaseFileOperator, BaseEventOperator, BaseHttpOperator, BaseOperator
 
 
@@ -54,6 +61,27 @@ class TestBaseOperator(unittest.TestCase):
         self.assertEqual(chained_messages, expected_chained_messages)
         self.assertEqual(first_topic, 'topic1')
 
+    def test_context_per_operator(self):
+        other = BaseOperator()
+        other.queue_hook = MagicMock()
+
+        context = self.operator.reset()
+        other.reset()
+
+        self.assertIs(self.operator.context, context)
+        self.assertIsNot(other.context, context)
+
+    def test_context_released_with_operator(self):
+        operator = BaseOperator()
+        operator.reset()
+        reference = weakref.ref(operator)
+
+        del operator
+        gc.collect()
+
+        # The contexts are not kept alive by operators that were released
+        self.assertIsNone(reference())
+
 
 class TestBaseFileOperator(unittest.TestCase):
 
@@ -84,6 +112,16 @@ class TestBaseFileOperator(unittest.TestCase):
         self.operator.run(self.cloud_event)
         self.assertTrue(self.operator.has_error)
 
+    @patch.object(BaseFileOperator, 'execute', return_value=None)
+    def test_run_skips_processed_events(self, mock_execute):
+        self.operator.idempotency_hook = MemoryStateHook()
+        self.cloud_event['id'] = '456'
+
+        self.operator.run(self.cloud_event)
+        self.operator.run(self.cloud_event)
+
+        mock_execute.assert_called_once()
+
 
 class TestBaseEventOperator(unittest.TestCase):
 
@@ -116,6 +154,243 @@ class TestBaseEventOperator(unittest.TestCase):
         self.operator.run(self.cloud_event)
         self.assertTrue(self.operator.has_error)
 
+    def test_run_error_reports_exception_type(self):
+        from airless.core.utils import RetryPolicy
+
+        class HTTPError(Exception):
+            def __init__(self):
+                super().__init__('Not found')
+                self.response = MagicMock(status_code=404)
+
+        class PolicyOperator(BaseEventOperator):
+            retry_policy = RetryPolicy(permanent=['KeyError'])
+
+            def execute(self, data, topic):
+                raise HTTPError()
+
+        operator = PolicyOperator()
+        operator.queue_hook = MagicMock()
+        operator.run(self.cloud_event)
+
+        error = operator.queue_hook.publish.call_args.kwargs['data']
+        self.assertTrue(error['error_type'].endswith('.HTTPError'))
+        self.assertEqual(error['error_types'], [error['error_type'], 'Exception'])
+        self.assertEqual(error['error_status'], 404)
+        self.assertEqual(error['retry_policy']['permanent'], ['KeyError'])
+
+    @patch.object(BaseEventOperator, 'execute', return_value=None)
+    def test_run_flushes_datalake_writer(self, mock_execute):
+        self.operator.datalake_writer = MagicMock()
+        self.operator.run(self.cloud_event)
+        self.operator.datalake_writer.bind_invocation.assert_called_once_with(self.operator.context)
+        self.operator.datalake_writer.end_invocation.assert_called_once_with(self.operator.context)
+        self.assertFalse(self.operator.has_error)
+
+        self.operator.datalake_writer.end_invocation.side_effect = Exception('Unavailable')
+        self.operator.run(self.cloud_event)
+        self.assertTrue(self.operator.has_error)
+
+    @patch.object(BaseEventOperator, 'execute', return_value=None)
+    def test_run_flushes_queue(self, mock_execute):
+        self.operator.run(self.cloud_event)
+        self.operator.queue_hook.flush.assert_called_once_with(pending=self.operator.context.pending_messages)
+        self.operator.queue_hook.bind_pending.assert_called_with(self.operator.context.pending_messages)
+        self.assertFalse(self.operator.has_error)
+
+    @patch.object(BaseEventOperator, 'execute', return_value=None)
+    def test_run_reports_flush_error(self, mock_execute):
+        self.operator.queue_hook.flush.side_effect = Exception('Error!')
+        self.operator.run(self.cloud_event)
+        self.assertTrue(self.operator.has_error)
+        self.operator.queue_hook.publish.assert_called_once()
+
+    @patch('time.sleep')
+    def test_run_next_publishes_with_delay(self, mock_sleep):
+        self.operator.queue_hook.SUPPORTS_DELAY = True
+        tasks = [
+            {'topic': 'topic-a', 'data': {'key': 'a'}},
+            {'topic': 'topic-b', 'project': 'project-b', 'data': {'key': 'b'}, 'delay': 0}
+        ]
+        with patch.dict(os.environ, {'RUN_NEXT_DELAY': '5'}):
+            self.operator.run_next(tasks)
+
+        mock_sleep.assert_not_called()
+        self.operator.queue_hook.publish_async.assert_any_call(project=None, topic='topic-a', data={'key': 'a'}, delay=5.0)
+        self.operator.queue_hook.publish_async.assert_any_call(project='project-b', topic='topic-b', data={'key': 'b'}, delay=0)
+
+    def test_run_next_null_delay(self):
+        self.operator.queue_hook.SUPPORTS_DELAY = True
+
+        with patch.dict(os.environ, {'RUN_NEXT_DELAY': '5'}):
+            self.operator.run_next([{'topic': 'topic-a', 'data': {'key': 'a'}, 'delay': None}])
+
+        self.operator.queue_hook.publish_async.assert_called_once_with(project=None, topic='topic-a', data={'key': 'a'}, delay=5.0)
+
+    @patch('time.sleep')
+    def test_run_next_schedules_delayed_tasks(self, mock_sleep):
+        self.operator.queue_hook.SUPPORTS_DELAY = False
+        self.operator.timer_hook = MagicMock()
+        tasks = [
+            {'topic': 'topic-a', 'data': {'key': 'a'}},
+            {'topic': 'topic-b', 'project': 'project-b', 'data': {'key': 'b'}, 'delay': 0}
+        ]
+        with patch.dict(os.environ, {'RUN_NEXT_DELAY': '5'}):
+            self.operator.run_next(tasks)
+
+        mock_sleep.assert_not_called()
+        self.operator.timer_hook.schedule.assert_called_once()
+        kwargs = self.operator.timer_hook.schedule.call_args.kwargs
+        self.assertEqual((kwargs['topic'], kwargs['data'], kwargs['project']), ('topic-a', {'key': 'a'}, None))
+        self.assertAlmostEqual(kwargs['due_at'], time.time() + 5, delta=1)
+        self.operator.queue_hook.publish_async.assert_called_once_with(
+            project='project-b', topic='topic-b', data={'key': 'b'}, delay=None)
+
+    @patch('time.sleep')
+    def test_run_next_without_timer_publishes_right_away(self, mock_sleep):
+        self.operator.queue_hook.SUPPORTS_DELAY = False
+        self.operator.run_next([{'topic': 'topic-a', 'data': {'key': 'a'}}])
+
+        mock_sleep.assert_not_called()
+        self.operator.queue_hook.publish_async.assert_called_once_with(
+            project=None, topic='topic-a', data={'key': 'a'}, delay=None)
+
+    def test_run_skips_processed_messages(self):
+        self.operator.idempotency_hook = MemoryStateHook()
+        self.cloud_event['id'] = '123'
+
+        with patch.object(BaseEventOperator, 'execute', side_effect=[Exception('Error!'), None, None]) as mock_execute:
+            # Messages with errors are processed again
+            self.operator.run(self.cloud_event)
+            self.operator.run(self.cloud_event)
+            self.operator.run(self.cloud_event)
+
+        self.assertEqual(mock_execute.call_count, 2)
+        self.assertTrue(self.operator.idempotency_hook.exists('idempotency/BaseEventOperator/123'))
+
+    def test_idempotency_store_from_config(self):
+        with patch.dict(os.environ, {'IDEMPOTENCY_STORE': 'memory'}):
+            self.assertIsInstance(BaseEventOperator().idempotency_hook, MemoryStateHook)
+        self.assertIsNone(BaseEventOperator().idempotency_hook)
+
+    def test_run_skips_messages_not_accepted(self):
+        self.cloud_event.data['message']['attributes'] = {'retries': '3'}
+        self.operator.accept = lambda attributes, topic: int(attributes.get('retries', 0)) < 3
+        self.operator.decode_message = MagicMock()
+
+        with patch.object(BaseEventOperator, 'execute', return_value=None) as mock_execute:
+            self.operator.run(self.cloud_event)
+
+        mock_execute.assert_not_called()
+        self.operator.decode_message.assert_not_called()
+        self.assertEqual(self.operator.trigger_event_attributes, {'retries': '3'})
+
+    def test_run_decompresses_message(self):
+        self.cloud_event.data['message'] = {
+            'data': b64encode(gzip.compress(b'{"key": "compressed"}')).decode(),
+            'attributes': {'content_encoding': 'gzip'}
+        }
+
+        with patch.object(BaseEventOperator, 'execute', return_value=None) as mock_execute:
+            self.operator.run(self.cloud_event)
+
+        mock_execute.assert_called_once_with({'key': 'compressed'}, 'topic-name')
+
+    def test_run_resolves_claim_check(self):
+        self.operator.queue_hook = QueueHook()
+        self.operator.queue_hook.claim_check_hook = LocalClaimCheckHook()
+        claim = self.operator.queue_hook.claim_check_hook.store(b'{"key": "stored"}')
+        self.cloud_event.data['message'] = {'data': '', 'attributes': {'claim_check': claim}}
+
+        with patch.object(BaseEventOperator, 'execute', return_value=None) as mock_execute:
+            self.operator.run(self.cloud_event)
+
+        mock_execute.assert_called_once_with({'key': 'stored'}, 'topic-name')
+        self.assertEqual(self.operator.context.attributes, {'claim_check': claim})
+
+        # The payload is kept for redeliveries and other subscriptions of the topic
+        with patch.object(BaseEventOperator, 'execute', return_value=None) as mock_execute:
+            self.operator.run(self.cloud_event)
+
+        mock_execute.assert_called_once_with({'key': 'stored'}, 'topic-name')
+        self.assertIn(claim, self.operator.queue_hook.claim_check_hook.payloads)
+
+    def test_run_flushes_only_its_messages(self):
+        self.operator.queue_hook = LocalQueueHook()
+        self.operator.queue_hook.subscribe('failing', MagicMock(side_effect=Exception('Error!')))
+        published = threading.Event()
+        finished = threading.Event()
+        errors = []
+        self.operator.report_error = lambda message, **kwargs: errors.append(kwargs['context'].origin)
+
+        def execute(data, topic):
+            if topic == 'failing-origin':
+                self.operator.queue_hook.publish_async(None, 'failing', {})
+                published.set()
+                finished.wait(timeout=2)
+
+        def run(source):
+            cloud_event = CloudEvent({**self.cloud_event._attributes, 'source': source}, self.cloud_event.data)
+            self.operator.run(cloud_event)
+
+        with patch.object(BaseEventOperator, 'execute', side_effect=execute):
+            failing = threading.Thread(target=run, args=('//pubsub/topics/failing-origin',))
+            failing.start()
+            published.wait(timeout=2)
+            # Runs while the other invocation has a failed message pending
+            run('//pubsub/topics/other-origin')
+            finished.set()
+            failing.join()
+
+        self.assertEqual(errors, ['failing-origin'])
+
+    def test_run_reuses_instance(self):
+        with patch.object(BaseEventOperator, 'execute', side_effect=Exception('Error!')):
+            self.operator.run(self.cloud_event)
+        self.assertTrue(self.operator.has_error)
+
+        with patch.object(BaseEventOperator, 'execute', return_value=None), \
+                patch.object(BaseEventOperator, 'run_next') as mock_run_next:
+            self.operator.run(self.cloud_event)
+            mock_run_next.assert_called_once_with([])
+
+        self.assertFalse(self.operator.has_error)
+        self.assertEqual(self.operator.trigger_event_data, {'key': 'Value'})
+
+    def test_run_concurrent_invocations(self):
+        barrier = threading.Barrier(2, timeout=5)
+        seen = {}
+
+        def execute(data, topic):
+            barrier.wait()  # both invocations are in flight at this point
+            seen[data['key']] = (self.operator.trigger_event_data['key'], self.operator.context.origin)
+            if data['key'] == 'fail':
+                raise Exception('Error!')
+
+        def run(key, topic):
+            cloud_event = CloudEvent(
+                {'type': 'com.example.sampletype1', 'source': f'path/to/{topic}'},
+                {'message': {'data': b64encode(f'{{"key": "{key}"}}'.encode()).decode()}})
+            self.operator.run(cloud_event)
+            seen[f'{key}_has_error'] = self.operator.has_error
+
+        with patch.object(self.operator, 'execute', side_effect=execute):
+            threads = [
+                threading.Thread(target=run, args=('ok', 'topic-ok')),
+                threading.Thread(target=run, args=('fail', 'topic-fail'))
+            ]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+
+        self.assertEqual(seen['ok'], ('ok', 'topic-ok'))
+        self.assertEqual(seen['fail'], ('fail', 'topic-fail'))
+        self.assertFalse(seen['ok_has_error'])
+        self.assertTrue(seen['fail_has_error'])
+        error_message = self.operator.queue_hook.publish.call_args.kwargs['data']
+        self.assertEqual(error_message['origin'], 'topic-fail')
+        self.assertEqual(error_message['data'], {'key': 'fail'})
+
 
 class TestBaseHttpOperator(unittest.TestCase):
 
@@ -2,7 +2,7 @@
 import unittest
 
 from time import time
-from unittest.mock import patch
+from unittest.mock import MagicMock, patch
 
 from airless.core.operator import DelayOperator  # Replace with the actual module name where DelayOperator is defined
 
@@ -75,6 +75,26 @@ class TestDelayOperator(unittest.TestCase):
         # The execution time should be less than 1 second (due to mocking)
         self.assertLess(end_time - start_time, 1)
 
+    @patch('time.sleep', return_value=None)
+    def test_execute_with_timer(self, mock_sleep):
+        """Test that the next tasks are scheduled instead of sleeping."""
+        self.operator.timer_hook = MagicMock()
+        data = {
+            'seconds': 600,
+            'metadata': {'run_next': [{'topic': 'next_topic', 'data': {'key': 'value'}}]}
+        }
+        start_time = time()
+        self.operator.execute(data, topic='test_topic')
+
+        mock_sleep.assert_not_called()
+        self.operator.timer_hook.schedule.assert_called_once()
+        kwargs = self.operator.timer_hook.schedule.call_args.kwargs
+        self.assertEqual(kwargs['topic'], 'next_topic')
+        self.assertEqual(kwargs['data'], {'key': 'value'})
+        self.assertAlmostEqual(kwargs['due_at'], start_time + 600, delta=1)
+        # The tasks are not published again by run_next
+        self.assertEqual(data['metadata'], {})
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -1,5 +1,7 @@
 
 import os
+import tempfile
+import time
 import unittest
 from unittest.mock import MagicMock, patch
 
@@ -13,6 +15,30 @@ class TestErrorReprocessOperator(unittest.TestCase):
         self.operator.queue_hook = MagicMock()
         self.operator.datalake_hook = MagicMock()
 
+    @patch('time.sleep', return_value=None)
+    @patch('airless.core.operator.ErrorReprocessOperator._notify_email', return_value=None)
+    @patch('airless.core.operator.ErrorReprocessOperator._notify_slack', return_value=None)
+    def test_execute_retry_with_timer(self, notify_slack, notify_email, mock_sleep):
+        self.operator.timer_hook = MagicMock()
+        data = {
+            'project': 'test_project',
+            'input_type': 'event',
+            'origin': 'source_topic',
+            'event_id': '12345',
+            'data': {'metadata': {'retry_interval': 3, 'retries': 1}}
+        }
+
+        start = time.time()
+        self.operator.execute(data, 'input_topic')
+
+        mock_sleep.assert_not_called()
+        self.operator.queue_hook.publish.assert_not_called()
+        kwargs = self.operator.timer_hook.schedule.call_args.kwargs
+        self.assertEqual(kwargs['topic'], 'source_topic')
+        self.assertEqual(kwargs['project'], 'test_project')
+        self.assertEqual(kwargs['data'], {'metadata': {'retry_interval': 3, 'retries': 2}})
+        self.assertAlmostEqual(kwargs['due_at'], start + 3, delta=1)
+
     @patch('time.sleep', return_value=None)  # Mock sleep to avoid actual delay
     @patch('airless.core.operator.ErrorReprocessOperator._notify_email', return_value=None)
     @patch('airless.core.operator.ErrorReprocessOperator._notify_slack', return_value=None)
@@ -158,6 +184,24 @@ class TestErrorReprocessOperator(unittest.TestCase):
         with self.assertRaises(KeyError):
             self.operator.execute(data, 'error_topic')
 
+    @patch('airless.core.operator.ErrorReprocessOperator._notify_email', return_value=None)
+    @patch('airless.core.operator.ErrorReprocessOperator._notify_slack', return_value=None)
+    def test_execute_undecoded_data(self, notify_slack, notify_email):
+        data = {
+            'project': 'test_project',
+            'input_type': 'event',
+            'origin': 'source_topic',
+            'event_id': '12345',
+            'data': None
+        }
+
+        with patch.dict(os.environ, {'ERROR_DATASET': 'error_dataset', 'ERROR_TABLE': 'error_table'}):
+            self.operator.execute(data, 'error_topic')
+
+        self.operator.queue_hook.publish.assert_not_called()
+        self.operator.datalake_hook.send_to_landing_zone.assert_called_once()
+        notify_slack.assert_called_once()
+
     def test_execute_missing_data(self):
         data = {
             'project': 'test_project',
@@ -387,6 +431,228 @@ class TestErrorReprocessOperator(unittest.TestCase):
 
         self.operator.queue_hook.publish.assert_not_called()
 
+    def test_error_digest(self):
+        self.operator.digest_window = 60
+        self.operator.state_hook = self.durable_state_hook()
+        errors = [
+            {'input_type': 'event', 'origin': 'source', 'event_id': i, 'error': f'Request {i} failed\nTraceback (most recent call last):\nValueError: Request {i} failed',
+             'data': {'metadata': {'max_retries': 0, 'dataset': 'dataset', 'table': 'table'}}}
+            for i in range(4)
+        ]
+        env_vars = {
+            'QUEUE_TOPIC_SLACK_SEND': 'slack',
+            'SLACK_CHANNELS_ERROR': '["channel"]',
+            'QUEUE_TOPIC_ERROR': 'error'
+        }
+
+        with patch.dict(os.environ, env_vars), patch('time.time', return_value=1200):
+            for error in errors:
+                self.operator.execute(error, 'error')
+
+        # Every error is saved, only the first one is notified
+        self.assertEqual(self.operator.datalake_hook.send_to_landing_zone.call_count, 4)
+        self.operator.queue_hook.publish.assert_called_once()
+
+        # The digest is sent when the same error happens in the next window
+        with patch.dict(os.environ, env_vars), patch('time.time', return_value=1260):
+            self.operator.execute(errors[0], 'error')
+
+        self.assertEqual(self.operator.queue_hook.publish.call_count, 3)
+        digest = self.operator.queue_hook.publish.call_args_list[1].kwargs['data']['message']
+        self.assertIn('source | 4 errors ValueError', digest)
+        self.assertIn('Sample message IDs: [0, 1, 2, 3]', digest)
+
+    def test_error_digest_with_timer(self):
+        self.operator.digest_window = 60
+        self.operator.state_hook = self.durable_state_hook()
+        self.operator.timer_hook = MagicMock()
+        error = {'input_type': 'file', 'origin': 'source', 'event_id': 1, 'error': 'error', 'data': {'metadata': {'dataset': 'dataset', 'table': 'table'}}}
+
+        with patch.dict(os.environ, {'QUEUE_TOPIC_ERROR': 'error'}), patch('time.time', return_value=1210):
+            self.operator.execute(error, 'error')
+            self.operator.execute(error, 'error')
+
+        kwargs = self.operator.timer_hook.schedule.call_args.kwargs
+        self.assertEqual(kwargs['due_at'], 1260)
+        self.assertEqual(kwargs['topic'], 'error')
+
+        env_vars = {'QUEUE_TOPIC_SLACK_SEND': 'slack', 'SLACK_CHANNELS_ERROR': '["channel"]'}
+        with patch.dict(os.environ, env_vars), patch('time.time', return_value=1260):
+            self.operator.execute(kwargs['data'], 'error')
+        self.assertIn('source | 2 errors Error', self.operator.queue_hook.publish.call_args.kwargs['data']['message'])
+
+    def test_error_digest_refuses_memory_state(self):
+        from airless.core.hook import MemoryStateHook
+        self.operator.digest_window = 60
+        # Each instance would keep its own counts and notify the first error
+        self.operator.state_hook = MemoryStateHook()
+        error = {'input_type': 'file', 'origin': 'source', 'event_id': 1, 'error': 'error', 'data': {'metadata': {'dataset': 'dataset', 'table': 'table'}}}
+        env_vars = {'QUEUE_TOPIC_SLACK_SEND': 'slack', 'SLACK_CHANNELS_ERROR': '["channel"]'}
+
+        with patch.dict(os.environ, env_vars):
+            self.operator.execute(error, 'error')
+            self.operator.execute(error, 'error')
+
+        self.assertFalse(self.operator.digest_enabled())
+        self.assertEqual(self.operator.queue_hook.publish.call_count, 2)
+        self.assertEqual(self.operator.state_hook.keys(), [])
+
+    def test_error_digest_disabled_by_default(self):
+        with patch.dict(os.environ, {'ERROR_DIGEST_WINDOW': '60'}):
+            operator = ErrorReprocessOperator()
+
+        self.assertIsNone(operator.state_hook)
+        self.assertFalse(operator.digest_enabled())
+
+    @patch('time.sleep', return_value=None)
+    def test_execute_permanent_error(self, mock_sleep):
+        data = {
+            'input_type': 'event',
+            'origin': 'source_topic',
+            'event_id': 1,
+            'error': 'malformed',
+            'error_type': 'KeyError',
+            'error_types': ['KeyError', 'LookupError', 'Exception'],
+            'retry_policy': {'permanent': ['LookupError']},
+            'data': {'metadata': {'dataset': 'dataset', 'table': 'table'}}
+        }
+
+        self.operator.execute(data, 'error')
+
+        mock_sleep.assert_not_called()
+        self.operator.datalake_hook.send_to_landing_zone.assert_called_once()
+
+    @patch('time.sleep', return_value=None)
+    def test_execute_permanent_error_from_traceback(self, mock_sleep):
+        data = {
+            'input_type': 'event',
+            'origin': 'source_topic',
+            'event_id': 1,
+            'error': "'id'\nTraceback (most recent call last):\n  File \"main.py\", line 1\nKeyError: 'id'",
+            'data': {'metadata': {'dataset': 'dataset', 'table': 'table', 'retry_policy': {'permanent': ['KeyError']}}}
+        }
+
+        self.operator.execute(data, 'error')
+
+        self.operator.queue_hook.publish.assert_not_called()
+        self.operator.datalake_hook.send_to_landing_zone.assert_called_once()
+
+    @patch('time.sleep', return_value=None)
+    def test_execute_retry_policy_backoff(self, mock_sleep):
+        data = {
+            'input_type': 'event',
+            'origin': 'source_topic',
+            'event_id': 1,
+            'error': 'timeout',
+            'error_type': 'TimeoutError',
+            'retry_policy': {'strategy': 'fixed', 'interval': 30, 'max_retries_by_type': {'TimeoutError': 5}},
+            'data': {'metadata': {'retries': 3}}
+        }
+
+        self.operator.execute(data, 'error')
+
+        mock_sleep.assert_called_once_with(30)
+        self.operator.queue_hook.publish.assert_called_once_with(project=None, topic='source_topic', data={'metadata': {'retries': 4}})
+
+    def durable_state_hook(self):
+        from airless.core.hook import SqliteStateHook
+        return SqliteStateHook(os.path.join(tempfile.mkdtemp(), 'state.db'))
+
+    def test_circuit_breaker(self):
+        self.operator.circuit_threshold = 2
+        self.operator.circuit_cooldown = 60
+        self.operator.state_hook = self.durable_state_hook()
+        self.operator.timer_hook = MagicMock()
+        errors = [
+            {'project': 'project', 'input_type': 'event', 'origin': 'source', 'event_id': i, 'error': 'error', 'data': {'id': i, 'metadata': {'retries': 0}}}
+            for i in range(4)
+        ]
+
+        with patch.dict(os.environ, {'QUEUE_TOPIC_ERROR': 'error'}):
+            for i, error in enumerate(errors):
+                with patch('time.time', return_value=1000 + i):
+                    self.operator.execute(error, 'error')
+
+        # The first failure is retried, then the circuit opens and the sweep is scheduled
+        schedules = [c.kwargs for c in self.operator.timer_hook.schedule.call_args_list]
+        self.assertEqual([s['topic'] for s in schedules], ['source', 'error'])
+        self.assertEqual(schedules[1], {'due_at': 1061, 'topic': 'error', 'data': {'circuit_sweep': True}})
+        self.assertEqual(len(self.operator.state_hook.keys('circuit-parked/source/')), 3)
+
+        # The sweep does nothing before the cooldown
+        with patch('time.time', return_value=1030):
+            self.operator.execute({'circuit_sweep': True}, 'error')
+        self.operator.queue_hook.publish.assert_not_called()
+
+        # After the cooldown one message is released as a probe
+        with patch.dict(os.environ, {'QUEUE_TOPIC_ERROR': 'error'}), patch('time.time', return_value=1061):
+            self.operator.execute({'circuit_sweep': True}, 'error')
+        self.operator.queue_hook.publish.assert_called_once_with(project='project', topic='source', data={'id': 1, 'metadata': {'retries': 1}})
+        self.assertEqual(self.operator.state_hook.get('circuit/source')['state'], 'half_open')
+
+        # No error arrived during the cooldown, so the circuit closes and the other messages are released
+        with patch('time.time', return_value=1121):
+            self.operator.execute({'circuit_sweep': True}, 'error')
+        self.assertEqual([c.kwargs['data']['id'] for c in self.operator.queue_hook.publish.call_args_list], [1, 2, 3])
+        self.assertIsNone(self.operator.state_hook.get('circuit/source'))
+        self.assertEqual(self.operator.state_hook.keys('circuit-parked/'), [])
+
+    def test_circuit_breaker_probe_fails(self):
+        self.operator.circuit_threshold = 1
+        self.operator.circuit_cooldown = 60
+        self.operator.state_hook = self.durable_state_hook()
+        self.operator.timer_hook = MagicMock()
+        error = {'input_type': 'event', 'origin': 'source', 'event_id': 1, 'error': 'error', 'data': {'metadata': {'retries': 0}}}
+
+        with patch('time.time', return_value=1000):
+            self.operator.execute(error, 'error')
+        with patch('time.time', return_value=1060):
+            self.operator.execute({'circuit_sweep': True}, 'error')
+        self.operator.queue_hook.publish.assert_called_once()
+
+        # The probe fails, so it is parked again and the circuit opens for another cooldown
+        with patch('time.time', return_value=1070):
+            self.operator.execute(error, 'error')
+        circuit = self.operator.state_hook.get('circuit/source')
+        self.assertEqual((circuit['state'], circuit['opened_at']), ('open', 1070))
+        self.assertEqual(len(self.operator.state_hook.keys('circuit-parked/source/')), 1)
+
+        with patch('time.time', return_value=1120):
+            self.operator.execute({'circuit_sweep': True}, 'error')
+        self.operator.queue_hook.publish.assert_called_once()
+
+    def test_circuit_breaker_refuses_memory_state(self):
+        from airless.core.hook import MemoryStateHook
+        self.operator.circuit_threshold = 1
+        # Parked messages would be evicted by the least recently used keys
+        self.operator.state_hook = MemoryStateHook(max_size=2)
+        self.operator.timer_hook = MagicMock()
+        errors = [
+            {'input_type': 'event', 'origin': 'source', 'event_id': i, 'error': 'error', 'data': {'id': i, 'metadata': {'retries': 0}}}
+            for i in range(3)
+        ]
+
+        for error in errors:
+            self.operator.execute(error, 'error')
+
+        self.assertFalse(self.operator.circuit_enabled())
+        self.assertEqual([c.kwargs['data']['id'] for c in self.operator.timer_hook.schedule.call_args_list], [0, 1, 2])
+        self.assertEqual(self.operator.state_hook.keys(), [])
+
+    @patch('time.sleep', return_value=None)
+    def test_circuit_breaker_refuses_without_timer(self, mock_sleep):
+        self.operator.circuit_threshold = 1
+        self.operator.state_hook = self.durable_state_hook()
+        error = {'input_type': 'event', 'origin': 'source', 'event_id': 1, 'error': 'error', 'data': {'metadata': {'retries': 0}}}
+
+        self.operator.execute(error, 'error')
+        self.operator.execute({'circuit_sweep': True}, 'error')
+
+        # Without a timer no sweep would release the parked messages, so they are retried
+        self.assertFalse(self.operator.circuit_enabled())
+        self.operator.queue_hook.publish.assert_called_once_with(project=None, topic='source', data={'metadata': {'retries': 1}})
+        self.assertEqual(self.operator.state_hook.keys(), [])
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -12,6 +12,12 @@ class TestRedirectOperator(unittest.TestCase):
         self.operator = RedirectOperator()
         self.operator.queue_hook = MagicMock()
 
+    def assert_published(self, messages):
+        self.operator.queue_hook.publish_many.assert_called_once()
+        project, topic, published = self.operator.queue_hook.publish_many.call_args.args
+        self.assertEqual((project, topic), ('test_project', 'test_topic'))
+        self.assertEqual(list(published), messages)
+
     def test_execute_without_messages_or_params(self):
         data = {
             'project': 'test_project',
@@ -20,8 +26,7 @@ class TestRedirectOperator(unittest.TestCase):
         
         self.operator.execute(data, 'test_topic')
         
-        self.operator.queue_hook.publish.assert_called_once_with(
-            'test_project', 'test_topic', {})
+        self.assert_published([{}])
 
     def test_execute_with_messages(self):
         data = {
@@ -33,17 +38,7 @@ class TestRedirectOperator(unittest.TestCase):
         
         self.operator.execute(data, 'test_topic')
 
-        self.operator.queue_hook.publish.assert_any_call(
-            'test_project', 
-            'test_topic', 
-            {'key1': 'value1'}
-        )
-
-        self.operator.queue_hook.publish.assert_any_call(
-            'test_project', 
-            'test_topic', 
-            {'key2': 'value2'}
-        )
+        self.assert_published([{'key1': 'value1'}, {'key2': 'value2'}])
         
     def test_execute_with_params(self):
         data = {
@@ -55,17 +50,186 @@ class TestRedirectOperator(unittest.TestCase):
         
         self.operator.execute(data, 'test_topic')
         
-        self.operator.queue_hook.publish.assert_any_call(
-            'test_project', 
-            'test_topic', 
-            {'key1': 'value1', 'key2': {'nested': 'new_value1'}}
-        )
-        
-        self.operator.queue_hook.publish.assert_any_call(
-            'test_project', 
-            'test_topic', 
+        self.assert_published([
+            {'key1': 'value1', 'key2': {'nested': 'new_value1'}},
             {'key1': 'value1', 'key2': {'nested': 'new_value2'}}
-        )
+        ])
+
+    def test_expand_messages_is_lazy(self):
+        params = [{'key': f'key{i}', 'values': list(range(1000))} for i in range(3)]
+
+        messages = self.operator.expand_messages([{'base': 'value'}], params)
+
+        self.assertEqual(next(messages), {'base': 'value', 'key0': 0, 'key1': 0, 'key2': 0})
+        self.assertEqual(next(messages), {'base': 'value', 'key0': 0, 'key1': 0, 'key2': 1})
+
+    def test_expand_messages_matches_add_params(self):
+        messages = [{'a': {'x': 1}}, {'b': 2}]
+        params = [
+            {'key': 'a.y', 'values': [1, 2]},
+            {'key': 'a.z.w', 'values': ['p', 'q']},
+            {'key': 'c', 'values': [True]}
+        ]
+
+        expected = messages
+        for param in params:
+            expected = self.operator.add_param_to_messages(expected, param)
+
+        self.assertEqual(list(self.operator.expand_messages(messages, params)), expected)
+        # The original messages are not modified
+        self.assertEqual(messages, [{'a': {'x': 1}}, {'b': 2}])
+
+    def test_execute_with_shards(self):
+        data = {
+            'project': 'test_project',
+            'topic': 'test_topic',
+            'messages': [{'key1': 'value1'}],
+            'params': [
+                {'key': 'a', 'values': [1, 2]},
+                {'key': 'b', 'values': list(range(10))}
+            ],
+            'shard_threshold': 8,
+            'metadata': {'run_next': [{'topic': 'next', 'data': {}}], 'retries': 1}
+        }
+
+        self.operator.execute(data, 'redirect_topic')
+
+        project, topic, shards = self.operator.queue_hook.publish_many.call_args.args
+        shards = list(shards)
+        self.assertEqual((project, topic), (None, 'redirect_topic'))
+        self.assertEqual([s['params'][1]['values'] for s in shards], [[0, 1, 2, 3], [4, 5, 6, 7], [8, 9]])
+        for shard in shards:
+            self.assertEqual(shard['params'][0], {'key': 'a', 'values': [1, 2]})
+            self.assertEqual(shard['topic'], 'test_topic')
+            self.assertEqual(shard['metadata'], {'retries': 1})
+
+        # Each shard publishes its own slice
+        expected = list(self.operator.expand_messages(data['messages'], data['params']))
+        published = []
+        for shard in shards:
+            self.operator.queue_hook.reset_mock()
+            self.operator.execute(shard, 'redirect_topic')
+            published += list(self.operator.queue_hook.publish_many.call_args.args[2])
+        self.assertCountEqual(published, expected)
+
+    def test_execute_with_source(self):
+        reads = []
+
+        def read_values(source):
+            reads.append(source)
+            yield from range(3)
+
+        self.operator.read_values = read_values
+        data = {
+            'project': 'test_project',
+            'topic': 'test_topic',
+            'messages': [{'m': 1}, {'m': 2}],
+            'params': [
+                {'key': 'id', 'source': {'bucket': 'b', 'filepath': 'ids.ndjson'}},
+                {'key': 'a', 'values': ['x', 'y']}
+            ],
+            'shard_threshold': 100
+        }
+
+        self.operator.execute(data, 'redirect_topic')
+
+        # The source fits in a single shard, so it is read once and not sharded
+        self.assert_published([
+            {'m': m, 'id': i, 'a': a} for m in [1, 2] for i in range(3) for a in ['x', 'y']
+        ])
+        self.assertEqual(reads, [{'bucket': 'b', 'filepath': 'ids.ndjson'}])
+
+    def test_execute_shards_source(self):
+        reads = []
+
+        def read_values(source):
+            reads.append(source)
+            yield from range(5)
+
+        self.operator.read_values = read_values
+        data = {
+            'project': 'test_project',
+            'topic': 'test_topic',
+            'messages': [{'m': 1}, {'m': 2}],
+            'params': [
+                {'key': 'id', 'source': {'bucket': 'b', 'filepath': 'ids.ndjson'}},
+                {'key': 'a', 'values': ['x', 'y']}
+            ],
+            'shard_threshold': 8,
+            'metadata': {'run_next': [{'topic': 'next', 'data': {}}]}
+        }
+
+        self.operator.execute(data, 'redirect_topic')
+
+        # Each shard has the values of the source that generate up to 8 messages
+        project, topic, shards = self.operator.queue_hook.publish_many.call_args.args
+        shards = list(shards)
+        self.assertEqual((project, topic), (None, 'redirect_topic'))
+        self.assertEqual([s['params'][0] for s in shards], [{'key': 'id', 'values': v} for v in [[0, 1], [2, 3], [4]]])
+        self.assertEqual(reads, [{'bucket': 'b', 'filepath': 'ids.ndjson'}])
+        self.assertNotIn('metadata', shards[0])
+
+        published = []
+        for shard in shards:
+            self.operator.queue_hook.reset_mock()
+            self.operator.execute(shard, 'redirect_topic')
+            published += list(self.operator.queue_hook.publish_many.call_args.args[2])
+        self.assertCountEqual(published, [{'m': m, 'id': i, 'a': a} for m in [1, 2] for i in range(5) for a in ['x', 'y']])
+        self.assertEqual(len(reads), 1)
+
+    def test_expand_messages_reads_each_source_once(self):
+        reads = []
+
+        def read_values(source):
+            reads.append(source['filepath'])
+            yield from source['values']
+
+        self.operator.read_values = read_values
+        params = [
+            {'key': 'a', 'values': ['x', 'y']},
+            {'key': 'id', 'source': {'filepath': 'ids.ndjson', 'values': [1, 2, 3]}},
+            {'key': 'day', 'source': {'filepath': 'days.ndjson', 'values': ['d1', 'd2']}}
+        ]
+
+        messages = list(self.operator.expand_messages([{'m': 1}, {'m': 2}], params))
+
+        self.assertCountEqual(messages, self.operator.add_params_to_messages(
+            [{'m': 1}, {'m': 2}],
+            [params[0], {'key': 'id', 'values': [1, 2, 3]}, {'key': 'day', 'values': ['d1', 'd2']}]))
+        self.assertCountEqual(reads, ['ids.ndjson', 'days.ndjson'])
+
+    def test_shard_does_not_split_sources(self):
+        data = {
+            'topic': 'test_topic',
+            'params': [
+                {'key': 'id', 'source': {'bucket': 'b', 'filepath': 'ids.ndjson'}},
+                {'key': 'a', 'values': [1, 2, 3, 4]}
+            ]
+        }
+
+        shards = list(self.operator.shard(data, 2))
+
+        self.assertEqual([s['params'][1]['values'] for s in shards], [[1, 2], [3, 4]])
+        for shard in shards:
+            self.assertEqual(shard['params'][0], data['params'][0])
+
+    def test_read_values_not_implemented(self):
+        params = [{'key': 'id', 'source': {'bucket': 'b', 'filepath': 'ids.ndjson'}}]
+
+        with self.assertRaises(NotImplementedError):
+            list(self.operator.expand_messages([{}], params))
+
+    def test_execute_below_shard_threshold(self):
+        data = {
+            'project': 'test_project',
+            'topic': 'test_topic',
+            'params': [{'key': 'a', 'values': [1, 2]}],
+            'shard_threshold': 2
+        }
+
+        self.operator.execute(data, 'redirect_topic')
+
+        self.assert_published([{'a': 1}, {'a': 2}])
 
     def test_add_key(self):
         message = {'key1': 'value1'}
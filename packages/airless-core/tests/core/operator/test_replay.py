@@ -0,0 +1,111 @@
+
+import json
+import os
+import unittest
+from concurrent.futures import Future
+from datetime import datetime
+from unittest.mock import MagicMock, patch
+
+from airless.core.operator import ErrorReplayOperator
+from airless.core.utils import error_fingerprint
+
+
+def build_row(origin, error, input_type='event', retries=2, data=True):
+    message = {
+        'input_type': input_type,
+        'origin': origin,
+        'error': error,
+        'event_id': 1,
+        'data': {'id': origin, 'metadata': {'retries': retries, 'max_retries': 2}} if data else None
+    }
+    return {
+        '_event_id': 1,
+        '_resource': origin,
+        '_json': json.dumps({'data': message, 'metadata': {'event_id': 1, 'resource': origin}}),
+        '_created_at': datetime(2025, 1, 1)
+    }
+
+
+class TestErrorReplayOperator(unittest.TestCase):
+
+    def setUp(self):
+        self.operator = ErrorReplayOperator()
+        self.operator.queue_hook = MagicMock()
+        future = Future()
+        future.set_result(None)
+        self.operator.queue_hook.publish_async.return_value = future
+        self.operator.datalake_hook = MagicMock()
+        self.operator.datalake_hook.read_landing_zone.return_value = [
+            build_row('a', 'ValueError: 1'),
+            build_row('b', 'ValueError: 2'),
+            build_row('a', 'KeyError: 3'),
+            build_row('a', 'ValueError: 4', input_type='file'),
+        ]
+        self.env = patch.dict(os.environ, {'ERROR_DATASET': 'dataset', 'ERROR_TABLE': 'table'})
+        self.env.start()
+
+    def tearDown(self):
+        self.env.stop()
+
+    def test_replay(self):
+        replayed = self.operator.replay(start=datetime(2025, 1, 1), end=datetime(2025, 1, 2), rate=0)
+
+        self.assertEqual(replayed, 3)
+        self.operator.datalake_hook.read_landing_zone.assert_called_once_with(
+            dataset='dataset', table='table', start=datetime(2025, 1, 1), end=datetime(2025, 1, 2))
+        calls = [c.kwargs for c in self.operator.queue_hook.publish_async.call_args_list]
+        self.assertEqual([c['topic'] for c in calls], ['a', 'b', 'a'])
+        self.assertEqual(calls[0]['data'], {'id': 'a', 'metadata': {'retries': 0, 'max_retries': 2}})
+
+    def test_replay_skips_errors_without_message(self):
+        self.operator.datalake_hook.read_landing_zone.return_value.insert(0, build_row('a', 'JSONDecodeError: 5', data=False))
+
+        with self.assertLogs(self.operator.logger, 'WARNING'):
+            replayed = self.operator.replay(start=datetime(2025, 1, 1), rate=0)
+
+        self.assertEqual(replayed, 3)
+        self.assertEqual([c.kwargs['topic'] for c in self.operator.queue_hook.publish_async.call_args_list], ['a', 'b', 'a'])
+
+    def test_replay_filters(self):
+        replayed = self.operator.replay(
+            start=datetime(2025, 1, 1), origin='a', fingerprint=error_fingerprint('a', 'ValueError: 10'), rate=0)
+
+        self.assertEqual(replayed, 1)
+        self.assertEqual(self.operator.queue_hook.publish_async.call_args.kwargs['topic'], 'a')
+
+    def test_replay_dry_run_and_limit(self):
+        replayed = self.operator.replay(start=datetime(2025, 1, 1), limit=2, dry_run=True)
+
+        self.assertEqual(replayed, 2)
+        self.operator.queue_hook.publish_async.assert_not_called()
+
+    @patch('airless.core.operator.replay.RateLimiter')
+    def test_replay_rate_and_concurrency(self, mock_limiter):
+        futures = [MagicMock() for _ in range(3)]
+        self.operator.queue_hook.publish_async.side_effect = futures
+
+        self.operator.replay(start=datetime(2025, 1, 1), rate=5, concurrency=2)
+
+        mock_limiter.assert_called_once_with(5)
+        self.assertEqual(mock_limiter.return_value.acquire.call_count, 3)
+        # The oldest message is waited for once two are in flight
+        for future in futures:
+            future.result.assert_called_once()
+
+    def test_execute(self):
+        self.operator.execute({'start': '2025-01-01', 'origin': 'b', 'rate': 0}, 'replay')
+
+        self.operator.queue_hook.publish_async.assert_called_once()
+
+    @patch('airless.core.operator.ErrorReplayOperator.replay', return_value=3)
+    def test_cli(self, mock_replay):
+        replayed = ErrorReplayOperator.cli(['--start', '2025-01-01', '--origin', 'a', '--rate', '10', '--dry-run'])
+
+        self.assertEqual(replayed, 3)
+        kwargs = mock_replay.call_args.kwargs
+        self.assertEqual(kwargs['start'], datetime(2025, 1, 1))
+        self.assertEqual((kwargs['origin'], kwargs['rate'], kwargs['dry_run']), ('a', 10, True))
+
+
+if __name__ == '__main__':
+    unittest.main()
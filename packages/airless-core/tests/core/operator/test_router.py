@@ -0,0 +1,173 @@
+
+import json
+import os
+import unittest
+
+from base64 import b64encode
+from cloudevents.http import CloudEvent
+from unittest.mock import MagicMock, patch
+
+from airless.core.operator import BaseEventOperator, OperatorRegistry, OperatorRouter
+
+
+class FakeEventOperator(BaseEventOperator):
+
+    def __init__(self):
+        super().__init__()
+        self.queue_hook = MagicMock()
+        self.executed = []
+
+    def execute(self, data, topic):
+        self.executed.append((data, topic))
+
+
+class OtherEventOperator(FakeEventOperator):
+    pass
+
+
+def build_event(topic, data, attributes=None):
+    message = {'data': b64encode(json.dumps(data).encode()).decode()}
+    if attributes:
+        message['attributes'] = attributes
+    return CloudEvent(
+        {'source': f'//pubsub.googleapis.com/projects/test/topics/{topic}', 'type': 'google.cloud.pubsub.topic.v1.messagePublished', 'id': '1'},
+        {'message': message}
+    )
+
+
+class TestOperatorRegistry(unittest.TestCase):
+
+    def setUp(self):
+        self.registry = OperatorRegistry()
+
+    def test_get_registered_class(self):
+        self.registry.register('fake', FakeEventOperator)
+        self.assertIs(self.registry.get('fake'), FakeEventOperator)
+
+    def test_get_import_path(self):
+        self.registry.register('fake', 'tests.core.operator.test_router:FakeEventOperator')
+        self.assertIs(self.registry.get('fake'), FakeEventOperator)
+
+    def test_get_unregistered_import_path(self):
+        with self.assertRaises(KeyError):
+            self.registry.get('tests.core.operator.test_router:OtherEventOperator')
+
+    def test_get_not_an_operator(self):
+        self.registry.register('json', 'json:JSONDecoder')
+        self.registry.register('function', build_event)
+        with self.assertRaises(TypeError):
+            self.registry.get('json')
+        with self.assertRaises(TypeError):
+            self.registry.get('function')
+
+    @patch('importlib.metadata.entry_points')
+    def test_get_entry_point(self, mock_entry_points):
+        entry_point = MagicMock(value='tests.core.operator.test_router:FakeEventOperator')
+        entry_point.name = 'fake'
+        mock_entry_points.return_value.select.return_value = [entry_point]
+
+        self.assertIn('fake', self.registry.names())
+        self.assertIs(self.registry.get('fake'), FakeEventOperator)
+        mock_entry_points.return_value.select.assert_called_once_with(group='airless.operators')
+
+    def test_get_missing(self):
+        with self.assertRaises(KeyError):
+            self.registry.get('missing')
+
+
+class TestOperatorRouter(unittest.TestCase):
+
+    def setUp(self):
+        self.registry = OperatorRegistry()
+        self.registry.register('fake', FakeEventOperator)
+        self.registry.register('other', OtherEventOperator)
+
+    def test_route_by_topic(self):
+        router = OperatorRouter(routes={'topic-a': 'fake', 'topic-b': 'other'}, registry=self.registry)
+
+        router.run(build_event('topic-a', {'key': 'a'}))
+        router.run(build_event('topic-b', {'key': 'b'}))
+        router.run(build_event('topic-a', {'key': 'c'}))
+
+        fake = router.get_operator('fake')
+        self.assertIsInstance(fake, FakeEventOperator)
+        self.assertEqual(fake.executed, [({'key': 'a'}, 'topic-a'), ({'key': 'c'}, 'topic-a')])
+        self.assertEqual(router.get_operator('other').executed, [({'key': 'b'}, 'topic-b')])
+
+    def test_route_by_attribute(self):
+        router = OperatorRouter(routes={'topic-a': 'fake'}, registry=self.registry)
+
+        router.run(build_event('topic-a', {'key': 'a'}, attributes={'operator': 'other'}))
+
+        self.assertEqual(router.get_operator('other').executed, [({'key': 'a'}, 'topic-a')])
+        self.assertEqual(router.get_operator('fake').executed, [])
+
+    @patch.dict(os.environ, {'QUEUE_TOPIC_ERROR': 'error'})
+    def test_route_by_attribute_not_registered(self):
+        queue_hook = MagicMock()
+        router = OperatorRouter(routes={'topic-a': 'fake'}, registry=self.registry, queue_hook=queue_hook)
+        event = build_event('topic-a', {'key': 'a'}, attributes={'operator': 'os:system'})
+
+        router.run(event)
+
+        # The event is reported instead of being dropped
+        error = queue_hook.publish.call_args.kwargs
+        self.assertEqual(error['topic'], 'error')
+        self.assertEqual(error['data']['origin'], 'topic-a')
+        self.assertEqual(error['data']['data'], {'key': 'a'})
+        self.assertEqual(error['data']['error_type'], 'KeyError')
+        self.assertIn('Operator os:system is not registered', error['data']['error'])
+        self.assertEqual(error['data']['retry_policy']['permanent'], ['KeyError', 'TypeError', 'ImportError', 'AttributeError'])
+        self.assertEqual(router.get_operator('fake').executed, [])
+
+    @patch.dict(os.environ, {'QUEUE_TOPIC_ERROR': 'error'})
+    def test_route_not_found_is_reported(self):
+        queue_hook = MagicMock()
+        router = OperatorRouter(routes={}, registry=self.registry, queue_hook=queue_hook)
+
+        router.run(build_event('topic-c', {'key': 'c'}))
+        router.run(build_event('topic-c', {'key': 'd'}))
+
+        self.assertEqual([c.kwargs['data']['data'] for c in queue_hook.publish.call_args_list], [{'key': 'c'}, {'key': 'd'}])
+        self.assertIn('No operator found for the event from topic-c', queue_hook.publish.call_args.kwargs['data']['error'])
+
+    @patch.dict(os.environ, {'QUEUE_TOPIC_ERROR': 'error'})
+    def test_route_not_an_operator_is_reported(self):
+        queue_hook = MagicMock()
+        self.registry.register('json', 'json:JSONDecoder')
+        router = OperatorRouter(routes={'topic-a': 'json'}, registry=self.registry, queue_hook=queue_hook)
+
+        router.run(build_event('topic-a', {}))
+
+        self.assertEqual(queue_hook.publish.call_args.kwargs['data']['error_type'], 'TypeError')
+
+    def test_route_configured_import_path(self):
+        path = 'tests.core.operator.test_router:OtherEventOperator'
+        router = OperatorRouter(routes={'topic-a': path}, registry=self.registry)
+
+        router.run(build_event('topic-a', {'key': 'a'}))
+
+        self.assertEqual(router.get_operator(path).executed, [({'key': 'a'}, 'topic-a')])
+
+    def test_route_default(self):
+        router = OperatorRouter(routes={}, default='fake', registry=self.registry)
+        self.assertEqual(router.resolve(build_event('topic-c', {})), 'fake')
+
+    def test_route_not_found(self):
+        router = OperatorRouter(routes={}, registry=self.registry)
+        with self.assertRaises(KeyError):
+            router.resolve(build_event('topic-c', {}))
+
+    def test_operators_are_created_lazily(self):
+        registry = MagicMock()
+        registry.get.return_value = FakeEventOperator
+        router = OperatorRouter(routes={'topic-a': 'fake'}, registry=registry)
+
+        registry.get.assert_not_called()
+        router.run(build_event('topic-a', {}))
+        router.run(build_event('topic-a', {}))
+        registry.get.assert_called_once_with('fake')
+
+
+if __name__ == '__main__':
+    unittest.main()
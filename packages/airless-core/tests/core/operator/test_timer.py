@@ -0,0 +1,62 @@
+
+import time
+import unittest
+
+from concurrent.futures import Future
+from unittest.mock import MagicMock
+
+from airless.core.hook import LocalQueueHook, SqliteTimerHook
+from airless.core.operator import TimerSweepOperator
+
+
+class TestTimerSweepOperator(unittest.TestCase):
+
+    def setUp(self):
+        self.operator = TimerSweepOperator()
+        self.operator.queue_hook = LocalQueueHook()
+        self.operator.timer_hook = SqliteTimerHook(':memory:')
+
+    def test_execute_publishes_due_timers(self):
+        now = time.time()
+        self.operator.timer_hook.schedule(now - 1, 'topic-a', {'key': 'a'}, project='project-a')
+        self.operator.timer_hook.schedule(now + 60, 'topic-b', {'key': 'b'})
+
+        self.operator.execute({}, 'sweep')
+
+        self.assertEqual(self.operator.queue_hook.messages['topic-a'], [{'key': 'a'}])
+        self.assertEqual(self.operator.queue_hook.messages['topic-b'], [])
+        self.assertEqual(self.operator.timer_hook.due(now + 61)[0]['topic'], 'topic-b')
+
+    def test_execute_in_batches(self):
+        now = time.time()
+        for i in range(5):
+            self.operator.timer_hook.schedule(now - 10 + i, 'topic', {'i': i})
+
+        self.operator.execute({'batch_size': 2}, 'sweep')
+
+        self.assertEqual(self.operator.queue_hook.messages['topic'], [{'i': i} for i in range(5)])
+        self.assertEqual(self.operator.timer_hook.due(), [])
+
+    def test_execute_keeps_failed_timers(self):
+        now = time.time()
+        self.operator.timer_hook.schedule(now - 2, 'topic-ok', {})
+        self.operator.timer_hook.schedule(now - 1, 'topic-fail', {})
+
+        def publish_async(project, topic, data):
+            future = Future()
+            if topic == 'topic-fail':
+                future.set_exception(Exception('Error!'))
+            else:
+                future.set_result(None)
+            return future
+
+        self.operator.queue_hook = MagicMock()
+        self.operator.queue_hook.publish_async.side_effect = publish_async
+
+        self.operator.execute({}, 'sweep')
+
+        self.assertEqual([t['topic'] for t in self.operator.timer_hook.due()], ['topic-fail'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,42 @@
+
+import unittest
+
+from airless.core.utils import imported_modules
+
+
+class TestImports(unittest.TestCase):
+
+    HEAVY_MODULES = {'requests', 'ndjson', 'dateutil', 'email.mime'}
+
+    def test_import_hook(self):
+        imported = set(imported_modules('import airless.core.hook'))
+        # Hooks are only imported when they are used
+        self.assertFalse(imported & (self.HEAVY_MODULES | {'airless.core.hook.file', 'airless.core.hook.queue'}))
+
+        imported = set(imported_modules('from airless.core.hook import FileHook, EmailHook, QueueHook'))
+        self.assertFalse(imported & (self.HEAVY_MODULES | {'airless.core.hook.datalake'}))
+
+    def test_import_operator(self):
+        imported = set(imported_modules('import airless.core.operator'))
+        self.assertFalse(imported & (self.HEAVY_MODULES | {'airless.core.operator.base'}))
+
+        imported = set(imported_modules('from airless.core.operator import BaseEventOperator, RedirectOperator'))
+        self.assertFalse(imported & (self.HEAVY_MODULES | {'airless.core.operator.error'}))
+
+    def test_imported_modules(self):
+        imported = imported_modules('import airless.core.utils')
+
+        self.assertIn('airless.core.utils', imported)
+        self.assertNotIn('subprocess', imported)
+
+    def test_lazy_exports(self):
+        import airless.core.hook as hook
+
+        self.assertIn('FileHook', dir(hook))
+        self.assertIs(hook.FileHook, hook.__dict__['FileHook'])
+        with self.assertRaises(AttributeError):
+            hook.MissingHook
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,70 @@
+
+import threading
+import time
+import unittest
+
+from unittest.mock import MagicMock
+
+from airless.core.utils import ClientRegistry
+
+
+class ClientRegistryTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.registry = ClientRegistry()
+
+    def test_get_creates_client_once(self):
+        client_type = MagicMock()
+
+        first = self.registry.get(client_type)
+        second = self.registry.get(client_type)
+
+        assert first is second
+        client_type.assert_called_once_with()
+
+    def test_get_is_keyed_by_project(self):
+        client_type = MagicMock(side_effect=lambda **kwargs: object())
+
+        client_a = self.registry.get(client_type, 'project-a')
+        client_b = self.registry.get(client_type, 'project-b')
+
+        assert client_a is not client_b
+        assert self.registry.get(client_type, 'project-a') is client_a
+        client_type.assert_any_call(project='project-a')
+        client_type.assert_any_call(project='project-b')
+
+    def test_get_with_factory(self):
+        factory = MagicMock(return_value='client')
+
+        assert self.registry.get('custom', factory=factory) == 'client'
+        assert self.registry.get('custom', factory=factory) == 'client'
+        factory.assert_called_once_with()
+
+    def test_get_concurrent_requests_build_single_client(self):
+        def factory():
+            time.sleep(0.05)
+            return object()
+
+        factory_mock = MagicMock(side_effect=factory)
+        clients = []
+
+        threads = [threading.Thread(target=lambda: clients.append(self.registry.get('slow', factory=factory_mock))) for _ in range(5)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        factory_mock.assert_called_once()
+        assert all(c is clients[0] for c in clients)
+
+    def test_clear(self):
+        client_type = MagicMock(side_effect=lambda: object())
+
+        client = self.registry.get(client_type)
+        self.registry.clear()
+
+        assert self.registry.get(client_type) is not client
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,84 @@
+
+import importlib.util
+import json
+import unittest
+
+from dataclasses import dataclass
+from datetime import date, datetime
+from unittest.mock import patch
+
+from airless.core.utils import JsonCodec, get_json_codec, json_dumps, json_dumps_persisted, json_loads, set_json_codec
+
+
+@dataclass
+class Point:
+    x: int
+
+
+CODECS = [name for name in ('orjson', 'msgspec') if importlib.util.find_spec(name)] + ['json']
+
+
+class JsonCodecTestCase(unittest.TestCase):
+
+    def test_codecs_produce_the_same_output(self):
+        data = {
+            'text': 'ação',
+            'number': 1.5,
+            'nested': {'list': [1, None, True]},
+            'datetime': datetime(2025, 1, 1, 9, 30),
+            'date': date(2025, 1, 1),
+            'point': Point(1),
+            1: 'int key'
+        }
+
+        for name in CODECS:
+            with self.subTest(codec=name):
+                codec = JsonCodec(name)
+                encoded = codec.dumps(data)
+                self.assertEqual(encoded, JsonCodec('json').dumps(data))
+                self.assertEqual(codec.dumpb(data), encoded.encode('utf-8'))
+                self.assertEqual(codec.loads(encoded)['datetime'], '2025-01-01 09:30:00')
+                self.assertEqual(codec.loads(encoded)['point'], 'Point(x=1)')
+
+    def test_big_integers(self):
+        for name in CODECS:
+            with self.subTest(codec=name):
+                self.assertEqual(JsonCodec(name).dumps({'id': 2 ** 70}), f'{{"id":{2 ** 70}}}')
+
+    def test_dumps_persisted_keeps_the_standard_library_format(self):
+        data = {'text': 'ação', 'list': [1, 2], 'datetime': datetime(2025, 1, 1, 9, 30), 'point': Point(1)}
+
+        for name in CODECS:
+            with self.subTest(codec=name):
+                self.assertEqual(JsonCodec(name).dumps_persisted(data), json.dumps(data, default=str))
+
+    def test_dumps_persisted_compact(self):
+        data = {'text': 'ação', 'list': [1, 2]}
+
+        with patch.dict('os.environ', {'JSON_PERSISTED_COMPACT': 'true'}):
+            codecs = [JsonCodec(name) for name in CODECS]
+        for codec in codecs:
+            with self.subTest(codec=codec.name):
+                self.assertEqual(codec.dumps_persisted(data), '{"text":"ação","list":[1,2]}')
+        self.assertEqual(json_dumps_persisted(data), '{"text": "a\\u00e7\\u00e3o", "list": [1, 2]}')
+
+    def test_loads_non_standard_values(self):
+        for name in CODECS:
+            with self.subTest(codec=name):
+                self.assertEqual(JsonCodec(name).loads('[Infinity]'), [float('inf')])
+                with self.assertRaises(ValueError):
+                    JsonCodec(name).loads('{invalid')
+
+    def test_unsupported_codec(self):
+        with self.assertRaises(ValueError):
+            JsonCodec('simplejson')
+
+    def test_codec_from_config(self):
+        with patch.dict('os.environ', {'JSON_CODEC': 'json'}):
+            codec = set_json_codec()
+        try:
+            self.assertEqual(codec.name, 'json')
+            self.assertIs(get_json_codec(), codec)
+            self.assertEqual(json_loads(json_dumps({'a': 1})), {'a': 1})
+        finally:
+            set_json_codec()
@@ -0,0 +1,21 @@
+
+import unittest
+
+from airless.core.utils import compress, decompress
+
+
+class CompressionTestCase(unittest.TestCase):
+
+    def test_gzip_round_trip(self):
+        payload = b'{"metadata": {"run_next": []}}' * 100
+
+        compressed = compress(payload, 'gzip')
+
+        self.assertLess(len(compressed), len(payload))
+        self.assertEqual(decompress(compressed, 'gzip'), payload)
+
+    def test_unsupported_encoding(self):
+        with self.assertRaises(ValueError):
+            compress(b'{}', 'brotli')
+        with self.assertRaises(ValueError):
+            decompress(b'{}', 'brotli')
@@ -0,0 +1,38 @@
+
+import traceback
+import unittest
+
+from airless.core.utils import error_fingerprint, normalize_error_message, parse_error
+
+
+def format_error(e):
+    return f'{str(e)}\n{traceback.format_exc()}'
+
+
+class FingerprintTestCase(unittest.TestCase):
+
+    def test_parse_error(self):
+        try:
+            {}['key']
+        except KeyError as e:
+            error = format_error(e)
+
+        self.assertEqual(parse_error(error), ('KeyError', "'key'"))
+        self.assertEqual(parse_error('Something failed'), ('Error', 'Something failed'))
+        self.assertEqual(parse_error(''), ('Error', ''))
+
+    def test_normalize_error_message(self):
+        message = 'Request 42 to https://api.com/items?id=3 failed for 0a1b2c3d-0000-4000-8000-123456789abc at 0x7f'
+
+        self.assertEqual(normalize_error_message(message), 'Request <n> to <url> failed for <uuid> at <hex>')
+
+    def test_error_fingerprint(self):
+        errors = []
+        for i in range(2):
+            try:
+                raise ValueError(f'Request {i} failed')
+            except ValueError as e:
+                errors.append(format_error(e))
+
+        self.assertEqual(error_fingerprint('topic', errors[0]), error_fingerprint('topic', errors[1]))
+        self.assertNotEqual(error_fingerprint('topic', errors[0]), error_fingerprint('other', errors[0]))
@@ -0,0 +1,38 @@
+
+import unittest
+from unittest.mock import patch
+
+from airless.core.utils import RateLimiter
+
+
+class RateLimiterTestCase(unittest.TestCase):
+
+    @patch('time.sleep', return_value=None)
+    @patch('time.monotonic', return_value=100.0)
+    def test_waits_after_burst(self, mock_monotonic, mock_sleep):
+        limiter = RateLimiter(rate=10, burst=2)
+
+        waits = [limiter.acquire() for _ in range(4)]
+
+        self.assertEqual(waits[:2], [0, 0])
+        self.assertAlmostEqual(waits[2], 0.1)
+        self.assertAlmostEqual(waits[3], 0.2)
+        self.assertEqual(mock_sleep.call_count, 2)
+
+    @patch('time.sleep', return_value=None)
+    def test_refills_over_time(self, mock_sleep):
+        with patch('time.monotonic', return_value=100.0):
+            limiter = RateLimiter(rate=10, burst=1)
+            self.assertEqual(limiter.acquire(), 0)
+        with patch('time.monotonic', return_value=100.2):
+            self.assertEqual(limiter.acquire(), 0)
+        mock_sleep.assert_not_called()
+
+    @patch('time.sleep', return_value=None)
+    def test_without_rate(self, mock_sleep):
+        limiter = RateLimiter(rate=None)
+
+        for _ in range(100):
+            limiter.acquire()
+
+        mock_sleep.assert_not_called()
@@ -0,0 +1,58 @@
+
+import unittest
+from unittest.mock import patch
+
+from airless.core.utils import RetryPolicy, exception_status, exception_types
+
+
+class RetryPolicyTestCase(unittest.TestCase):
+
+    def test_default_policy(self):
+        policy = RetryPolicy()
+
+        self.assertTrue(policy.should_retry(1, ['KeyError']))
+        self.assertFalse(policy.should_retry(2, ['KeyError']))
+        self.assertEqual([policy.backoff(r) for r in range(5)], [1, 5, 25, 125, 480])
+
+    def test_permanent_errors(self):
+        policy = RetryPolicy(permanent=['LookupError'], permanent_status=['4xx', 503])
+
+        self.assertFalse(policy.should_retry(0, ['KeyError', 'LookupError', 'Exception']))
+        self.assertFalse(policy.should_retry(0, ['requests.exceptions.HTTPError'], status=404))
+        self.assertFalse(policy.should_retry(0, ['requests.exceptions.HTTPError'], status=503))
+        self.assertTrue(policy.should_retry(0, ['requests.exceptions.HTTPError'], status=500))
+
+    def test_retriable_errors(self):
+        policy = RetryPolicy(retriable=['TimeoutError'], max_retries_by_type={'TimeoutError': 5})
+
+        self.assertFalse(policy.should_retry(0, ['ValueError']))
+        self.assertTrue(policy.should_retry(4, ['TimeoutError']))
+        self.assertFalse(policy.should_retry(5, ['TimeoutError']))
+
+    @patch('random.uniform', side_effect=lambda a, b: b / 2)
+    def test_backoff_strategies(self, mock_uniform):
+        self.assertEqual(RetryPolicy(strategy='fixed', interval=30).backoff(3), 30)
+        self.assertEqual(RetryPolicy(strategy='none').backoff(3), 0)
+        self.assertEqual(RetryPolicy(interval=2, jitter=True).backoff(3), 4)
+        with self.assertRaises(ValueError):
+            RetryPolicy(strategy='linear')
+
+    def test_from_metadata(self):
+        metadata = {'max_retries': 4, 'retry_interval': 3, 'retry_policy': {'permanent': ['KeyError'], 'strategy': 'fixed'}}
+
+        policy = RetryPolicy.from_metadata(metadata, {'permanent': ['ValueError'], 'jitter': True, 'unknown': 1})
+
+        self.assertEqual(
+            (policy.max_retries, policy.interval, policy.strategy, policy.permanent, policy.jitter),
+            (4, 3, 'fixed', ['KeyError'], True))
+        self.assertEqual(RetryPolicy.from_dict(policy.to_dict()).to_dict(), policy.to_dict())
+
+    def test_exception_types(self):
+        self.assertEqual(exception_types(KeyError('a')), ['KeyError', 'LookupError', 'Exception'])
+        self.assertEqual(exception_types(unittest.SkipTest()), ['unittest.case.SkipTest', 'Exception'])
+
+    def test_exception_status(self):
+        error = Exception()
+        self.assertIsNone(exception_status(error))
+        error.code = 429
+        self.assertEqual(exception_status(error), 429)
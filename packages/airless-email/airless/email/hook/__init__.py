@@ -1,6 +1,15 @@
+from typing import TYPE_CHECKING
 
-from .email import (GoogleEmailHook)
+from airless.core.utils import lazy_exports
+
+if TYPE_CHECKING:
+    from .email import (GoogleEmailHook)
 
 __all__ = [
     'GoogleEmailHook'
 ]
+
+# Submodules are only imported when one of their names is first accessed
+__getattr__, __dir__ = lazy_exports(__name__, {
+    'GoogleEmailHook': '.email'
+})
@@ -1,7 +1,15 @@
+from typing import TYPE_CHECKING
 
-from .email import (GoogleEmailSendOperator)
+from airless.core.utils import lazy_exports
 
+if TYPE_CHECKING:
+    from .email import (GoogleEmailSendOperator)
 
 __all__ = [
     'GoogleEmailSendOperator'
 ]
+
+# Submodules are only imported when one of their names is first accessed
+__getattr__, __dir__ = lazy_exports(__name__, {
+    'GoogleEmailSendOperator': '.email'
+})
@@ -1,5 +1,15 @@
-from .bigquery import (BigqueryHook)
+from typing import TYPE_CHECKING
+
+from airless.core.utils import lazy_exports
+
+if TYPE_CHECKING:
+    from .bigquery import (BigqueryHook)
 
 __all__ = [
     'BigqueryHook'
 ]
+
+# Submodules are only imported when one of their names is first accessed
+__getattr__, __dir__ = lazy_exports(__name__, {
+    'BigqueryHook': '.bigquery'
+})
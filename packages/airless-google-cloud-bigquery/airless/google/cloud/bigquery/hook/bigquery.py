@@ -3,7 +3,7 @@ from google.cloud import bigquery
 from google.cloud.exceptions import NotFound
 
 from airless.core.hook import BaseHook
-from airless.core.utils import get_config
+from airless.core.utils import get_client, get_config
 
 
 class BigqueryHook(BaseHook):
@@ -16,10 +16,25 @@ class BigqueryHook(BaseHook):
     def __init__(self):
         """Initializes the BigqueryHook.
 
-        Creates a BigQuery client instance.
+        The BigQuery client is only created when it is first used.
         """
         super().__init__()
-        self.bigquery_client = bigquery.Client()
+        self._bigquery_client = None
+
+    @property
+    def bigquery_client(self):
+        """The BigQuery client, created on first use.
+
+        Returns:
+            google.cloud.bigquery.Client: The BigQuery client shared by the process.
+        """
+        if self._bigquery_client is None:
+            self._bigquery_client = get_client(bigquery.Client)
+        return self._bigquery_client
+
+    @bigquery_client.setter
+    def bigquery_client(self, bigquery_client):
+        self._bigquery_client = bigquery_client
 
     def build_table_id(self, project, dataset, table):
         """Builds a BigQuery table ID string.
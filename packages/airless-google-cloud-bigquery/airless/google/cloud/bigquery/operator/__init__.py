@@ -1,3 +1,17 @@
-from .bigquery import GcsQueryToBigqueryOperator, PubsubToBigqueryOperator
+from typing import TYPE_CHECKING
 
-__all__ = ['GcsQueryToBigqueryOperator', 'PubsubToBigqueryOperator']
+from airless.core.utils import lazy_exports
+
+if TYPE_CHECKING:
+    from .bigquery import (GcsQueryToBigqueryOperator, PubsubToBigqueryOperator)
+
+__all__ = [
+    'GcsQueryToBigqueryOperator',
+    'PubsubToBigqueryOperator'
+]
+
+# Submodules are only imported when one of their names is first accessed
+__getattr__, __dir__ = lazy_exports(__name__, {
+    'GcsQueryToBigqueryOperator': '.bigquery',
+    'PubsubToBigqueryOperator': '.bigquery'
+})
@@ -1,12 +1,11 @@
 
-import json
 import re
 from typing import Any, Dict, List, Optional
 
 from datetime import datetime
 from unidecode import unidecode
 
-from airless.core.utils import get_config
+from airless.core.utils import get_config, json_dumps_persisted
 from airless.core.dto import BaseDto
 
 from airless.google.cloud.core.operator import GoogleBaseEventOperator
@@ -109,7 +108,7 @@ class PubsubToBigqueryOperator(GoogleBaseEventOperator):
         prepared_row = {
             '_event_id': event_id,
             '_resource': resource,
-            '_json': json.dumps(row),
+            '_json': json_dumps_persisted(row),
             '_created_at': str(datetime.now())
         }
 
@@ -125,7 +124,7 @@ class PubsubToBigqueryOperator(GoogleBaseEventOperator):
                         new_key = self.format_key(new_key)
 
                     if isinstance(row[key], list) or isinstance(row[key], dict):
-                        prepared_row[new_key] = json.dumps(row[key])
+                        prepared_row[new_key] = json_dumps_persisted(row[key])
                     else:
                         prepared_row[new_key] = str(row[key])
 
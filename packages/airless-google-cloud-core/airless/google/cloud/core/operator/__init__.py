@@ -1,6 +1,11 @@
-from .base import (GoogleBaseEventOperator, GoogleBaseFileOperator)
-from .delay import (GoogleDelayOperator)
-from .redirect import (GoogleRedirectOperator)
+from typing import TYPE_CHECKING
+
+from airless.core.utils import lazy_exports
+
+if TYPE_CHECKING:
+    from .base import (GoogleBaseEventOperator, GoogleBaseFileOperator)
+    from .delay import (GoogleDelayOperator)
+    from .redirect import (GoogleRedirectOperator)
 
 __all__ = [
     'GoogleBaseEventOperator',
@@ -8,3 +13,11 @@ __all__ = [
     'GoogleDelayOperator',
     'GoogleRedirectOperator'
 ]
+
+# Submodules are only imported when one of their names is first accessed
+__getattr__, __dir__ = lazy_exports(__name__, {
+    'GoogleBaseEventOperator': '.base',
+    'GoogleBaseFileOperator': '.base',
+    'GoogleDelayOperator': '.delay',
+    'GoogleRedirectOperator': '.redirect'
+})
@@ -1,22 +1,63 @@
-
+from airless.core.hook import get_hook
 from airless.core.operator import BaseFileOperator, BaseEventOperator
+from airless.core.utils import get_config
 
 from airless.google.cloud.pubsub.hook import GooglePubsubHook
 
 
+def _build_idempotency_hook():
+    """Builds the GCS idempotency store when `IDEMPOTENCY_STORE` is `gcs`.
+
+    Returns:
+        Optional[GcsStateHook]: The store, or None for the other values.
+    """
+    if get_config('IDEMPOTENCY_STORE', False) != 'gcs':
+        return None
+    return get_hook('GcsStateHook')()
+
+
+def _build_timer_hook():
+    """Builds the GCS timer store when `GCS_BUCKET_TIMER` is set.
+
+    Returns:
+        Optional[GcsTimerHook]: The store, or None when the bucket is not set.
+    """
+    if not get_config('GCS_BUCKET_TIMER', False):
+        return None
+    return get_hook('GcsTimerHook')()
+
+
 class GoogleBaseFileOperator(BaseFileOperator):
-    """Base operator for file operations in Google Cloud."""
+    """Base operator for file operations in Google Cloud.
+
+    Setting `IDEMPOTENCY_STORE` to `gcs` keeps the processed events in the
+    bucket `GCS_BUCKET_STATE`, which requires the `airless-google-cloud-storage`
+    package.
+    """
 
     def __init__(self) -> None:
         """Initializes the GoogleBaseFileOperator."""
         super().__init__()
         self.queue_hook = GooglePubsubHook()  # Have to redefine this attribute for each vendor
+        self.idempotency_hook = _build_idempotency_hook() or self.idempotency_hook
 
 
 class GoogleBaseEventOperator(BaseEventOperator):
-    """Base operator for event operations in Google Cloud."""
+    """Base operator for event operations in Google Cloud.
+
+    Setting `IDEMPOTENCY_STORE` to `gcs` keeps the processed messages in the
+    bucket `GCS_BUCKET_STATE`, which requires the `airless-google-cloud-storage`
+    package.
+
+    Pub/Sub has no scheduled delivery, so delayed `run_next` tasks are stored
+    as timers in the bucket `GCS_BUCKET_TIMER`, when set, and published by the
+    `GoogleTimerSweepOperator` once they are due. Without it they are
+    published right away.
+    """
 
     def __init__(self) -> None:
         """Initializes the GoogleBaseEventOperator."""
         super().__init__()
         self.queue_hook = GooglePubsubHook()  # Have to redefine this attribute for each vendor
+        self.idempotency_hook = _build_idempotency_hook() or self.idempotency_hook
+        self.timer_hook = _build_timer_hook()
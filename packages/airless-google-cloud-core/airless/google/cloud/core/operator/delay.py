@@ -4,7 +4,9 @@ from airless.google.cloud.core.operator import GoogleBaseEventOperator
 
 
 class GoogleDelayOperator(GoogleBaseEventOperator, DelayOperator):
-    """Operator that adds a delay to the pipeline."""
+    """Operator that adds a delay to the pipeline.
 
-    def __init__(self) -> None:
-        super().__init__()
+    The next tasks are scheduled as timers in the bucket set by the environment
+    variable `GCS_BUCKET_TIMER`, when defined, instead of waiting. This requires
+    the `airless-google-cloud-storage` package.
+    """
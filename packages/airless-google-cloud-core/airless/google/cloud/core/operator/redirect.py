@@ -1,4 +1,6 @@
+from typing import Any, Iterator
 
+from airless.core.hook import get_hook
 from airless.core.operator import RedirectOperator
 from airless.google.cloud.core.operator import GoogleBaseEventOperator
 
@@ -7,9 +9,62 @@ class GoogleRedirectOperator(GoogleBaseEventOperator, RedirectOperator):
 
     """Google Cloud implementation of RedirectOperator.
 
-    Operator that receives one event from a Google Pub/Sub topic and publishes 
+    Operator that receives one event from a Google Pub/Sub topic and publishes
     multiple messages to another topic.
+
+    The values of a param can be read from GCS with a `source` containing the
+    `bucket` and either a `filepath` or a `prefix`, to read every file under it
+    like the files of a BigQuery export. The `format` is `ndjson`, the default,
+    or `text` for one value per non-empty line, and `field` picks a single field
+    of each NDJSON record. Reading sources requires the
+    `airless-google-cloud-storage` package.
     """
 
     def __init__(self):
         super().__init__()
+        self._gcs_hook = None
+
+    @property
+    def gcs_hook(self):
+        """The GCS hook used to read sources, created on first use."""
+        if self._gcs_hook is None:
+            self._gcs_hook = get_hook('GcsHook')()
+        return self._gcs_hook
+
+    @gcs_hook.setter
+    def gcs_hook(self, gcs_hook) -> None:
+        self._gcs_hook = gcs_hook
+
+    def read_values(self, source: dict) -> Iterator[Any]:
+        """Reads the values of a param from GCS while they are published.
+
+        Args:
+            source (dict): The location of the values with the keys:
+                - bucket (str): The name of the GCS bucket.
+                - filepath (str): The path of the file, or
+                - prefix (str): The prefix of the files to read, in name order.
+                - format (str): `ndjson` or `text`. Defaults to `ndjson`.
+                - field (str): The field of each NDJSON record to use as value. Optional.
+
+        Yields:
+            Any: The values of the param.
+        """
+        bucket = source['bucket']
+        if 'filepath' in source:
+            filepaths = [source['filepath']]
+        else:
+            filepaths = sorted(blob.name for blob in self.gcs_hook.list(bucket, source['prefix']) if not blob.name.endswith('/'))
+
+        file_format = source.get('format', 'ndjson')
+        if file_format not in ('ndjson', 'text'):
+            raise ValueError(f'Unsupported source format {file_format}')
+
+        field = source.get('field')
+        for filepath in filepaths:
+            if file_format == 'text':
+                yield from (line for line in self.gcs_hook.iter_lines(bucket, filepath) if line)
+            elif field:
+                for record in self.gcs_hook.iter_ndjson(bucket, filepath):
+                    yield record[field]
+            else:
+                yield from self.gcs_hook.iter_ndjson(bucket, filepath)
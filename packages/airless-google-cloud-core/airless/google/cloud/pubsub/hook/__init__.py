@@ -1,5 +1,15 @@
-from .pubsub import (GooglePubsubHook)
+from typing import TYPE_CHECKING
+
+from airless.core.utils import lazy_exports
+
+if TYPE_CHECKING:
+    from .pubsub import (GooglePubsubHook)
 
 __all__ = [
     'GooglePubsubHook'
 ]
+
+# Submodules are only imported when one of their names is first accessed
+__getattr__, __dir__ = lazy_exports(__name__, {
+    'GooglePubsubHook': '.pubsub'
+})
@@ -1,40 +1,146 @@
+from concurrent.futures import Future
+from typing import Any, Iterable, Optional, TYPE_CHECKING
 
-import json
-from typing import Any
+from airless.core.hook import QueueHook, get_hook
+from airless.core.utils import get_client, get_config, json_dumpb
 
-from google.cloud import pubsub_v1
-
-from airless.core.hook import QueueHook
-from airless.core.utils import get_config
+if TYPE_CHECKING:
+    from google.cloud import pubsub_v1
 
 
 class GooglePubsubHook(QueueHook):
-    """Hook for interacting with Google Pub/Sub."""
+    """Hook for interacting with Google Pub/Sub.
+
+    Messages published with `publish_async` and `publish_many` are batched by
+    the publisher client. The batch settings are read from the environment
+    variables `PUBSUB_BATCH_MAX_MESSAGES`, `PUBSUB_BATCH_MAX_BYTES` and
+    `PUBSUB_BATCH_MAX_LATENCY` (in seconds), and default to the client defaults.
+
+    When the environment variable `GCS_BUCKET_CLAIM_CHECK` is set, payloads
+    larger than `CLAIM_CHECK_THRESHOLD` bytes are stored in that bucket and
+    the message only carries a reference to them. This requires the
+    `airless-google-cloud-storage` package.
+
+    Selected metadata of each message, like `retries` and `trace_id`, is
+    also sent as Pub/Sub attributes, see `QueueHook.promote_attributes`.
+
+    Payloads are compressed before being published when `QUEUE_COMPRESSION`
+    is set to `gzip` or `zstd`, the latter requiring the `zstandard` package.
+
+    Pub/Sub has no scheduled delivery, so messages are always published right
+    away and delayed messages are scheduled by the operators with a timer hook.
+    """
 
     def __init__(self) -> None:
         """Initializes the GooglePubsubHook."""
         super().__init__()
-        self.publisher = pubsub_v1.PublisherClient()
+        self._publisher = None
+        if get_config('GCS_BUCKET_CLAIM_CHECK', False):
+            self.claim_check_hook = get_hook('GcsClaimCheckHook')()
+
+    @property
+    def publisher(self) -> 'pubsub_v1.PublisherClient':
+        """The Pub/Sub publisher client, created on first use."""
+        if self._publisher is None:
+            # The Pub/Sub library loads grpc, so it is only imported when a message is published
+            from google.cloud import pubsub_v1
+            self._publisher = get_client(
+                pubsub_v1.PublisherClient,
+                factory=lambda: pubsub_v1.PublisherClient(batch_settings=self.build_batch_settings()))
+        return self._publisher
+
+    @publisher.setter
+    def publisher(self, publisher: 'pubsub_v1.PublisherClient') -> None:
+        self._publisher = publisher
 
-    def publish(self, project: str, topic: str, data: Any) -> str:
+    def build_batch_settings(self) -> 'pubsub_v1.types.BatchSettings':
+        """Builds the batch settings of the publisher client from the environment.
+
+        Returns:
+            pubsub_v1.types.BatchSettings: The batch settings.
+        """
+        from google.cloud import pubsub_v1
+
+        defaults = pubsub_v1.types.BatchSettings()
+        return pubsub_v1.types.BatchSettings(
+            max_messages=int(get_config('PUBSUB_BATCH_MAX_MESSAGES', False, defaults.max_messages)),
+            max_bytes=int(get_config('PUBSUB_BATCH_MAX_BYTES', False, defaults.max_bytes)),
+            max_latency=float(get_config('PUBSUB_BATCH_MAX_LATENCY', False, defaults.max_latency)))
+
+    def publish(self, project: str, topic: str, data: Any, delay: Optional[float] = None) -> str:
         """Publishes a message to a specified Pub/Sub topic.
 
         Args:
             project (str): The GCP project ID.
             topic (str): The Pub/Sub topic name.
             data (Any): The data to publish.
+            delay (Optional[float]): Not supported by Pub/Sub, messages are published right away. Defaults to None.
 
         Returns:
             str: A confirmation message.
         """
+        publish_future = self._publish(project, topic, data, delay)
+        publish_future.result(timeout=10)
+        if get_config('ENV') == 'prod':
+            self.logger.info(f'published to {project or get_config("GCP_PROJECT")}.{topic}')
+            return 'Message published.'
+
+    def publish_async(self, project: str, topic: str, data: Any, delay: Optional[float] = None) -> Future:
+        """Publishes a message to a specified Pub/Sub topic without waiting for it to be sent.
+
+        Args:
+            project (str): The GCP project ID.
+            topic (str): The Pub/Sub topic name.
+            data (Any): The data to publish.
+            delay (Optional[float]): Not supported by Pub/Sub, messages are published right away. Defaults to None.
+
+        Returns:
+            Future: A future resolved with the message ID once the message is published.
+        """
+        return self.track(self._publish(project, topic, data, delay))
+
+    def _publish(self, project: str, topic: str, data: Any, delay: Optional[float]) -> Future:
+        if delay and delay > 0:
+            self.logger.warning(f'Pub/Sub has no scheduled delivery, publishing to {topic} without the delay of {delay} seconds')
+        attributes = self.promote_attributes(data)
+
         if get_config('ENV') == 'prod':
             topic_path = self.publisher.topic_path(project or get_config('GCP_PROJECT'), topic)
 
-            message_bytes = json.dumps(data, default=str).encode('utf-8')
+            message_bytes = json_dumpb(data)
+            message_bytes, encoding_attributes = self.compress(message_bytes)
+            message_bytes, claim_attributes = self.offload(message_bytes)
+            attributes.update(encoding_attributes)
+            attributes.update(claim_attributes)
 
-            publish_future = self.publisher.publish(topic_path, data=message_bytes)
-            publish_future.result(timeout=10)
-            self.logger.info(f'published to {project or get_config("GCP_PROJECT")}.{topic}')
-            return 'Message published.'
+            return self.publisher.publish(topic_path, data=message_bytes, **attributes)
         else:
-            self.logger.debug(f'[DEV] Message published to Project {project or get_config("GCP_PROJECT")}, Topic {topic}: {data}')
+            self.logger.debug(f'[DEV] Message published to Project {project or get_config("GCP_PROJECT")}, Topic {topic}, Attributes {attributes}: {data}')
+            future = Future()
+            future.set_result(None)
+            return future
+
+    def publish_many(
+        self,
+        project: str,
+        topic: str,
+        messages: Iterable[Any],
+        delay: Optional[float] = None,
+        batch_size: int = 1000
+    ) -> int:
+        """Publishes several messages to a Pub/Sub topic in batches and waits until all of them are sent.
+
+        Args:
+            project (str): The GCP project ID.
+            topic (str): The Pub/Sub topic name.
+            messages (Iterable[Any]): The data of each message.
+            delay (Optional[float]): Not supported by Pub/Sub, messages are published right away. Defaults to None.
+            batch_size (int): Maximum number of messages waiting to be sent. Defaults to 1000.
+
+        Returns:
+            int: The number of published messages.
+        """
+        count = super().publish_many(project, topic, messages, delay=delay, batch_size=batch_size)
+        if get_config('ENV') == 'prod':
+            self.logger.info(f'published {count} messages to {project or get_config("GCP_PROJECT")}.{topic}')
+        return count
@@ -0,0 +1,71 @@
+
+import json
+import unittest
+
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+from airless.google.cloud.core.operator import GoogleRedirectOperator
+
+
+FILES = {
+    'ids/part-1.ndjson': ['{"id": 1, "name": "a"}', '', '{"id": 2, "name": "b"}'],
+    'ids/part-0.ndjson': ['{"id": 0, "name": "z"}'],
+    'ids.txt': ['x', '', 'y'],
+}
+
+
+class TestGoogleRedirectOperator(unittest.TestCase):
+
+    def setUp(self):
+        self.operator = GoogleRedirectOperator()
+        self.operator.queue_hook = MagicMock()
+        self.operator.gcs_hook = MagicMock()
+        self.operator.gcs_hook.iter_lines.side_effect = lambda bucket, filepath: iter(FILES[filepath])
+        self.operator.gcs_hook.iter_ndjson.side_effect = lambda bucket, filepath: (json.loads(line) for line in FILES[filepath] if line)
+        self.operator.gcs_hook.list.return_value = [
+            SimpleNamespace(name='ids/'), SimpleNamespace(name='ids/part-1.ndjson'), SimpleNamespace(name='ids/part-0.ndjson')]
+
+    def test_read_ndjson_field(self):
+        values = list(self.operator.read_values({'bucket': 'b', 'filepath': 'ids/part-1.ndjson', 'field': 'id'}))
+
+        self.assertEqual(values, [1, 2])
+        self.operator.gcs_hook.iter_ndjson.assert_called_once_with('b', 'ids/part-1.ndjson')
+
+    def test_read_ndjson_records(self):
+        values = list(self.operator.read_values({'bucket': 'b', 'filepath': 'ids/part-0.ndjson'}))
+
+        self.assertEqual(values, [{'id': 0, 'name': 'z'}])
+
+    def test_read_text(self):
+        values = list(self.operator.read_values({'bucket': 'b', 'filepath': 'ids.txt', 'format': 'text'}))
+
+        self.assertEqual(values, ['x', 'y'])
+
+    def test_read_prefix(self):
+        values = list(self.operator.read_values({'bucket': 'b', 'prefix': 'ids/', 'field': 'id'}))
+
+        # Files are read in name order and folder placeholders are skipped
+        self.assertEqual(values, [0, 1, 2])
+        self.operator.gcs_hook.list.assert_called_once_with('b', 'ids/')
+
+    def test_read_unsupported_format(self):
+        with self.assertRaises(ValueError):
+            list(self.operator.read_values({'bucket': 'b', 'filepath': 'ids.csv', 'format': 'csv'}))
+
+    def test_execute_with_source(self):
+        data = {
+            'project': 'project',
+            'topic': 'topic',
+            'params': [{'key': 'id', 'source': {'bucket': 'b', 'prefix': 'ids/', 'field': 'id'}}]
+        }
+
+        self.operator.execute(data, 'redirect')
+
+        project, topic, messages = self.operator.queue_hook.publish_many.call_args.args
+        self.assertEqual((project, topic), ('project', 'topic'))
+        self.assertEqual(list(messages), [{'id': 0}, {'id': 1}, {'id': 2}])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,150 @@
+
+import json
+import unittest
+
+from concurrent.futures import Future
+from unittest.mock import MagicMock, patch
+
+from airless.core.hook import LocalClaimCheckHook
+from airless.core.utils import decompress
+
+from airless.google.cloud.pubsub.hook import GooglePubsubHook
+
+
+def published(message_id='1'):
+    future = Future()
+    future.set_result(message_id)
+    return future
+
+
+@patch.dict('os.environ', {'ENV': 'prod', 'GCP_PROJECT': 'default-project'})
+class TestGooglePubsubHook(unittest.TestCase):
+
+    def build_hook(self):
+        hook = GooglePubsubHook()
+        hook.publisher = MagicMock()
+        hook.publisher.topic_path.side_effect = lambda project, topic: f'projects/{project}/topics/{topic}'
+        hook.publisher.publish.side_effect = lambda topic_path, data, **attributes: published()
+        return hook
+
+    def sent(self, hook, index=0):
+        args, kwargs = hook.publisher.publish.call_args_list[index]
+        attributes = {k: v for k, v in kwargs.items() if k != 'data'}
+        return args[0], kwargs['data'], attributes
+
+    def test_publish(self):
+        hook = self.build_hook()
+
+        hook.publish('project', 'topic', {'key': 'value'})
+
+        topic_path, data, attributes = self.sent(hook)
+        self.assertEqual(topic_path, 'projects/project/topics/topic')
+        self.assertEqual(json.loads(data), {'key': 'value'})
+        self.assertEqual(attributes, {})
+
+    def test_publish_default_project(self):
+        hook = self.build_hook()
+
+        hook.publish(None, 'topic', {})
+
+        self.assertEqual(self.sent(hook)[0], 'projects/default-project/topics/topic')
+
+    def test_publish_attributes(self):
+        hook = self.build_hook()
+
+        hook.publish('project', 'topic', {
+            'metadata': {'retries': 2, 'trace_id': 'abc', 'run_next': [{'topic': 'next'}]},
+            'data': {}
+        })
+
+        self.assertEqual(self.sent(hook)[2], {'retries': '2', 'trace_id': 'abc'})
+
+    def test_publish_async(self):
+        hook = self.build_hook()
+
+        futures = [hook.publish_async('project', 'topic', {'i': i}) for i in range(3)]
+        hook.flush()
+
+        self.assertEqual([f.result() for f in futures], ['1', '1', '1'])
+        self.assertEqual([json.loads(self.sent(hook, i)[1]) for i in range(3)], [{'i': 0}, {'i': 1}, {'i': 2}])
+        self.assertEqual(hook.pending, set())
+
+    def test_publish_async_failure(self):
+        hook = self.build_hook()
+        future = Future()
+        future.set_exception(RuntimeError('failed'))
+        hook.publisher.publish.side_effect = None
+        hook.publisher.publish.return_value = future
+
+        hook.publish_async('project', 'topic', {})
+
+        with self.assertRaises(RuntimeError):
+            hook.flush()
+
+    def test_publish_many(self):
+        hook = self.build_hook()
+
+        count = hook.publish_many('project', 'topic', ({'i': i} for i in range(5)), batch_size=2)
+
+        self.assertEqual(count, 5)
+        self.assertEqual(hook.publisher.publish.call_count, 5)
+        self.assertEqual(hook.pending, set())
+
+    @patch.dict('os.environ', {'ENV': 'dev'})
+    def test_publish_dev(self):
+        hook = self.build_hook()
+
+        self.assertIsNone(hook.publish_async('project', 'topic', {}).result())
+        hook.publisher.publish.assert_not_called()
+
+    @patch.dict('os.environ', {'QUEUE_COMPRESSION': 'gzip', 'QUEUE_COMPRESSION_THRESHOLD': '100'})
+    def test_publish_compressed(self):
+        hook = self.build_hook()
+
+        hook.publish('project', 'topic', {'key': 'x' * 200})
+        hook.publish('project', 'topic', {'key': 'x'})
+
+        _, data, attributes = self.sent(hook, 0)
+        self.assertEqual(attributes, {'content_encoding': 'gzip'})
+        self.assertEqual(json.loads(decompress(data, 'gzip')), {'key': 'x' * 200})
+
+        _, data, attributes = self.sent(hook, 1)
+        self.assertEqual(attributes, {})
+        self.assertEqual(json.loads(data), {'key': 'x'})
+
+    @patch.dict('os.environ', {'CLAIM_CHECK_THRESHOLD': '100'})
+    def test_publish_claim_check(self):
+        hook = self.build_hook()
+        hook.claim_check_hook = LocalClaimCheckHook()
+
+        hook.publish('project', 'topic', {'key': 'x' * 200})
+
+        _, data, attributes = self.sent(hook)
+        self.assertEqual(data, b'')
+        self.assertEqual(json.loads(hook.resolve(data, attributes)), {'key': 'x' * 200})
+
+    @patch.dict('os.environ', {'CLAIM_CHECK_THRESHOLD': '100', 'QUEUE_COMPRESSION': 'gzip', 'QUEUE_COMPRESSION_THRESHOLD': '100'})
+    def test_publish_claim_check_compressed(self):
+        hook = self.build_hook()
+        hook.claim_check_hook = LocalClaimCheckHook()
+        data = {'key': ''.join(str(i) for i in range(1000))}
+
+        hook.publish('project', 'topic', data)
+
+        payload, attributes = self.sent(hook)[1:]
+        self.assertEqual(attributes['content_encoding'], 'gzip')
+        self.assertEqual(json.loads(decompress(hook.resolve(payload, attributes), 'gzip')), data)
+
+    @patch.dict('os.environ', {'PUBSUB_BATCH_MAX_MESSAGES': '50', 'PUBSUB_BATCH_MAX_LATENCY': '0.5'})
+    def test_build_batch_settings(self):
+        from google.cloud import pubsub_v1
+
+        settings = GooglePubsubHook().build_batch_settings()
+
+        self.assertEqual(settings.max_messages, 50)
+        self.assertEqual(settings.max_latency, 0.5)
+        self.assertEqual(settings.max_bytes, pubsub_v1.types.BatchSettings().max_bytes)
+
+
+if __name__ == '__main__':
+    unittest.main()
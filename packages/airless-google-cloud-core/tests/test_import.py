@@ -0,0 +1,21 @@
+
+import unittest
+
+from airless.core.utils import imported_modules
+
+
+class TestImports(unittest.TestCase):
+
+    HEAVY_MODULES = {'grpc', 'google.cloud.pubsub_v1', 'requests', 'ndjson'}
+
+    def test_import_pubsub_hook(self):
+        imported = set(imported_modules('from airless.google.cloud.pubsub.hook import GooglePubsubHook'))
+        self.assertFalse(imported & self.HEAVY_MODULES)
+
+    def test_import_operator(self):
+        imported = set(imported_modules('from airless.google.cloud.core.operator import GoogleBaseEventOperator, GoogleRedirectOperator'))
+        self.assertFalse(imported & self.HEAVY_MODULES)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,5 +1,15 @@
-from .secret_manager import (GoogleSecretManagerHook)
+from typing import TYPE_CHECKING
+
+from airless.core.utils import lazy_exports
+
+if TYPE_CHECKING:
+    from .secret_manager import (GoogleSecretManagerHook)
 
 __all__ = [
     'GoogleSecretManagerHook'
 ]
+
+# Submodules are only imported when one of their names is first accessed
+__getattr__, __dir__ = lazy_exports(__name__, {
+    'GoogleSecretManagerHook': '.secret_manager'
+})
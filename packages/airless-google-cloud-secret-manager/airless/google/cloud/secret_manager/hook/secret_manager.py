@@ -1,11 +1,12 @@
 
 import json
-from typing import Any, List
+from typing import Any, List, TYPE_CHECKING
 
-from airless.core.utils import get_config
+from airless.core.utils import get_client, get_config
 from airless.core.hook import SecretManagerHook
 
-from google.cloud import secretmanager
+if TYPE_CHECKING:
+    from google.cloud import secretmanager
 
 
 class GoogleSecretManagerHook(SecretManagerHook):
@@ -14,7 +15,19 @@ class GoogleSecretManagerHook(SecretManagerHook):
     def __init__(self) -> None:
         """Initializes the GoogleSecretManagerHook."""
         super().__init__()
-        self.client = secretmanager.SecretManagerServiceClient()
+        self._client = None
+
+    @property
+    def client(self) -> 'secretmanager.SecretManagerServiceClient':
+        """The Secret Manager client, created on first use."""
+        if self._client is None:
+            from google.cloud import secretmanager
+            self._client = get_client(secretmanager.SecretManagerServiceClient)
+        return self._client
+
+    @client.setter
+    def client(self, client: 'secretmanager.SecretManagerServiceClient') -> None:
+        self._client = client
 
     def list_secrets(self) -> List[str]:
         """Lists all secrets in the project.
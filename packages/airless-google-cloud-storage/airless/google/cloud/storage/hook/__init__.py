@@ -1,7 +1,27 @@
-from .storage import (GcsHook)
-from .datalake import (GcsDatalakeHook)
+from typing import TYPE_CHECKING
+
+from airless.core.utils import lazy_exports
+
+if TYPE_CHECKING:
+    from .storage import (GcsHook)
+    from .datalake import (GcsDatalakeHook)
+    from .timer import (GcsTimerHook)
+    from .claim_check import (GcsClaimCheckHook)
+    from .state import (GcsStateHook)
 
 __all__ = [
     'GcsHook',
-    'GcsDatalakeHook'
+    'GcsDatalakeHook',
+    'GcsTimerHook',
+    'GcsClaimCheckHook',
+    'GcsStateHook'
 ]
+
+# Submodules are only imported when one of their names is first accessed
+__getattr__, __dir__ = lazy_exports(__name__, {
+    'GcsHook': '.storage',
+    'GcsDatalakeHook': '.datalake',
+    'GcsTimerHook': '.timer',
+    'GcsClaimCheckHook': '.claim_check',
+    'GcsStateHook': '.state'
+})
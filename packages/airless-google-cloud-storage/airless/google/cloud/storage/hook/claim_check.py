@@ -0,0 +1,83 @@
+import uuid
+
+from datetime import datetime, timedelta, timezone
+from typing import Optional, Tuple
+
+from airless.core.hook import ClaimCheckHook
+from airless.core.utils import get_config
+
+from airless.google.cloud.storage.hook import GcsHook
+
+
+class GcsClaimCheckHook(GcsHook, ClaimCheckHook):
+    """Claim check store backed by a GCS bucket.
+
+    Each payload is saved as a file whose custom time is set to the moment
+    it expires, `ttl` seconds after it is stored. The bucket must have a
+    lifecycle rule deleting files with `daysSinceCustomTime` 0, which
+    removes them once they expire.
+
+    Only claims of files under the `prefix` of the bucket are loaded, so a
+    message cannot make the consumer read other files it has access to.
+    """
+
+    def __init__(self, bucket: Optional[str] = None, prefix: str = 'claim-check/') -> None:
+        """Initializes the GcsClaimCheckHook.
+
+        Args:
+            bucket (Optional[str]): The bucket where the payloads are stored.
+                Defaults to the environment variable `GCS_BUCKET_CLAIM_CHECK`.
+            prefix (str): The path prefix of the payload files. Defaults to `claim-check/`.
+        """
+        super().__init__()
+        self.bucket = bucket or get_config('GCS_BUCKET_CLAIM_CHECK')
+        self.prefix = prefix
+
+    def store(self, payload: bytes) -> str:
+        """Stores a payload.
+
+        Args:
+            payload (bytes): The payload to store.
+
+        Returns:
+            str: The claim of the payload, its `gs://` path.
+        """
+        filepath = f'{self.prefix}{uuid.uuid4().hex}.json'
+        blob = self.storage_client.bucket(self.bucket).blob(filepath)
+        blob.custom_time = datetime.now(timezone.utc) + timedelta(seconds=self.ttl)
+        blob.upload_from_string(payload, content_type='application/json', if_generation_match=0)
+        return self.build_filepath(self.bucket, filepath)
+
+    def load(self, claim: str) -> bytes:
+        """Loads a stored payload.
+
+        Args:
+            claim (str): The claim returned by `store`.
+
+        Raises:
+            ValueError: If the claim is not a file under the prefix of the bucket.
+
+        Returns:
+            bytes: The payload.
+        """
+        bucket, filepath = self.parse_claim(claim)
+        if (bucket != self.bucket) or (not filepath.startswith(self.prefix)):
+            raise ValueError(f'Claim {claim} is not stored in gs://{self.bucket}/{self.prefix}')
+        return self.storage_client.bucket(bucket).blob(filepath).download_as_bytes()
+
+    def parse_claim(self, claim: str) -> Tuple[str, str]:
+        """Splits a claim into its bucket and file path.
+
+        Args:
+            claim (str): The claim returned by `store`.
+
+        Raises:
+            ValueError: If the claim is not a `gs://` path.
+
+        Returns:
+            Tuple[str, str]: The bucket and the file path.
+        """
+        if (not claim.startswith('gs://')) or ('/' not in claim[len('gs://'):]):
+            raise ValueError(f'Claim {claim} is not a gs:// path')
+        bucket, filepath = claim[len('gs://'):].split('/', 1)
+        return bucket, filepath
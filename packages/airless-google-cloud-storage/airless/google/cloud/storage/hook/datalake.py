@@ -1,13 +1,22 @@
 
-import pyarrow as pa
-
-from typing import Any, Optional, Union
+from datetime import datetime, timedelta, timezone
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Iterator, Optional, Union
 
 from airless.core.utils import get_config
 from airless.core.hook import DatalakeHook
 
 from airless.google.cloud.storage.hook import GcsHook
 
+if TYPE_CHECKING:
+    import pyarrow as pa
+
+
+def _naive_utc(value: datetime) -> datetime:
+    """Converts a timezone-aware datetime to a naive UTC one, naive ones are kept."""
+    if value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
 
 class GcsDatalakeHook(GcsHook, DatalakeHook):
     """Hook for interacting with GCS Datalake."""
@@ -16,7 +25,16 @@ class GcsDatalakeHook(GcsHook, DatalakeHook):
         """Initializes the GcsDatalakeHook."""
         super().__init__()
 
-    def send_to_landing_zone(self, data: Any, dataset: str, table: str, message_id: Optional[int], origin: Optional[str], time_partition: bool = False) -> Union[str, None]:
+    def send_to_landing_zone(
+        self,
+        data: Any,
+        dataset: str,
+        table: str,
+        message_id: Optional[int],
+        origin: Optional[str],
+        time_partition: bool = False,
+        parquet_options: Optional[Dict[str, Any]] = None
+    ) -> Union[str, None]:
         """Sends data to the landing zone in GCS.
 
         Args:
@@ -26,6 +44,8 @@ class GcsDatalakeHook(GcsHook, DatalakeHook):
             message_id (Optional[int]): The message ID.
             origin (Optional[str]): The origin of the data.
             time_partition (bool, optional): Whether to use time partitioning. Defaults to False.
+            parquet_options (Optional[Dict[str, Any]]): The settings of the parquet file of time
+                partitioned data, see `GcsHook.parquet_options`. Defaults to the environment variables.
 
         Returns:
             Union[str, None]: The path to the uploaded file or None.
@@ -36,27 +56,98 @@ class GcsDatalakeHook(GcsHook, DatalakeHook):
 
         if get_config('ENV') == 'prod':
             metadata = self.build_metadata(message_id, origin)
-            prepared_rows, now = self.prepare_rows(data, metadata)
-
-            if time_partition:
-                time_partition_name = 'date'
-                schema = pa.schema([
-                    ('_event_id', pa.int64()),
-                    ('_resource', pa.string()),
-                    ('_json', pa.string()),
-                    ('_created_at', pa.timestamp('us'))
-                ])
-                return self.upload_parquet_from_memory(
-                    data=prepared_rows,
-                    bucket=get_config('GCS_BUCKET_LANDING_ZONE'),
-                    directory=f'{dataset}/{table}/{time_partition_name}={now.strftime("%Y-%m-%d")}',
-                    filename='tmp.parquet',
-                    add_timestamp=True,
-                    schema=schema)
-            else:
-                return self.upload_from_memory(
-                    data=prepared_rows,
-                    bucket=get_config('GCS_BUCKET_LANDING_ZONE'),
-                    directory=f'{dataset}/{table}',
-                    filename='tmp.json',
-                    add_timestamp=True)
+            now = datetime.now()
+            # Rows are prepared while they are written, so they are never all held in memory
+            prepared_rows = self.iter_rows(data, metadata, now)
+            return self.write_rows(prepared_rows, dataset, table, self.partition_name(now, time_partition), parquet_options)
+
+    def write_rows(
+        self,
+        rows: Iterable[Dict[str, Any]],
+        dataset: str,
+        table: str,
+        partition: Optional[str] = None,
+        parquet_options: Optional[Dict[str, Any]] = None
+    ) -> Union[str, None]:
+        """Writes prepared rows to the landing zone in GCS in a single file.
+
+        Time partitioned rows are streamed to a parquet file, compressed and
+        split in row groups as set by `parquet_options`, and the others are
+        written as a JSON list.
+
+        Args:
+            rows (Iterable[Dict[str, Any]]): The rows, as built by `prepare_row`.
+            dataset (str): The dataset name.
+            table (str): The table name.
+            partition (Optional[str]): The partition, as built by `partition_name`. Defaults to None.
+            parquet_options (Optional[Dict[str, Any]]): The settings of the parquet file, see
+                `GcsHook.parquet_options`. Defaults to the environment variables.
+
+        Returns:
+            Union[str, None]: The path to the uploaded file or None.
+        """
+        if partition:
+            return self.upload_parquet_from_memory(
+                data=rows,
+                bucket=get_config('GCS_BUCKET_LANDING_ZONE'),
+                directory=f'{dataset}/{table}/{partition}',
+                filename='tmp.parquet',
+                add_timestamp=True,
+                schema=self.landing_zone_schema(),
+                **(parquet_options or {}))
+        else:
+            return self.upload_from_memory(
+                data=list(rows),
+                bucket=get_config('GCS_BUCKET_LANDING_ZONE'),
+                directory=f'{dataset}/{table}',
+                filename='tmp.json',
+                add_timestamp=True)
+
+    def landing_zone_schema(self) -> 'pa.Schema':
+        """Gets the schema of the parquet files of the landing zone.
+
+        Returns:
+            pa.Schema: The schema of the rows built by `prepare_row`.
+        """
+        import pyarrow as pa
+
+        return pa.schema([
+            ('_event_id', pa.int64()),
+            ('_resource', pa.string()),
+            ('_json', pa.string()),
+            ('_created_at', pa.timestamp('us'))
+        ])
+
+    def read_landing_zone(self, dataset: str, table: str, start: datetime, end: datetime) -> Iterator[Dict[str, Any]]:
+        """Reads the rows sent to the landing zone with `time_partition` between two dates.
+
+        Only the daily partitions between the dates are listed and the parquet
+        files are read one row group at a time, so large ranges use bounded memory.
+
+        Args:
+            dataset (str): The dataset name.
+            table (str): The table name.
+            start (datetime): Rows created before this time are skipped. Timezone-aware
+                dates are converted to UTC.
+            end (datetime): Rows created after this time are skipped. Timezone-aware
+                dates are converted to UTC.
+
+        Returns:
+            Iterator[Dict[str, Any]]: The rows, as built by `prepare_row`.
+        """
+        import pyarrow.parquet as pq
+
+        # Rows are created with naive UTC times, so aware dates are converted to be compared to them
+        start, end = _naive_utc(start), _naive_utc(end)
+        bucket = get_config('GCS_BUCKET_LANDING_ZONE')
+        day = start.date()
+        while day <= end.date():
+            for blob in self.list(bucket, prefix=f'{dataset}/{table}/date={day.strftime("%Y-%m-%d")}/'):
+                if not blob.name.endswith('.parquet'):
+                    continue
+                with self.storage_client.bucket(bucket).blob(blob.name).open('rb') as f:
+                    for batch in pq.ParquetFile(f).iter_batches():
+                        for row in batch.to_pylist():
+                            if start <= row['_created_at'] <= end:
+                                yield row
+            day += timedelta(days=1)
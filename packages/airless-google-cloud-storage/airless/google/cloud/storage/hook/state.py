@@ -0,0 +1,93 @@
+import time
+
+from datetime import datetime, timezone
+from typing import Any, List, Optional
+
+from google.api_core.exceptions import NotFound
+
+from airless.core.hook import StateHook
+from airless.core.utils import get_config, json_dumpb, json_loads
+
+from airless.google.cloud.storage.hook import GcsHook
+
+
+class GcsStateHook(GcsHook, StateHook):
+    """State store backed by a GCS bucket.
+
+    Each key is saved as a small JSON file. Expired keys are ignored when
+    read, and the expiration is also set as the custom time of the file, so a
+    lifecycle rule with `daysSinceCustomTime` can delete them.
+    """
+
+    def __init__(self, bucket: Optional[str] = None, prefix: str = 'state/') -> None:
+        """Initializes the GcsStateHook.
+
+        Args:
+            bucket (Optional[str]): The bucket where the keys are stored.
+                Defaults to the environment variable `GCS_BUCKET_STATE`.
+            prefix (str): The path prefix of the key files. Defaults to `state/`.
+        """
+        super().__init__()
+        self.bucket = bucket or get_config('GCS_BUCKET_STATE')
+        self.prefix = prefix
+
+    def get(self, key: str) -> Optional[Any]:
+        """Gets the value of a key.
+
+        Args:
+            key (str): The key.
+
+        Returns:
+            Optional[Any]: The value, or None if the key does not exist or expired.
+        """
+        blob = self.storage_client.bucket(self.bucket).blob(f'{self.prefix}{key}')
+        try:
+            content = json_loads(blob.download_as_bytes())
+        except NotFound:
+            return None
+
+        expires_at = content.get('expires_at')
+        if (expires_at is not None) and (expires_at <= time.time()):
+            return None
+        return content['value']
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        """Sets the value of a key.
+
+        Args:
+            key (str): The key.
+            value (Any): The value.
+            ttl (Optional[float]): Number of seconds before the key expires. Defaults to None.
+        """
+        expires_at = self.expires_at(ttl)
+        blob = self.storage_client.bucket(self.bucket).blob(f'{self.prefix}{key}')
+        if expires_at is not None:
+            blob.custom_time = datetime.fromtimestamp(expires_at, tz=timezone.utc)
+        blob.upload_from_string(
+            json_dumpb({'value': value, 'expires_at': expires_at}),
+            content_type='application/json')
+
+    def delete(self, key: str) -> None:
+        """Deletes a key.
+
+        Args:
+            key (str): The key.
+        """
+        try:
+            self.storage_client.bucket(self.bucket).blob(f'{self.prefix}{key}').delete()
+        except NotFound:
+            pass
+
+    def keys(self, prefix: str = '') -> List[str]:
+        """Lists the keys starting with a prefix, in ascending order.
+
+        The files are not read, so keys that expired are also listed.
+
+        Args:
+            prefix (str): The prefix of the keys. Defaults to ''.
+
+        Returns:
+            List[str]: The keys.
+        """
+        blobs = self.storage_client.list_blobs(self.bucket, prefix=f'{self.prefix}{prefix}', fields='items(name),nextPageToken')
+        return [blob.name[len(self.prefix):] for blob in blobs]
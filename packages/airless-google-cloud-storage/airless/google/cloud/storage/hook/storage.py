@@ -1,15 +1,27 @@
 
-import json
-import ndjson
+import mimetypes
 import os
-from typing import Any, List, Optional
+import uuid
+from contextlib import suppress
+from datetime import datetime
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Union
 
 from google.cloud import storage
 from google.cloud.storage.retry import DEFAULT_RETRY
-import pyarrow as pa
-from pyarrow import parquet
 
 from airless.core.hook import BaseHook, FileHook
+from airless.core.utils import get_client, get_config, json_loads
+
+
+PARQUET_COMPRESSIONS = ('gzip', 'zstd', 'snappy', 'lz4', 'brotli', 'none')
+
+
+def _parse_columns(value: str) -> Union[bool, List[str]]:
+    """Parses a Parquet setting that is either `true`, `false` or a comma separated list of columns."""
+    if value.lower() in ('true', 'false'):
+        return value.lower() == 'true'
+    return [column.strip() for column in value.split(',') if column.strip()]
 
 
 class GcsHook(BaseHook):
@@ -18,9 +30,20 @@ class GcsHook(BaseHook):
     def __init__(self) -> None:
         """Initializes the GcsHook."""
         super().__init__()
-        self.storage_client = storage.Client()
+        self._storage_client = None
         self.file_hook = FileHook()
 
+    @property
+    def storage_client(self) -> storage.Client:
+        """The GCS client, created on first use."""
+        if self._storage_client is None:
+            self._storage_client = get_client(storage.Client)
+        return self._storage_client
+
+    @storage_client.setter
+    def storage_client(self, storage_client: storage.Client) -> None:
+        self._storage_client = storage_client
+
     def build_filepath(self, bucket: str, filepath: str) -> str:
         """Builds the full GCS file path.
 
@@ -93,7 +116,7 @@ class GcsHook(BaseHook):
         Returns:
             Any: The content of the JSON file.
         """
-        return json.loads(self.read_as_string(bucket, filepath, encoding))
+        return json_loads(self.read_as_string(bucket, filepath, encoding))
 
     def read_ndjson(self, bucket: str, filepath: str, encoding: Optional[str] = None) -> List[Any]:
         """Reads an NDJSON file from GCS.
@@ -106,7 +129,48 @@ class GcsHook(BaseHook):
         Returns:
             List[Any]: The content of the NDJSON file.
         """
-        return ndjson.loads(self.read_as_string(bucket, filepath, encoding))
+        content = self.read_as_string(bucket, filepath, encoding)
+        return [json_loads(line) for line in content.splitlines() if line.strip()]
+
+    def iter_lines(self, bucket: str, filepath: str, encoding: str = 'utf-8') -> Iterator[str]:
+        """Reads the lines of a file from GCS while it is downloaded.
+
+        Only one chunk of the file is kept in memory at a time. Files ending with
+        `.gz`, such as compressed BigQuery exports, are decompressed on the fly.
+
+        Args:
+            bucket (str): The name of the GCS bucket.
+            filepath (str): The file path.
+            encoding (str): The encoding to use. Defaults to 'utf-8'.
+
+        Yields:
+            str: Each line of the file, without the line break.
+        """
+        blob = self.storage_client.bucket(bucket).blob(filepath)
+        if filepath.endswith('.gz'):
+            import gzip
+            file = gzip.open(blob.open('rb'), 'rt', encoding=encoding)
+        else:
+            file = blob.open('r', encoding=encoding)
+
+        with file:
+            for line in file:
+                yield line.rstrip('\r\n')
+
+    def iter_ndjson(self, bucket: str, filepath: str, encoding: str = 'utf-8') -> Iterator[Any]:
+        """Reads the records of an NDJSON file from GCS while it is downloaded.
+
+        Args:
+            bucket (str): The name of the GCS bucket.
+            filepath (str): The file path.
+            encoding (str): The encoding to use. Defaults to 'utf-8'.
+
+        Yields:
+            Any: Each record of the file. Blank lines are skipped.
+        """
+        for line in self.iter_lines(bucket, filepath, encoding):
+            if line.strip():
+                yield json_loads(line)
 
     def upload_from_memory(
             self,
@@ -118,6 +182,10 @@ class GcsHook(BaseHook):
         ) -> str:
         """Uploads data from memory to GCS.
 
+        The data is serialized in memory and uploaded in a single request. With
+        the environment variable `GCS_UPLOAD_MODE` set to `file` it is written to
+        a temporary file first, like in previous versions.
+
         Args:
             data (Any): The data to upload.
             bucket (str): The name of the GCS bucket.
@@ -132,59 +200,232 @@ class GcsHook(BaseHook):
         Returns:
             str: The path to the uploaded file.
         """
-        local_filename = self.file_hook.get_tmp_filepath(filename, **kwargs)
-        try:
-            self.file_hook.write(local_filename, data, **kwargs)
-            return self.upload(local_filename, bucket, directory)
+        if self.upload_mode() == 'file':
+            local_filename = self.file_hook.get_tmp_filepath(filename, **kwargs)
+            try:
+                self.file_hook.write(local_filename, data, **kwargs)
+                return self.upload(local_filename, bucket, directory)
 
-        finally:
-            if os.path.exists(local_filename):
-                os.remove(local_filename)
+            finally:
+                if os.path.exists(local_filename):
+                    os.remove(local_filename)
+
+        blob = self.upload_blob(bucket, directory, filename, **kwargs)
+        blob.upload_from_string(self.file_hook.serialize(data, **kwargs), content_type=self.guess_content_type(blob.name))
+        return f'{bucket}/{blob.name}'
 
     def upload_parquet_from_memory(
             self,
-            data: Any,
+            data: Iterable[Dict[str, Any]],
             bucket: str,
             directory: str,
             filename: str,
             **kwargs: Any
         ) -> str:
-        """Uploads Parquet data from memory to GCS.
+        """Uploads rows to GCS as a Parquet file.
+
+        Rows are converted to Arrow record batches of `row_group_size` rows and
+        each batch is written as a row group, so an iterator of any size is
+        written with the memory of a single batch.
+
+        The file is written to memory and uploaded in a single request. The
+        environment variable `GCS_UPLOAD_MODE` set to `stream` writes it to a
+        resumable upload of `GCS_UPLOAD_CHUNK_SIZE` bytes chunks instead, which
+        bounds the memory of large files, and `file` writes it to a temporary
+        file first, like in previous versions. Streamed files are uploaded to a
+        staging object and copied to their path once they are complete. Staging
+        objects are kept under `GCS_UPLOAD_STAGING_PREFIX`, `tmp/` by default,
+        of `GCS_UPLOAD_STAGING_BUCKET`, which defaults to the destination bucket
+        and can be set to another bucket so they do not fire its triggers.
 
         Args:
-            data (Any): The data to upload.
+            data (Iterable[Dict[str, Any]]): The rows to upload, a list or an iterator.
             bucket (str): The name of the GCS bucket.
             directory (str): The directory within the bucket.
             filename (str): The name of the Parquet file to create.
 
         Kwargs:
-            schema (pa.Schema, optional): The schema for the Parquet table. Defaults to None.
+            schema (pa.Schema, optional): The schema for the Parquet table. Defaults to None,
+                which infers it from all the rows, so they are not streamed.
+            compression, compression_level, row_group_size, use_dictionary, write_statistics:
+                The Parquet writer settings, see `parquet_options`.
             add_timestamp (bool, optional): If True, adds a timestamp to the filename. Defaults to True.
 
         Returns:
             str: The path to the uploaded Parquet file.
         """
-        schema = kwargs.get('schema', None)
+        # pyarrow is only needed to write parquet files and takes a while to import
+        import pyarrow as pa
 
-        local_filename = self.file_hook.get_tmp_filepath(filename, **kwargs)
+        upload_mode = self.upload_mode()
 
+        if upload_mode == 'file':
+            local_filename = self.file_hook.get_tmp_filepath(filename, **kwargs)
+            try:
+                self.write_parquet(data, local_filename, **kwargs)
+                return self.upload(local_filename, bucket, directory)
+
+            finally:
+                pa.default_memory_pool().release_unused()
+                if os.path.exists(local_filename):
+                    os.remove(local_filename)
+
+        blob = self.upload_blob(bucket, directory, filename, **kwargs)
         try:
-            table = pa.Table.from_pylist(data, schema=schema)
-            pool = pa.default_memory_pool()
+            if upload_mode == 'stream':
+                from google.cloud.storage.fileio import BlobWriter
+
+                # The file is streamed to a staging object and copied once complete,
+                # so a failed write never leaves a truncated file at its path
+                staging_bucket = self.storage_client.bucket(get_config('GCS_UPLOAD_STAGING_BUCKET', False) or bucket)
+                staging_prefix = get_config('GCS_UPLOAD_STAGING_PREFIX', False, 'tmp/')
+                tmp_blob = staging_bucket.blob(f'{staging_prefix}{uuid.uuid4().hex}/{blob.name}')
+                chunk_size = int(get_config('GCS_UPLOAD_CHUNK_SIZE', False, str(8 * 1024 * 1024)))
+                try:
+                    with BlobWriter(tmp_blob, chunk_size=chunk_size, ignore_flush=True, content_type='application/octet-stream') as writer:
+                        self.write_parquet(data, writer, **kwargs)
+                    staging_bucket.copy_blob(tmp_blob, blob.bucket, blob.name)
+                finally:
+                    # Closing the writer uploaded the rows written before an error
+                    with suppress(Exception):
+                        tmp_blob.delete()
+            else:
+                sink = pa.BufferOutputStream()
+                self.write_parquet(data, sink, **kwargs)
+                blob.upload_from_string(sink.getvalue().to_pybytes(), content_type='application/octet-stream')
+                del sink
+            return f'{bucket}/{blob.name}'
 
-            parquet.write_table(
-                table,
-                local_filename,
-                compression='GZIP'
-            )
+        finally:
+            pa.default_memory_pool().release_unused()
 
-            del table
-            pool.release_unused()
+    def write_parquet(self, data: Iterable[Dict[str, Any]], sink: Any, **kwargs: Any) -> None:
+        """Writes rows as a Parquet file, one row group of `row_group_size` rows at a time.
 
-            return self.upload(local_filename, bucket, directory)
+        Args:
+            data (Iterable[Dict[str, Any]]): The rows, a list or an iterator.
+            sink (Any): A file path, an Arrow output stream or a writable file object.
+
+        Only rows written with a schema are streamed, otherwise they are all
+        read first, so the schema is inferred from every row and a column that
+        is empty in the first row group does not fail the later ones.
+
+        Kwargs:
+            schema (pa.Schema, optional): The schema for the Parquet table. Defaults to None,
+                which infers it from all the rows.
+            compression, compression_level, row_group_size, use_dictionary, write_statistics:
+                The Parquet writer settings, see `parquet_options`.
+        """
+        import pyarrow as pa
+        from pyarrow import parquet
+
+        schema = kwargs.get('schema', None)
+        options = self.parquet_options(**kwargs)
+        row_group_size = options.pop('row_group_size')
+
+        if schema is None:
+            table = pa.Table.from_pylist(list(data))
+            with parquet.ParquetWriter(sink, table.schema, **options) as writer:
+                writer.write_table(table, row_group_size=row_group_size)
+            return
+
+        rows = iter(data)
+        writer = None
+        try:
+            while True:
+                chunk = list(islice(rows, row_group_size))
+                if not chunk and writer is not None:
+                    break
+                batch = pa.RecordBatch.from_pylist(chunk, schema=schema)
+                if writer is None:
+                    writer = parquet.ParquetWriter(sink, schema, **options)
+                writer.write_batch(batch)
+                del batch, chunk
         finally:
-            if os.path.exists(local_filename):
-                os.remove(local_filename)
+            if writer is not None:
+                writer.close()
+
+    def parquet_options(self, **kwargs: Any) -> Dict[str, Any]:
+        """Gets the Parquet writer settings, from the arguments or the environment variables.
+
+        GZIP writes small files but is the slowest codec to write and to read,
+        ZSTD usually writes files as small much faster and SNAPPY and LZ4 are
+        the fastest, with larger files.
+
+        Kwargs:
+            compression (str, optional): The codec, `gzip`, `zstd`, `snappy`, `lz4`, `brotli` or
+                `none`. Defaults to the environment variable `PARQUET_COMPRESSION` or `gzip`.
+            compression_level (int, optional): The codec level. Defaults to `PARQUET_COMPRESSION_LEVEL`
+                or the codec default.
+            row_group_size (int, optional): The number of rows of each row group. Defaults to
+                `PARQUET_ROW_GROUP_SIZE` or 10000.
+            use_dictionary (Union[bool, List[str]], optional): Whether to dictionary encode all
+                columns, or the columns to encode. Defaults to `PARQUET_USE_DICTIONARY`, `true`,
+                `false` or a comma separated list of columns, or True.
+            write_statistics (Union[bool, List[str]], optional): Whether to write the column
+                statistics, or the columns to write them for. Defaults to `PARQUET_WRITE_STATISTICS`,
+                like `use_dictionary`, or True.
+
+        Raises:
+            ValueError: If the codec is not supported.
+
+        Returns:
+            Dict[str, Any]: The settings, with the argument names of `ParquetWriter` and `row_group_size`.
+        """
+        compression = (kwargs.get('compression') or get_config('PARQUET_COMPRESSION', False, 'gzip')).lower()
+        if compression not in PARQUET_COMPRESSIONS:
+            raise ValueError(f'Unsupported parquet compression {compression}, use one of {PARQUET_COMPRESSIONS}')
+        compression_level = kwargs.get('compression_level')
+        if compression_level is None:
+            compression_level = get_config('PARQUET_COMPRESSION_LEVEL', False)
+        use_dictionary = kwargs.get('use_dictionary')
+        write_statistics = kwargs.get('write_statistics')
+
+        return {
+            'compression': compression,
+            'compression_level': int(compression_level) if compression_level is not None else None,
+            'row_group_size': int(kwargs.get('row_group_size') or get_config('PARQUET_ROW_GROUP_SIZE', False, '10000')),
+            'use_dictionary': _parse_columns(get_config('PARQUET_USE_DICTIONARY', False, 'true')) if use_dictionary is None else use_dictionary,
+            'write_statistics': _parse_columns(get_config('PARQUET_WRITE_STATISTICS', False, 'true')) if write_statistics is None else write_statistics
+        }
+
+    def upload_mode(self) -> str:
+        """Gets how files built in memory are uploaded, from the environment variable `GCS_UPLOAD_MODE`.
+
+        Returns:
+            str: `memory`, the default, `stream` or `file`.
+        """
+        return get_config('GCS_UPLOAD_MODE', False, 'memory')
+
+    def upload_blob(self, bucket: str, directory: str, filename: str, add_timestamp: bool = True, **kwargs: Any) -> storage.Blob:
+        """Builds the blob where a file built in memory is uploaded, with the name
+        `upload` would give to the temporary file of `FileHook.get_tmp_filepath`.
+
+        Args:
+            bucket (str): The name of the GCS bucket.
+            directory (str): The directory within the bucket.
+            filename (str): The name of the file.
+            add_timestamp (bool, optional): If True, prefixes the name with a timestamp and a UUID.
+                Defaults to True.
+
+        Returns:
+            storage.Blob: The blob.
+        """
+        filename = self.file_hook.extract_filename(filename)
+        if add_timestamp:
+            filename = f'{datetime.now().strftime("%Y%m%d%H%M%S")}_{uuid.uuid4().hex}_{filename}'
+        return self.storage_client.bucket(bucket).blob(f'{directory}/{filename}')
+
+    def guess_content_type(self, filename: str) -> str:
+        """Guesses the content type of a file from its name, like `upload_from_filename` does.
+
+        Args:
+            filename (str): The file name.
+
+        Returns:
+            str: The content type.
+        """
+        return mimetypes.guess_type(filename)[0] or 'application/octet-stream'
 
     def upload(self, local_filepath: str, bucket_name: str, directory: str) -> str:
         """Uploads a local file to GCS.
@@ -0,0 +1,95 @@
+import time
+import uuid
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+from airless.core.hook import TimerHook
+from airless.core.utils import get_config, json_dumpb, json_loads
+
+from airless.google.cloud.storage.hook import GcsHook
+
+
+class GcsTimerHook(GcsHook, TimerHook):
+    """Timer store backed by a GCS bucket.
+
+    Each timer is saved as a JSON file whose name starts with the due time in
+    milliseconds, so listing the bucket returns the timers in due order and the
+    sweep stops at the first timer that is not due yet. Only one sweeper
+    should run at a time, otherwise timers may be published twice.
+    """
+
+    def __init__(self, bucket: Optional[str] = None, prefix: str = 'timers/') -> None:
+        """Initializes the GcsTimerHook.
+
+        Args:
+            bucket (Optional[str]): The bucket where the timers are stored.
+                Defaults to the environment variable `GCS_BUCKET_TIMER`.
+            prefix (str): The path prefix of the timer files. Defaults to `timers/`.
+        """
+        super().__init__()
+        self.bucket = bucket or get_config('GCS_BUCKET_TIMER')
+        self.prefix = prefix
+
+    def schedule(self, due_at: float, topic: str, data: Any, project: Optional[str] = None) -> str:
+        """Schedules a message to be published to a topic.
+
+        Args:
+            due_at (float): The unix timestamp after which the message must be published.
+            topic (str): The topic to publish to.
+            data (Any): The data to publish.
+            project (Optional[str]): The project of the topic. Defaults to None.
+
+        Returns:
+            str: The ID of the timer, which is the path of its file in the bucket.
+        """
+        timer_id = f'{self.prefix}{int(due_at * 1000):015d}_{uuid.uuid4().hex}.json'
+        content = json_dumpb({'project': project, 'topic': topic, 'data': data})
+
+        blob = self.storage_client.bucket(self.bucket).blob(timer_id)
+        blob.upload_from_string(content, content_type='application/json')
+        return timer_id
+
+    def due(self, now: Optional[float] = None, limit: int = 500) -> List[Dict[str, Any]]:
+        """Lists the timers that are due, oldest first.
+
+        Args:
+            now (Optional[float]): The reference unix timestamp. Defaults to the current time.
+            limit (int): The maximum number of timers to return. Defaults to 500.
+
+        Returns:
+            List[Dict[str, Any]]: The due timers.
+        """
+        now_ms = int((now or time.time()) * 1000)
+
+        names = []
+        for blob in self.storage_client.list_blobs(self.bucket, prefix=self.prefix, fields='items(name),nextPageToken'):
+            due_at_ms = int(blob.name[len(self.prefix):].split('_')[0])
+            if due_at_ms > now_ms or len(names) >= limit:
+                break
+            names.append((blob.name, due_at_ms))
+
+        if not names:
+            return []
+
+        bucket = self.storage_client.bucket(self.bucket)
+
+        def read(name):
+            return json_loads(bucket.blob(name).download_as_bytes())
+
+        with ThreadPoolExecutor(max_workers=min(len(names), 16)) as executor:
+            contents = list(executor.map(read, [n for n, _ in names]))
+
+        return [
+            {'id': name, 'due_at': due_at_ms / 1000, **content}
+            for (name, due_at_ms), content in zip(names, contents)
+        ]
+
+    def ack(self, timer_ids: List[str]) -> None:
+        """Removes timers that were already published.
+
+        Args:
+            timer_ids (List[str]): The IDs of the published timers.
+        """
+        if timer_ids:
+            self.delete(self.bucket, files=timer_ids)
@@ -1,13 +1,14 @@
-from .error import (GoogleErrorReprocessOperator)
-from .file import (FileUrlToGcsOperator)
-from .ftp import (FtpToGcsOperator)
-from .storage import (
-    FileDetectOperator,
-    BatchWriteDetectOperator,
-    BatchWriteProcessOperator,
-    FileDeleteOperator,
-    FileMoveOperator
-)
+from typing import TYPE_CHECKING
+
+from airless.core.utils import lazy_exports
+
+if TYPE_CHECKING:
+    from .error import (GoogleErrorReprocessOperator)
+    from .file import (FileUrlToGcsOperator)
+    from .ftp import (FtpToGcsOperator)
+    from .replay import (GoogleErrorReplayOperator)
+    from .storage import (FileDetectOperator, BatchWriteDetectOperator, BatchWriteProcessOperator, FileDeleteOperator, FileMoveOperator)
+    from .timer import (GoogleTimerSweepOperator)
 
 __all__ = [
     'FileUrlToGcsOperator',
@@ -17,5 +18,21 @@ __all__ = [
     'BatchWriteProcessOperator',
     'FileDeleteOperator',
     'FileMoveOperator',
-    'GoogleErrorReprocessOperator'
+    'GoogleErrorReprocessOperator',
+    'GoogleErrorReplayOperator',
+    'GoogleTimerSweepOperator'
 ]
+
+# Submodules are only imported when one of their names is first accessed
+__getattr__, __dir__ = lazy_exports(__name__, {
+    'GoogleErrorReprocessOperator': '.error',
+    'FileUrlToGcsOperator': '.file',
+    'FtpToGcsOperator': '.ftp',
+    'GoogleErrorReplayOperator': '.replay',
+    'FileDetectOperator': '.storage',
+    'BatchWriteDetectOperator': '.storage',
+    'BatchWriteProcessOperator': '.storage',
+    'FileDeleteOperator': '.storage',
+    'FileMoveOperator': '.storage',
+    'GoogleTimerSweepOperator': '.timer'
+})
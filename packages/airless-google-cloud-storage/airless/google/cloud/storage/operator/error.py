@@ -1,13 +1,24 @@
 
 from airless.core.operator import ErrorReprocessOperator
+from airless.core.utils import get_config
 from airless.google.cloud.core.operator import GoogleBaseEventOperator
-from airless.google.cloud.storage.hook import GcsDatalakeHook
+from airless.google.cloud.storage.hook import GcsDatalakeHook, GcsStateHook
 
 
 class GoogleErrorReprocessOperator(GoogleBaseEventOperator, ErrorReprocessOperator):
-    """Operator for reprocessing errors in Google Cloud."""
+    """Operator for reprocessing errors in Google Cloud.
+
+    Retries are scheduled as timers in the bucket set by the environment
+    variable `GCS_BUCKET_TIMER`, when defined, instead of waiting, and the
+    error digests, circuits and parked messages are kept in the bucket
+    `GCS_BUCKET_STATE`, when defined, so they are shared by all instances.
+    The error digests require the state bucket and the circuit breaker both
+    buckets.
+    """
 
     def __init__(self) -> None:
         """Initializes the GoogleErrorReprocessOperator."""
         super().__init__()
         self.datalake_hook = GcsDatalakeHook()
+        if ((self.digest_window > 0) or (self.circuit_threshold > 0)) and get_config('GCS_BUCKET_STATE', False):
+            self.state_hook = GcsStateHook()
@@ -0,0 +1,20 @@
+from airless.core.operator import ErrorReplayOperator
+from airless.google.cloud.core.operator import GoogleBaseEventOperator
+from airless.google.cloud.storage.hook import GcsDatalakeHook
+
+
+class GoogleErrorReplayOperator(GoogleBaseEventOperator, ErrorReplayOperator):
+    """Operator that republishes the errors saved to the GCS landing zone.
+
+    Besides being deployed as a function, it can be run from the command line:
+    `python -m airless.google.cloud.storage.operator.replay --start 2025-01-01 --origin topic --rate 50`
+    """
+
+    def __init__(self) -> None:
+        """Initializes the GoogleErrorReplayOperator."""
+        super().__init__()
+        self.datalake_hook = GcsDatalakeHook()
+
+
+if __name__ == '__main__':
+    GoogleErrorReplayOperator.cli()
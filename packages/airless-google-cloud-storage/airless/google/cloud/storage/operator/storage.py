@@ -41,12 +41,11 @@ class FileDetectOperator(GoogleBaseFileOperator):
         """
         success_messages = self.build_success_message(bucket, filepath)
 
-        for success_message in success_messages:
-            self.queue_hook.publish(
-                project=get_config('GCP_PROJECT'),
-                topic=get_config('QUEUE_TOPIC_FILE_TO_BQ'),
-                data=success_message,
-            )
+        self.queue_hook.publish_many(
+            project=get_config('GCP_PROJECT'),
+            topic=get_config('QUEUE_TOPIC_FILE_TO_BQ'),
+            messages=success_messages,
+        )
 
     def build_success_message(self, bucket, filepath):
         """Builds success messages based on the file's ingestion configuration.
@@ -344,7 +343,8 @@ class BatchWriteDetectOperator(GoogleBaseEventOperator):
             directory (str): The common directory (prefix) of the files.
             files (list): A list of filenames in the batch.
         """
-        self.queue_hook.publish(
+        # Sent in batches, run waits for the messages when flushing
+        self.queue_hook.publish_async(
             project=get_config('GCP_PROJECT'),
             topic=get_config('QUEUE_TOPIC_BATCH_WRITE_PROCESS'),
             data={'bucket': bucket, 'directory': directory, 'files': files},
@@ -0,0 +1,13 @@
+
+from airless.core.operator import TimerSweepOperator
+from airless.google.cloud.core.operator import GoogleBaseEventOperator
+from airless.google.cloud.storage.hook import GcsTimerHook
+
+
+class GoogleTimerSweepOperator(GoogleBaseEventOperator, TimerSweepOperator):
+    """Operator that publishes the timers stored in GCS once they are due."""
+
+    def __init__(self) -> None:
+        """Initializes the GoogleTimerSweepOperator."""
+        super().__init__()
+        self.timer_hook = GcsTimerHook()
@@ -0,0 +1,80 @@
+"""Compares the parquet settings of the landing zone on rows similar to the ones airless writes.
+
+Usage:
+    python benchmarks/parquet_codec.py [--rows 50000] [--row-group-size 10000]
+"""
+import argparse
+import random
+import time
+
+from datetime import datetime
+
+import pyarrow as pa
+from pyarrow import parquet
+
+from airless.google.cloud.storage.hook import GcsDatalakeHook
+
+
+SETTINGS = [
+    ('gzip', {'compression': 'gzip'}),
+    ('zstd', {'compression': 'zstd'}),
+    ('zstd 9', {'compression': 'zstd', 'compression_level': 9}),
+    ('snappy', {'compression': 'snappy'}),
+    ('lz4', {'compression': 'lz4'}),
+    ('none', {'compression': 'none'}),
+    ('zstd no dict', {'compression': 'zstd', 'use_dictionary': ['_resource']}),
+    ('zstd no stats', {'compression': 'zstd', 'write_statistics': ['_created_at']}),
+]
+
+
+def build_rows(hook: GcsDatalakeHook, number: int) -> list:
+    """Builds landing zone rows of API responses, where the `_json` column holds most of the bytes."""
+    # Seeded random values, so the columns do not compress better than real responses
+    rng = random.Random(0)
+    data = [
+        {
+            'id': i,
+            'name': f'Product name {i} with ação',
+            'price': round(rng.uniform(1, 10000), 2),
+            'tags': ['a', 'b', 'c'],
+            'attributes': {f'attribute_{j}': rng.random() for j in range(30)},
+            'updated_at': datetime(2025, 1, 1, rng.randrange(24), rng.randrange(60))
+        }
+        for i in range(number)
+    ]
+    metadata = hook.build_metadata(1234, 'topic')
+    return list(hook.iter_rows(data, metadata, datetime.now()))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=50000, help='Number of rows of the file')
+    parser.add_argument('--row-group-size', type=int, default=10000, help='Number of rows of each row group')
+    args = parser.parse_args()
+
+    hook = GcsDatalakeHook()
+    rows = build_rows(hook, args.rows)
+    schema = hook.landing_zone_schema()
+
+    # Warms up pyarrow, so the first settings are not slower
+    hook.write_parquet(rows[:1000], pa.BufferOutputStream(), schema=schema)
+
+    print(f'{"settings":<16}{"bytes":>12}{"ratio":>8}{"write ms":>12}{"read ms":>12}')
+    for name, options in SETTINGS:
+        sink = pa.BufferOutputStream()
+        start = time.process_time()
+        hook.write_parquet(rows, sink, schema=schema, row_group_size=args.row_group_size, **options)
+        write = (time.process_time() - start) * 1000
+        buffer = sink.getvalue()
+
+        start = time.process_time()
+        parquet.read_table(pa.BufferReader(buffer))
+        read = (time.process_time() - start) * 1000
+
+        size = buffer.size
+        raw = sum(len(row['_json']) for row in rows)
+        print(f'{name:<16}{size:>12}{raw / size:>7.1f}x{write:>12.0f}{read:>12.0f}')
+
+
+if __name__ == '__main__':
+    main()
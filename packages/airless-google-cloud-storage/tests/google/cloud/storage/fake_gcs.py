@@ -0,0 +1,116 @@
+import io
+import mimetypes
+
+from contextlib import nullcontext
+
+from google.api_core.exceptions import NotFound, PreconditionFailed
+
+
+class FakeObject:
+    """An object stored in a fake bucket."""
+
+    def __init__(self, data, content_type=None, metadata=None, custom_time=None, generation=1):
+        self.data = data
+        self.content_type = content_type
+        self.metadata = metadata
+        self.custom_time = custom_time
+        self.generation = generation
+
+
+class FakeBlob:
+    """Implements the part of `storage.Blob` used by the hooks, over the objects of a `FakeBucket`."""
+
+    def __init__(self, bucket, name):
+        self.bucket = bucket
+        self.name = name
+        self.metadata = None
+        self.custom_time = None
+        self.generation = None
+
+    def _object(self):
+        stored = self.bucket.objects.get(self.name)
+        if stored is None:
+            raise NotFound(self.name)
+        return stored
+
+    def upload_from_string(self, data, content_type=None, if_generation_match=None, **kwargs):
+        stored = self.bucket.objects.get(self.name)
+        generation = 0 if stored is None else stored.generation
+        if (if_generation_match is not None) and (if_generation_match != generation):
+            raise PreconditionFailed(self.name)
+        if isinstance(data, str):
+            data = data.encode()
+        self.bucket.objects[self.name] = FakeObject(data, content_type, self.metadata, self.custom_time, generation + 1)
+
+    def upload_from_filename(self, filename, content_type=None, **kwargs):
+        with open(filename, 'rb') as f:
+            data = f.read()
+        self.upload_from_string(data, content_type=content_type or mimetypes.guess_type(filename)[0] or 'application/octet-stream', **kwargs)
+
+    def download_as_bytes(self, **kwargs):
+        return self._object().data
+
+    def open(self, mode='rb', **kwargs):
+        return io.BytesIO(self._object().data)
+
+    def exists(self, **kwargs):
+        return self.name in self.bucket.objects
+
+    def delete(self, if_generation_match=None, **kwargs):
+        stored = self._object()
+        if (if_generation_match is not None) and (if_generation_match != stored.generation):
+            raise PreconditionFailed(self.name)
+        del self.bucket.objects[self.name]
+
+
+class FakeBucket:
+    """Keeps the objects of a bucket in memory."""
+
+    def __init__(self, name):
+        self.name = name
+        self.objects = {}
+
+    def blob(self, name):
+        return FakeBlob(self, name)
+
+    def list_blobs(self, prefix=None, **kwargs):
+        return [self.blob(name) for name in sorted(self.objects) if name.startswith(prefix or '')]
+
+    def copy_blob(self, blob, destination_bucket, new_name=None, **kwargs):
+        stored = blob._object()
+        new_name = new_name or blob.name
+        destination_bucket.objects[new_name] = FakeObject(stored.data, stored.content_type, stored.metadata, stored.custom_time)
+        return destination_bucket.blob(new_name)
+
+
+class FakeStorageClient:
+    """Implements the part of `storage.Client` used by the hooks, keeping the buckets in memory."""
+
+    def __init__(self):
+        self.buckets = {}
+
+    def bucket(self, name):
+        return self.buckets.setdefault(name, FakeBucket(name))
+
+    def get_bucket(self, name):
+        return self.bucket(name)
+
+    def list_blobs(self, bucket_name, prefix=None, **kwargs):
+        return self.bucket(bucket_name).list_blobs(prefix=prefix)
+
+    def batch(self):
+        return nullcontext()
+
+
+class FakeBlobWriter(io.BytesIO):
+    """Creates the object when closed, like a resumable upload that is finished."""
+
+    def __init__(self, blob, content_type=None, **kwargs):
+        super().__init__()
+        self.blob = blob
+        self.content_type = content_type
+
+    def close(self):
+        if not self.closed:
+            self.blob.upload_from_string(self.getvalue(), content_type=self.content_type)
+        super().close()
@@ -0,0 +1,67 @@
+
+import unittest
+
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+from google.api_core.exceptions import NotFound, PreconditionFailed
+
+from airless.google.cloud.storage.hook import GcsClaimCheckHook
+
+from tests.google.cloud.storage.fake_gcs import FakeStorageClient
+
+
+class TestGcsClaimCheckHook(unittest.TestCase):
+
+    def setUp(self):
+        self.hook = GcsClaimCheckHook(bucket='claims')
+        self.hook.storage_client = FakeStorageClient()
+
+    def objects(self):
+        return self.hook.storage_client.bucket('claims').objects
+
+    def test_store(self):
+        claim = self.hook.store(b'{"key": "value"}')
+
+        self.assertTrue(claim.startswith('gs://claims/claim-check/'))
+        stored = self.objects()[claim[len('gs://claims/'):]]
+        self.assertEqual(stored.data, b'{"key": "value"}')
+        self.assertEqual(stored.content_type, 'application/json')
+        expires_at = datetime.now(timezone.utc) + timedelta(seconds=self.hook.ttl)
+        self.assertAlmostEqual(stored.custom_time.timestamp(), expires_at.timestamp(), delta=5)
+
+    def test_store_never_overwrites(self):
+        with patch('uuid.uuid4') as mock_uuid:
+            mock_uuid.return_value.hex = 'same'
+            self.hook.store(b'first')
+            with self.assertRaises(PreconditionFailed):
+                self.hook.store(b'second')
+
+        self.assertEqual(self.objects()['claim-check/same.json'].data, b'first')
+
+    def test_load(self):
+        claim = self.hook.store(b'payload')
+
+        self.assertEqual(self.hook.load(claim), b'payload')
+
+    def test_load_deleted(self):
+        claim = self.hook.store(b'payload')
+        self.objects().clear()
+
+        with self.assertRaises(NotFound):
+            self.hook.load(claim)
+
+    def test_load_outside_bucket(self):
+        self.hook.storage_client.bucket('other').blob('claim-check/id.json').upload_from_string(b'secret')
+        self.hook.storage_client.bucket('claims').blob('secrets/id.json').upload_from_string(b'secret')
+
+        for claim in ['gs://other/claim-check/id.json', 'gs://claims/secrets/id.json', 'gs://claims/claim-check-other/id.json', '/etc/passwd']:
+            with self.subTest(claim=claim), self.assertRaises(ValueError):
+                self.hook.load(claim)
+
+    def test_parse_claim(self):
+        self.assertEqual(self.hook.parse_claim('gs://claims/claim-check/id.json'), ('claims', 'claim-check/id.json'))
+
+
+if __name__ == '__main__':
+    unittest.main()
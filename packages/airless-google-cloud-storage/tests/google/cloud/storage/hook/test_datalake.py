@@ -0,0 +1,109 @@
+
+import os
+import unittest
+
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+import pyarrow as pa
+from pyarrow import parquet
+
+from airless.google.cloud.storage.hook import GcsDatalakeHook
+
+from tests.google.cloud.storage.fake_gcs import FakeStorageClient
+
+
+@patch.dict(os.environ, {'GCS_BUCKET_LANDING_ZONE': 'landing'})
+class TestGcsDatalakeHook(unittest.TestCase):
+
+    def setUp(self):
+        self.hook = GcsDatalakeHook()
+        self.hook.storage_client = FakeStorageClient()
+
+    def objects(self):
+        return self.hook.storage_client.bucket('landing').objects
+
+    def write(self, event_id, created_at, number=1):
+        rows = [self.hook.prepare_row({'i': i}, {'event_id': event_id, 'resource': 'topic'}, created_at) for i in range(number)]
+        partition = self.hook.partition_name(created_at, True)
+        return self.hook.write_rows(iter(rows), 'dataset', 'table', partition)
+
+    @patch.dict(os.environ, {'ENV': 'prod'})
+    def test_send_to_landing_zone_parquet_options(self):
+        data = [{'id': i} for i in range(5)]
+
+        path = self.hook.send_to_landing_zone(
+            data, 'dataset', 'table', 1, 'topic', time_partition=True,
+            parquet_options={'compression': 'zstd', 'row_group_size': 2})
+
+        file = parquet.ParquetFile(pa.BufferReader(self.objects()[path[len('landing/'):]].data))
+        self.assertEqual(file.schema_arrow, self.hook.landing_zone_schema())
+        self.assertEqual(file.metadata.num_row_groups, 3)
+        self.assertEqual(file.metadata.row_group(0).column(2).compression, 'ZSTD')
+
+    @patch.dict(os.environ, {'PARQUET_COMPRESSION': 'snappy'})
+    def test_write_rows_parquet_options_from_config(self):
+        path = self.write(1, datetime(2025, 1, 1))
+
+        self.assertTrue(path.startswith('landing/dataset/table/date=2025-01-01/'))
+        file = parquet.ParquetFile(pa.BufferReader(self.objects()[path[len('landing/'):]].data))
+        self.assertEqual(file.metadata.row_group(0).column(0).compression, 'SNAPPY')
+
+    def test_read_landing_zone(self):
+        self.write(1, datetime(2025, 1, 1, 10))
+        self.write(2, datetime(2025, 1, 1, 23))
+        self.write(3, datetime(2025, 1, 2, 12), number=3)
+        self.write(4, datetime(2025, 1, 3, 1))
+        self.write(5, datetime(2024, 12, 31, 23))
+
+        rows = list(self.hook.read_landing_zone('dataset', 'table', datetime(2025, 1, 1, 12), datetime(2025, 1, 3)))
+
+        self.assertEqual(sorted(row['_event_id'] for row in rows), [2, 3, 3, 3])
+        row = next(row for row in rows if row['_event_id'] == 2)
+        self.assertEqual(row['_resource'], 'topic')
+        self.assertEqual(row['_created_at'], datetime(2025, 1, 1, 23))
+        self.assertEqual(self.hook.prepare_row({'i': 0}, {'event_id': 2, 'resource': 'topic'}, row['_created_at']), row)
+
+    def test_read_landing_zone_aware_dates(self):
+        self.write(1, datetime(2025, 1, 1, 10))
+        self.write(2, datetime(2025, 1, 1, 23))
+        self.write(3, datetime(2025, 1, 2, 2))
+
+        # 2025-01-01 20:00 to 2025-01-02 01:00 in UTC
+        brt = timezone(timedelta(hours=-3))
+        rows = list(self.hook.read_landing_zone('dataset', 'table', datetime(2025, 1, 1, 17, tzinfo=brt), datetime(2025, 1, 1, 22, tzinfo=brt)))
+
+        self.assertEqual([row['_event_id'] for row in rows], [2])
+
+    def test_read_landing_zone_skips_other_files(self):
+        self.write(1, datetime(2025, 1, 1, 10))
+        self.objects()['dataset/table/date=2025-01-01/_SUCCESS'] = self.objects()[next(iter(self.objects()))]
+        self.hook.write_rows(iter([{'key': 'value'}]), 'dataset', 'table')
+        self.write(2, datetime(2025, 1, 1, 11))
+        # Tables with a name starting with the same name are not read
+        self.hook.write_rows(iter([self.hook.prepare_row({}, {'event_id': 3, 'resource': 'topic'}, datetime(2025, 1, 1, 12))]),
+                             'dataset', 'table_other', 'date=2025-01-01')
+
+        rows = list(self.hook.read_landing_zone('dataset', 'table', datetime(2025, 1, 1), datetime(2025, 1, 2)))
+
+        self.assertEqual(sorted(row['_event_id'] for row in rows), [1, 2])
+
+    def test_read_landing_zone_is_lazy(self):
+        self.write(1, datetime(2025, 1, 1, 10), number=5)
+
+        with patch.dict(os.environ, {'PARQUET_ROW_GROUP_SIZE': '2'}):
+            self.write(2, datetime(2025, 1, 2, 10), number=5)
+
+        rows = self.hook.read_landing_zone('dataset', 'table', datetime(2025, 1, 1), datetime(2025, 1, 3))
+        with patch.object(self.hook.storage_client.bucket('landing'), 'list_blobs', wraps=self.hook.storage_client.bucket('landing').list_blobs) as mock_list:
+            self.assertEqual(next(rows)['_event_id'], 1)
+            self.assertEqual(mock_list.call_count, 1)
+
+        self.assertEqual(len(list(rows)), 9)
+
+    def test_read_landing_zone_without_files(self):
+        self.assertEqual(list(self.hook.read_landing_zone('dataset', 'table', datetime(2025, 1, 1), datetime(2025, 1, 5))), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,89 @@
+
+import json
+import unittest
+
+from datetime import datetime, timezone
+from unittest.mock import patch
+
+from airless.google.cloud.storage.hook import GcsStateHook
+
+from tests.google.cloud.storage.fake_gcs import FakeStorageClient
+
+
+class TestGcsStateHook(unittest.TestCase):
+
+    def setUp(self):
+        self.hook = GcsStateHook(bucket='state')
+        self.hook.storage_client = FakeStorageClient()
+
+    def objects(self):
+        return self.hook.storage_client.bucket('state').objects
+
+    def test_set(self):
+        self.hook.set('key', {'value': 1})
+
+        stored = self.objects()['state/key']
+        self.assertEqual(json.loads(stored.data), {'value': {'value': 1}, 'expires_at': None})
+        self.assertEqual(stored.content_type, 'application/json')
+        self.assertIsNone(stored.custom_time)
+
+    def test_get(self):
+        self.hook.set('key', {'value': 1})
+
+        self.assertEqual(self.hook.get('key'), {'value': 1})
+        self.assertIsNone(self.hook.get('missing'))
+
+    @patch('time.time', return_value=1700000000.0)
+    def test_ttl(self, mock_time):
+        self.hook.set('key', 'value', ttl=60)
+
+        self.assertEqual(self.objects()['state/key'].custom_time, datetime.fromtimestamp(1700000060.0, tz=timezone.utc))
+        self.assertEqual(self.hook.get('key'), 'value')
+        self.assertTrue(self.hook.exists('key'))
+
+        mock_time.return_value = 1700000060.0
+        self.assertIsNone(self.hook.get('key'))
+        self.assertFalse(self.hook.exists('key'))
+
+    def test_set_overwrites(self):
+        self.hook.set('key', 'first')
+        self.hook.set('key', 'second')
+
+        self.assertEqual(self.hook.get('key'), 'second')
+
+    def test_delete(self):
+        self.hook.set('key', 'value')
+
+        self.hook.delete('key')
+        self.hook.delete('key')
+
+        self.assertIsNone(self.hook.get('key'))
+        self.assertEqual(self.objects(), {})
+
+    def test_exists(self):
+        self.hook.set('key', False)
+
+        self.assertTrue(self.hook.exists('key'))
+        self.assertFalse(self.hook.exists('missing'))
+
+    def test_keys(self):
+        for key in ['circuit-parked/b/2', 'circuit/a', 'circuit-parked/b/1', 'circuit-parked/c/1']:
+            self.hook.set(key, 'value')
+
+        self.assertEqual(self.hook.keys('circuit-parked/b/'), ['circuit-parked/b/1', 'circuit-parked/b/2'])
+        self.assertEqual(self.hook.keys('circuit/'), ['circuit/a'])
+        self.assertEqual(len(self.hook.keys()), 4)
+        self.assertEqual(self.hook.keys('missing/'), [])
+
+    def test_prefix(self):
+        hook = GcsStateHook(bucket='state', prefix='other/')
+        hook.storage_client = self.hook.storage_client
+
+        hook.set('key', 'value')
+
+        self.assertEqual(list(self.objects()), ['other/key'])
+        self.assertIsNone(self.hook.get('key'))
+
+
+if __name__ == '__main__':
+    unittest.main()
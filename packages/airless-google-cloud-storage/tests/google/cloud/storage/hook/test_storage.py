@@ -0,0 +1,244 @@
+import io
+import json
+import os
+import unittest
+from unittest.mock import patch
+
+import pyarrow as pa
+from pyarrow import parquet
+
+from airless.google.cloud.storage.hook import GcsHook
+
+from tests.google.cloud.storage.fake_gcs import FakeBlobWriter, FakeStorageClient
+
+
+def failing_rows(number):
+    for i in range(number):
+        yield {'id': i}
+    raise ConnectionError('Source unavailable')
+
+
+class TestGcsHook(unittest.TestCase):
+
+    def setUp(self):
+        self.hook = GcsHook()
+        self.hook.storage_client = FakeStorageClient()
+
+    def objects(self, bucket='bucket'):
+        return self.hook.storage_client.bucket(bucket).objects
+
+    def read_parquet(self, sink):
+        return parquet.ParquetFile(pa.BufferReader(sink.getvalue()))
+
+    def test_write_parquet_late_populated_column(self):
+        # The column is only set after the first row group
+        rows = [{'id': i, 'name': None if i < 2 else f'name {i}'} for i in range(4)]
+        sink = pa.BufferOutputStream()
+
+        self.hook.write_parquet(iter(rows), sink, row_group_size=2)
+
+        file = self.read_parquet(sink)
+        self.assertEqual(file.schema_arrow.field('name').type, pa.string())
+        self.assertEqual(file.metadata.num_row_groups, 2)
+        self.assertEqual(file.read().to_pylist(), rows)
+
+    def test_write_parquet_with_schema(self):
+        schema = pa.schema([('id', pa.int64()), ('name', pa.string())])
+        rows = [{'id': 1}, {'id': 2, 'name': 'name'}, {'id': 3, 'name': 'other'}]
+        sink = pa.BufferOutputStream()
+
+        self.hook.write_parquet(iter(rows), sink, schema=schema, row_group_size=1)
+
+        file = self.read_parquet(sink)
+        self.assertEqual(file.schema_arrow, schema)
+        self.assertEqual(file.metadata.num_row_groups, 3)
+        self.assertEqual(file.read().to_pylist(), [{'id': 1, 'name': None}, rows[1], rows[2]])
+
+    def test_write_parquet_streams_row_groups(self):
+        schema = pa.schema([('id', pa.int64())])
+        sink = io.BytesIO()
+        written = []
+
+        def rows():
+            for i in range(6):
+                # Bytes in the sink when each row is read
+                written.append(len(sink.getvalue()))
+                yield {'id': i}
+
+        self.hook.write_parquet(rows(), sink, schema=schema, row_group_size=2)
+
+        # Each row group is written before the rows of the next one are read
+        self.assertEqual(written[0], written[1])
+        self.assertLess(written[1], written[2])
+        self.assertEqual(written[2], written[3])
+        self.assertLess(written[3], written[4])
+        self.assertEqual(parquet.ParquetFile(io.BytesIO(sink.getvalue())).metadata.num_row_groups, 3)
+
+    def test_parquet_options_default(self):
+        self.assertEqual(self.hook.parquet_options(), {
+            'compression': 'gzip',
+            'compression_level': None,
+            'row_group_size': 10000,
+            'use_dictionary': True,
+            'write_statistics': True
+        })
+
+    @patch.dict(os.environ, {
+        'PARQUET_COMPRESSION': 'ZSTD',
+        'PARQUET_COMPRESSION_LEVEL': '9',
+        'PARQUET_ROW_GROUP_SIZE': '500',
+        'PARQUET_USE_DICTIONARY': '_resource, _event_id',
+        'PARQUET_WRITE_STATISTICS': 'false'
+    })
+    def test_parquet_options_from_config(self):
+        self.assertEqual(self.hook.parquet_options(), {
+            'compression': 'zstd',
+            'compression_level': 9,
+            'row_group_size': 500,
+            'use_dictionary': ['_resource', '_event_id'],
+            'write_statistics': False
+        })
+
+    @patch.dict(os.environ, {'PARQUET_COMPRESSION': 'zstd', 'PARQUET_ROW_GROUP_SIZE': '500', 'PARQUET_USE_DICTIONARY': 'false'})
+    def test_parquet_options_arguments_override_config(self):
+        options = self.hook.parquet_options(
+            compression='snappy', compression_level=0, row_group_size=10, use_dictionary=['_resource'], schema=None)
+
+        self.assertEqual(options, {
+            'compression': 'snappy',
+            'compression_level': 0,
+            'row_group_size': 10,
+            'use_dictionary': ['_resource'],
+            'write_statistics': True
+        })
+
+    def test_parquet_options_invalid_compression(self):
+        with self.assertRaises(ValueError):
+            self.hook.parquet_options(compression='lzo')
+        with patch.dict(os.environ, {'PARQUET_COMPRESSION': 'zip'}), self.assertRaises(ValueError):
+            self.hook.parquet_options()
+
+    def test_write_parquet_options(self):
+        schema = pa.schema([('id', pa.int64()), ('name', pa.string())])
+        rows = [{'id': i, 'name': 'name'} for i in range(5)]
+        sink = pa.BufferOutputStream()
+
+        self.hook.write_parquet(iter(rows), sink, schema=schema, compression='zstd', row_group_size=2, use_dictionary=['name'])
+
+        metadata = self.read_parquet(sink).metadata
+        self.assertEqual(metadata.num_row_groups, 3)
+        id_column, name_column = metadata.row_group(0).column(0), metadata.row_group(0).column(1)
+        self.assertEqual(id_column.compression, 'ZSTD')
+        self.assertFalse(id_column.has_dictionary_page)
+        self.assertTrue(name_column.has_dictionary_page)
+
+    @patch.dict(os.environ, {'PARQUET_COMPRESSION': 'snappy', 'PARQUET_WRITE_STATISTICS': 'name'})
+    def test_write_parquet_options_from_config(self):
+        sink = pa.BufferOutputStream()
+
+        self.hook.write_parquet([{'id': 1, 'name': 'name'}], sink)
+
+        row_group = self.read_parquet(sink).metadata.row_group(0)
+        self.assertEqual(row_group.column(0).compression, 'SNAPPY')
+        self.assertFalse(row_group.column(0).is_stats_set)
+        self.assertTrue(row_group.column(1).is_stats_set)
+
+    @patch('google.cloud.storage.fileio.BlobWriter', FakeBlobWriter)
+    def test_upload_parquet_stream(self):
+        rows = [{'id': i} for i in range(5)]
+
+        with patch.dict(os.environ, {'GCS_UPLOAD_MODE': 'stream'}):
+            path = self.hook.upload_parquet_from_memory(iter(rows), 'bucket', 'dataset/table', 'file.parquet', row_group_size=2)
+
+        name = path[len('bucket/'):]
+        self.assertEqual(list(self.objects()), [name])
+        self.assertTrue(name.startswith('dataset/table/') and name.endswith('file.parquet'))
+        self.assertEqual(parquet.read_table(pa.BufferReader(self.objects()[name].data)).to_pylist(), rows)
+        self.assertEqual(self.objects()[name].content_type, 'application/octet-stream')
+
+    @patch('google.cloud.storage.fileio.BlobWriter', FakeBlobWriter)
+    def test_upload_parquet_stream_staging_bucket(self):
+        rows = [{'id': i} for i in range(3)]
+        staging = self.hook.storage_client.bucket('staging')
+
+        with patch.dict(os.environ, {'GCS_UPLOAD_MODE': 'stream', 'GCS_UPLOAD_STAGING_BUCKET': 'staging', 'GCS_UPLOAD_STAGING_PREFIX': 'uploads/'}), \
+                patch.object(staging, 'copy_blob', wraps=staging.copy_blob) as mock_copy:
+            path = self.hook.upload_parquet_from_memory(iter(rows), 'bucket', 'dataset', 'file.parquet', add_timestamp=False)
+
+        self.assertEqual(path, 'bucket/dataset/file.parquet')
+        self.assertEqual(list(self.objects()), ['dataset/file.parquet'])
+        self.assertEqual(parquet.read_table(pa.BufferReader(self.objects()['dataset/file.parquet'].data)).to_pylist(), rows)
+        # The file is only staged in the staging bucket, so the triggers of the bucket only see the complete file
+        staged = mock_copy.call_args.args[0]
+        self.assertEqual(staged.bucket.name, 'staging')
+        self.assertTrue(staged.name.startswith('uploads/') and staged.name.endswith('/dataset/file.parquet'))
+        self.assertEqual(self.objects('staging'), {})
+
+    @patch('os.remove', wraps=os.remove)
+    def test_upload_from_memory(self, mock_remove):
+        data = [{'key': 'value', 'text': 'ação'}]
+
+        path = self.hook.upload_from_memory(data, 'bucket', 'dataset/table', 'file.json')
+
+        name = path[len('bucket/'):]
+        self.assertEqual(list(self.objects()), [name])
+        self.assertTrue(name.startswith('dataset/table/') and name.endswith('file.json'))
+        self.assertEqual(json.loads(self.objects()[name].data), data)
+        self.assertEqual(self.objects()[name].content_type, 'application/json')
+        # Nothing is written to /tmp
+        mock_remove.assert_not_called()
+        self.assertRegex(name, r'^dataset/table/\d{14}_[0-9a-f]{32}_file\.json$')
+
+    def test_upload_from_memory_ndjson(self):
+        data = [{'id': 1}, {'id': 2}]
+
+        path = self.hook.upload_from_memory(data, 'bucket', 'dataset', 'file.ndjson', add_timestamp=False, use_ndjson=True)
+
+        self.assertEqual(path, 'bucket/dataset/file.ndjson')
+        self.assertEqual([json.loads(line) for line in self.objects()['dataset/file.ndjson'].data.splitlines()], data)
+
+    def test_upload_from_memory_file_mode(self):
+        data = {'key': 'value'}
+
+        with patch.dict(os.environ, {'GCS_UPLOAD_MODE': 'file'}), patch('os.remove', wraps=os.remove) as mock_remove:
+            path = self.hook.upload_from_memory(data, 'bucket', 'dataset', 'file.json', add_timestamp=False)
+
+        self.assertEqual(path, 'bucket/dataset/file.json')
+        self.assertEqual(json.loads(self.objects()['dataset/file.json'].data), data)
+        self.assertEqual(self.objects()['dataset/file.json'].content_type, 'application/json')
+        # The temporary file is removed after the upload
+        self.assertFalse(os.path.exists(mock_remove.call_args.args[0]))
+
+    def test_upload_parquet_from_memory(self):
+        rows = [{'id': i, 'name': f'name {i}'} for i in range(5)]
+
+        path = self.hook.upload_parquet_from_memory(iter(rows), 'bucket', 'dataset/table', 'file.parquet', row_group_size=2)
+
+        name = path[len('bucket/'):]
+        self.assertEqual(list(self.objects()), [name])
+        self.assertEqual(self.objects()[name].content_type, 'application/octet-stream')
+        file = parquet.ParquetFile(pa.BufferReader(self.objects()[name].data))
+        self.assertEqual(file.metadata.num_row_groups, 3)
+        self.assertEqual(file.read().to_pylist(), rows)
+
+    def test_upload_parquet_from_memory_file_mode(self):
+        rows = [{'id': i} for i in range(3)]
+
+        with patch.dict(os.environ, {'GCS_UPLOAD_MODE': 'file'}):
+            path = self.hook.upload_parquet_from_memory(rows, 'bucket', 'dataset', 'file.parquet', add_timestamp=False)
+
+        self.assertEqual(path, 'bucket/dataset/file.parquet')
+        self.assertEqual(parquet.read_table(pa.BufferReader(self.objects()['dataset/file.parquet'].data)).to_pylist(), rows)
+
+    @patch('google.cloud.storage.fileio.BlobWriter', FakeBlobWriter)
+    def test_upload_parquet_stream_failure_leaves_no_object(self):
+        schema = pa.schema([('id', pa.int64())])
+
+        with patch.dict(os.environ, {'GCS_UPLOAD_MODE': 'stream'}), self.assertRaises(ConnectionError):
+            self.hook.upload_parquet_from_memory(failing_rows(5), 'bucket', 'dataset/table', 'file.parquet', schema=schema, row_group_size=2)
+
+        self.assertEqual(self.objects(), {})
+
+
+if __name__ == '__main__':
+    unittest.main()
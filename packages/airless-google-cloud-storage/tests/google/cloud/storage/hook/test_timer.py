@@ -0,0 +1,64 @@
+
+import json
+import time
+import unittest
+
+from airless.google.cloud.storage.hook import GcsTimerHook
+
+from tests.google.cloud.storage.fake_gcs import FakeStorageClient
+
+
+class TestGcsTimerHook(unittest.TestCase):
+
+    def setUp(self):
+        self.hook = GcsTimerHook(bucket='timers')
+        self.hook.storage_client = FakeStorageClient()
+
+    def objects(self):
+        return self.hook.storage_client.bucket('timers').objects
+
+    def test_schedule(self):
+        timer_id = self.hook.schedule(1700000000.5, 'topic', {'key': 'value'}, project='project')
+
+        self.assertTrue(timer_id.startswith('timers/001700000000500_'))
+        self.assertEqual(json.loads(self.objects()[timer_id].data), {'project': 'project', 'topic': 'topic', 'data': {'key': 'value'}})
+        self.assertEqual(self.objects()[timer_id].content_type, 'application/json')
+
+    def test_due(self):
+        now = time.time()
+        late = self.hook.schedule(now + 60, 'topic-late', {'key': 'late'})
+        second = self.hook.schedule(now - 5, 'topic-b', {'key': 'b'}, project='project-b')
+        first = self.hook.schedule(now - 10, 'topic-a', {'key': 'a'})
+
+        timers = self.hook.due(now)
+
+        self.assertEqual([t['id'] for t in timers], [first, second])
+        self.assertEqual(timers[1]['project'], 'project-b')
+        self.assertEqual(timers[1]['topic'], 'topic-b')
+        self.assertEqual(timers[1]['data'], {'key': 'b'})
+        self.assertAlmostEqual(timers[0]['due_at'], now - 10, delta=0.001)
+        self.assertEqual([t['id'] for t in self.hook.due(now + 61)], [first, second, late])
+
+    def test_due_limit(self):
+        now = time.time()
+        for i in range(5):
+            self.hook.schedule(now - i, 'topic', {'i': i})
+
+        self.assertEqual([t['data'] for t in self.hook.due(now, limit=2)], [{'i': 4}, {'i': 3}])
+
+    def test_due_without_timers(self):
+        self.assertEqual(self.hook.due(), [])
+
+    def test_ack(self):
+        now = time.time()
+        timer_id = self.hook.schedule(now - 1, 'topic', {})
+        other_id = self.hook.schedule(now - 1, 'topic', {})
+
+        self.hook.ack([timer_id])
+        self.hook.ack([])
+
+        self.assertEqual([t['id'] for t in self.hook.due(now)], [other_id])
+
+
+if __name__ == '__main__':
+    unittest.main()
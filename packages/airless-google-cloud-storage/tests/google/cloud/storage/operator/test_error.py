@@ -0,0 +1,95 @@
+
+import os
+import unittest
+
+from unittest.mock import MagicMock, patch
+
+from airless.google.cloud.storage.hook import GcsStateHook, GcsTimerHook
+from airless.google.cloud.storage.operator import GoogleErrorReprocessOperator
+
+from tests.google.cloud.storage.fake_gcs import FakeStorageClient
+
+
+class TestGoogleErrorReprocessOperator(unittest.TestCase):
+
+    def build_operator(self, **environ):
+        with patch.dict(os.environ, {'CIRCUIT_BREAKER_THRESHOLD': '2', 'CIRCUIT_BREAKER_COOLDOWN': '60', **environ}):
+            operator = GoogleErrorReprocessOperator()
+        operator.queue_hook = MagicMock()
+        operator.datalake_hook = MagicMock()
+        storage_client = FakeStorageClient()
+        for hook in (operator.state_hook, operator.timer_hook):
+            if hook is not None:
+                hook.storage_client = storage_client
+        return operator
+
+    def test_circuit_breaker_requires_state_bucket(self):
+        operator = self.build_operator(GCS_BUCKET_TIMER='timers')
+
+        self.assertNotIsInstance(operator.state_hook, GcsStateHook)
+        self.assertFalse(operator.circuit_enabled())
+
+    def test_circuit_breaker_requires_timer_bucket(self):
+        operator = self.build_operator(GCS_BUCKET_STATE='state')
+
+        self.assertIsInstance(operator.state_hook, GcsStateHook)
+        self.assertIsNone(operator.timer_hook)
+        self.assertFalse(operator.circuit_enabled())
+
+    def test_circuit_breaker_disabled_without_threshold(self):
+        operator = self.build_operator(GCS_BUCKET_STATE='state', GCS_BUCKET_TIMER='timers', CIRCUIT_BREAKER_THRESHOLD='0')
+
+        self.assertIsNone(operator.state_hook)
+        self.assertFalse(operator.circuit_enabled())
+
+    def test_error_digest_requires_state_bucket(self):
+        self.assertFalse(self.build_operator(ERROR_DIGEST_WINDOW='60', CIRCUIT_BREAKER_THRESHOLD='0').digest_enabled())
+
+        operator = self.build_operator(ERROR_DIGEST_WINDOW='60', CIRCUIT_BREAKER_THRESHOLD='0', GCS_BUCKET_STATE='state')
+        self.assertIsInstance(operator.state_hook, GcsStateHook)
+        self.assertTrue(operator.digest_enabled())
+
+    @patch.dict(os.environ, {'QUEUE_TOPIC_ERROR': 'error', 'QUEUE_TOPIC_SLACK_SEND': 'slack', 'SLACK_CHANNELS_ERROR': '["channel"]'})
+    def test_error_digest_shared_by_instances(self):
+        instances = [self.build_operator(ERROR_DIGEST_WINDOW='60', CIRCUIT_BREAKER_THRESHOLD='0', GCS_BUCKET_STATE='state') for _ in range(2)]
+        instances[1].state_hook.storage_client = instances[0].state_hook.storage_client
+        error = {'input_type': 'file', 'origin': 'source', 'event_id': 1, 'error': 'error', 'data': {'metadata': {'dataset': 'dataset', 'table': 'table'}}}
+
+        with patch('time.time', return_value=1210):
+            for operator in instances:
+                operator.execute(error, 'error')
+            digest = instances[1].state_hook.get(instances[1].state_hook.keys('error-digest/')[0])
+
+        # Only the first instance notifies the error
+        instances[0].queue_hook.publish.assert_called_once()
+        instances[1].queue_hook.publish.assert_not_called()
+        self.assertEqual(digest['count'], 2)
+
+    @patch.dict(os.environ, {'QUEUE_TOPIC_ERROR': 'error'})
+    def test_circuit_breaker(self):
+        operator = self.build_operator(GCS_BUCKET_STATE='state', GCS_BUCKET_TIMER='timers')
+        self.assertIsInstance(operator.timer_hook, GcsTimerHook)
+        self.assertTrue(operator.circuit_enabled())
+        errors = [
+            {'project': 'project', 'input_type': 'event', 'origin': 'source', 'event_id': i, 'error': 'error', 'data': {'id': i, 'metadata': {'retries': 0}}}
+            for i in range(3)
+        ]
+
+        for i, error in enumerate(errors):
+            with patch('time.time', return_value=1000 + i):
+                operator.execute(error, 'error')
+
+        # The first failure is retried with a timer, then the circuit opens and parks the other messages
+        self.assertEqual([t['topic'] for t in operator.timer_hook.due(2000)], ['source', 'error'])
+        self.assertEqual(operator.state_hook.get('circuit/source')['state'], 'open')
+        self.assertEqual(len(operator.state_hook.keys('circuit-parked/source/')), 2)
+
+        # After the cooldown one message is released as a probe
+        with patch('time.time', return_value=1061):
+            operator.execute({'circuit_sweep': True}, 'error')
+        operator.queue_hook.publish.assert_called_once_with(project='project', topic='source', data={'id': 1, 'metadata': {'retries': 1}})
+        self.assertEqual(operator.state_hook.get('circuit/source')['state'], 'half_open')
+
+
+if __name__ == '__main__':
+    unittest.main()
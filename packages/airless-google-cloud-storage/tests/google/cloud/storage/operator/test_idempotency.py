@@ -0,0 +1,46 @@
+
+import os
+import unittest
+
+from cloudevents.http import CloudEvent
+from unittest.mock import MagicMock, patch
+
+from airless.google.cloud.core.operator import GoogleBaseEventOperator
+from airless.google.cloud.storage.hook import GcsStateHook
+
+from tests.google.cloud.storage.fake_gcs import FakeStorageClient
+
+
+@patch.dict(os.environ, {'ENV': 'dev', 'QUEUE_TOPIC_ERROR': 'dev-error'})
+class TestGcsIdempotency(unittest.TestCase):
+
+    def build_operator(self):
+        with patch.dict(os.environ, {'IDEMPOTENCY_STORE': 'gcs', 'GCS_BUCKET_STATE': 'state'}):
+            operator = GoogleBaseEventOperator()
+        operator.queue_hook = MagicMock()
+        operator.idempotency_hook.storage_client = FakeStorageClient()
+        return operator
+
+    def test_idempotency_store_from_config(self):
+        self.assertIsInstance(self.build_operator().idempotency_hook, GcsStateHook)
+        self.assertNotIsInstance(GoogleBaseEventOperator().idempotency_hook, GcsStateHook)
+
+    def test_run_skips_processed_messages(self):
+        operator = self.build_operator()
+        cloud_event = CloudEvent(
+            {'type': 'com.example.sampletype1', 'source': 'path/to/topic-name', 'id': '123'},
+            {'message': {'data': 'eyJrZXkiOiAiVmFsdWUifQ=='}})
+
+        with patch.object(GoogleBaseEventOperator, 'execute', side_effect=[Exception('Error!'), None, None]) as mock_execute:
+            # Messages with errors are processed again
+            operator.run(cloud_event)
+            operator.run(cloud_event)
+            operator.run(cloud_event)
+
+        self.assertEqual(mock_execute.call_count, 2)
+        objects = operator.idempotency_hook.storage_client.bucket('state').objects
+        self.assertEqual(list(objects), ['state/idempotency/GoogleBaseEventOperator/123'])
+
+
+if __name__ == '__main__':
+    unittest.main()
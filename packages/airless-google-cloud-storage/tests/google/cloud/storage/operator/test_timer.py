@@ -0,0 +1,47 @@
+
+import os
+import time
+import unittest
+
+from concurrent.futures import Future
+from unittest.mock import MagicMock, patch
+
+from airless.google.cloud.storage.operator import GoogleTimerSweepOperator
+
+from tests.google.cloud.storage.fake_gcs import FakeStorageClient
+
+
+def published_future(exception=None):
+    future = Future()
+    if exception is None:
+        future.set_result('message-id')
+    else:
+        future.set_exception(exception)
+    return future
+
+
+class TestGoogleTimerSweepOperator(unittest.TestCase):
+
+    def setUp(self):
+        with patch.dict(os.environ, {'GCS_BUCKET_TIMER': 'timers'}):
+            self.operator = GoogleTimerSweepOperator()
+        self.operator.timer_hook.storage_client = FakeStorageClient()
+        self.operator.queue_hook = MagicMock()
+
+    def test_publishes_due_timers(self):
+        now = time.time()
+        self.operator.timer_hook.schedule(now - 10, 'topic-a', {'key': 'a'}, project='project')
+        failed = self.operator.timer_hook.schedule(now - 5, 'topic-b', {'key': 'b'})
+        self.operator.timer_hook.schedule(now + 60, 'topic-c', {'key': 'c'})
+        self.operator.queue_hook.publish_async.side_effect = [published_future(), published_future(Exception('Unavailable'))]
+
+        self.operator.execute({}, 'sweep')
+
+        calls = [c.kwargs for c in self.operator.queue_hook.publish_async.call_args_list]
+        self.assertEqual([(c['project'], c['topic'], c['data']) for c in calls], [('project', 'topic-a', {'key': 'a'}), (None, 'topic-b', {'key': 'b'})])
+        # Only the published timers are removed, the failed one is published by the next sweep
+        self.assertEqual([t['id'] for t in self.operator.timer_hook.due(now)], [failed])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,27 @@
+
+import os
+import re
+import unittest
+
+from airless.google.cloud.storage import operator
+
+
+PYPROJECT = os.path.join(os.path.dirname(__file__), '..', 'pyproject.toml')
+
+
+def registered_operators():
+    with open(PYPROJECT) as f:
+        section = f.read().split('[project.entry-points."airless.operators"]', 1)[1].split('\n[', 1)[0]
+    return dict(re.findall(r'^(\w+) = "([\w.:]+)"$', section, re.MULTILINE))
+
+
+class TestEntryPoints(unittest.TestCase):
+
+    def test_operators_are_registered(self):
+        self.assertEqual(
+            registered_operators(),
+            {name: f'airless.google.cloud.storage.operator:{name}' for name in operator.__all__})
+
+
+if __name__ == '__main__':
+    unittest.main()
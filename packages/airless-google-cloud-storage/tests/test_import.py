@@ -0,0 +1,24 @@
+
+import unittest
+
+from airless.core.utils import imported_modules
+
+
+class TestImports(unittest.TestCase):
+
+    HEAVY_MODULES = {'pyarrow', 'pyarrow.parquet', 'ndjson'}
+
+    def test_import_hook(self):
+        imported = set(imported_modules('import airless.google.cloud.storage.hook'))
+        self.assertFalse(imported & (self.HEAVY_MODULES | {'google.cloud.storage'}))
+
+        imported = set(imported_modules('from airless.google.cloud.storage.hook import GcsHook, GcsDatalakeHook'))
+        self.assertFalse(imported & self.HEAVY_MODULES)
+
+    def test_import_operator(self):
+        imported = set(imported_modules('from airless.google.cloud.storage.operator import FileDetectOperator'))
+        self.assertFalse(imported & self.HEAVY_MODULES)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,7 +1,18 @@
-from .vertexai import VertexAiHook
-from .gemini import GeminiApiHook
+from typing import TYPE_CHECKING
+
+from airless.core.utils import lazy_exports
+
+if TYPE_CHECKING:
+    from .vertexai import (VertexAiHook)
+    from .gemini import (GeminiApiHook)
 
 __all__ = [
-    "VertexAiHook",
-    "GeminiApiHook",
+    'VertexAiHook',
+    'GeminiApiHook'
 ]
+
+# Submodules are only imported when one of their names is first accessed
+__getattr__, __dir__ = lazy_exports(__name__, {
+    'VertexAiHook': '.vertexai',
+    'GeminiApiHook': '.gemini'
+})
@@ -1,11 +1,11 @@
 
-from typing import Any
+from typing import Any, TYPE_CHECKING
 
-from airless.core.utils import get_config
+from airless.core.utils import get_client, get_config
 from airless.core.hook import LLMHook
 
-import vertexai
-from vertexai.generative_models import GenerativeModel
+if TYPE_CHECKING:
+    from vertexai.generative_models import GenerativeModel
 
 
 class VertexAiHook(LLMHook):
@@ -21,14 +21,47 @@ class VertexAiHook(LLMHook):
               - GCP_REGION: The Google Cloud region.
 
             These are needed to initialize the Vertex AI client with the correct context.
+            The SDK is only initialized when the model is first used.
 
         Args:
             model_name (str): The name of the model to use.
             **kwargs (Any): Additional arguments for model initialization.
         """
         super().__init__()
-        vertexai.init(project=get_config('GCP_PROJECT'), location=get_config('GCP_REGION'))
-        self.model = GenerativeModel(model_name, **kwargs)
+        self.model_name = model_name
+        self.model_kwargs = kwargs
+        self._model = None
+
+    @property
+    def model(self) -> 'GenerativeModel':
+        """The generative model, created on first use."""
+        if self._model is None:
+            import vertexai
+            from vertexai.generative_models import GenerativeModel
+
+            project = get_config('GCP_PROJECT')
+            get_client(vertexai, project, factory=lambda: self._init_vertexai(project, get_config('GCP_REGION')))
+            self._model = GenerativeModel(self.model_name, **self.model_kwargs)
+        return self._model
+
+    @model.setter
+    def model(self, model: 'GenerativeModel') -> None:
+        self._model = model
+
+    def _init_vertexai(self, project: str, location: str) -> Any:
+        """Initializes the Vertex AI SDK, which is done once per project in the process.
+
+        Args:
+            project (str): The Google Cloud project ID.
+            location (str): The Google Cloud region.
+
+        Returns:
+            Any: The initialized `vertexai` module.
+        """
+        import vertexai
+
+        vertexai.init(project=project, location=location)
+        return vertexai
 
     def generate_content(self, content: str, **kwargs: dict[str, Any]) -> Any:
         """Generates a content for the given content.
@@ -1,5 +1,15 @@
-from .slack import (SlackHook)
+from typing import TYPE_CHECKING
+
+from airless.core.utils import lazy_exports
+
+if TYPE_CHECKING:
+    from .slack import (SlackHook)
 
 __all__ = [
     'SlackHook'
 ]
+
+# Submodules are only imported when one of their names is first accessed
+__getattr__, __dir__ = lazy_exports(__name__, {
+    'SlackHook': '.slack'
+})
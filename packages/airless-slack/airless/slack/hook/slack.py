@@ -6,35 +6,45 @@ from airless.core.hook import BaseHook
 
 
 class SlackHook(BaseHook):
-    """Hook for interacting with Slack API."""
+    """Hook for interacting with Slack API.
+
+    The hook may be shared by concurrent invocations that use different
+    workspaces, so operators pass the token to each call instead of setting
+    it on the hook with `set_token`.
+    """
 
     def __init__(self) -> None:
         """Initializes the SlackHook."""
         super().__init__()
         self.api_url: str = 'slack.com'
+        self.token: Optional[str] = None
 
     def set_token(self, token: str) -> None:
-        """Sets the authorization token for the Slack API.
+        """Sets the default authorization token for the Slack API.
 
         Args:
             token (str): The authorization token.
         """
         self.token = token
 
-    def get_headers(self) -> Dict[str, str]:
+    def get_headers(self, token: Optional[str] = None) -> Dict[str, str]:
         """Gets the headers for the Slack API requests.
 
+        Args:
+            token (Optional[str]): The authorization token. Defaults to the token set with `set_token`.
+
         Returns:
             Dict[str, str]: The headers including the authorization token.
         """
         return {
-            'Authorization': f'Bearer {self.token}'
+            'Authorization': f'Bearer {token or self.token}'
         }
 
     def send(
             self, channel: Optional[str] = None, message: Optional[str] = None, blocks: Optional[List[Dict[str, Any]]] = None,
             thread_ts: Optional[str] = None, reply_broadcast: bool = False, attachments: Optional[List[Dict[str, Any]]] = None,
-            response_url: Optional[str] = None, response_type: Optional[str] = None, replace_original: Optional[bool] = None) -> Dict[str, Any]:
+            response_url: Optional[str] = None, response_type: Optional[str] = None, replace_original: Optional[bool] = None,
+            token: Optional[str] = None) -> Dict[str, Any]:
         """Sends a message to a Slack channel or a response URL.
 
         Args:
@@ -47,6 +57,7 @@ class SlackHook(BaseHook):
             response_url (Optional[str]): The response URL to send the message to.
             response_type (Optional[str]): The response type.
             replace_original (Optional[bool]): Whether to replace the original message.
+            token (Optional[str]): The authorization token. Defaults to the token set with `set_token`.
 
         Returns:
             Dict[str, Any]: The response from the Slack API.
@@ -78,7 +89,7 @@ class SlackHook(BaseHook):
 
         response = requests.post(
             response_url or f'https://{self.api_url}/api/chat.postMessage',
-            headers=self.get_headers(),
+            headers=self.get_headers(token),
             json=data,
             timeout=10
         )
@@ -88,13 +99,14 @@ class SlackHook(BaseHook):
             return {'status': response.text}
         return response.json()
 
-    def react(self, channel: str, reaction: str, ts: str) -> Dict[str, Any]:
+    def react(self, channel: str, reaction: str, ts: str, token: Optional[str] = None) -> Dict[str, Any]:
         """Adds a reaction to a Slack message.
 
         Args:
             channel (str): The channel of the message.
             reaction (str): The reaction to add.
             ts (str): The timestamp of the message.
+            token (Optional[str]): The authorization token. Defaults to the token set with `set_token`.
 
         Returns:
             Dict[str, Any]: The response from the Slack API.
@@ -106,7 +118,7 @@ class SlackHook(BaseHook):
         }
         response = requests.post(
             f'https://{self.api_url}/api/reactions.add',
-            headers=self.get_headers(),
+            headers=self.get_headers(token),
             json=data,
             timeout=10
         )
@@ -1,11 +1,10 @@
-from .slack import (
-    SlackSendOperator,
-    SlackReactOperator
-)
-from .google import (
-    GoogleSlackSendOperator,
-    GoogleSlackReactOperator
-)
+from typing import TYPE_CHECKING
+
+from airless.core.utils import lazy_exports
+
+if TYPE_CHECKING:
+    from .slack import (SlackSendOperator, SlackReactOperator)
+    from .google import (GoogleSlackSendOperator, GoogleSlackReactOperator)
 
 __all__ = [
     'SlackSendOperator',
@@ -13,3 +12,11 @@ __all__ = [
     'GoogleSlackSendOperator',
     'GoogleSlackReactOperator'
 ]
+
+# Submodules are only imported when one of their names is first accessed
+__getattr__, __dir__ = lazy_exports(__name__, {
+    'SlackSendOperator': '.slack',
+    'SlackReactOperator': '.slack',
+    'GoogleSlackSendOperator': '.google',
+    'GoogleSlackReactOperator': '.google'
+})
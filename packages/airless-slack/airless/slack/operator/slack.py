@@ -35,8 +35,8 @@ class SlackSendOperator(BaseEventOperator):
         response_type: Optional[str] = data.get('response_type')
         replace_original: Optional[bool] = data.get('replace_original')
 
+        # The token is passed to each call, since the hook is shared by concurrent invocations
         token: str = self.secret_manager_hook.get_secret(get_config('GCP_PROJECT'), secret_id, True)['bot_token']
-        self.slack_hook.set_token(token)
 
         if not channels and not response_url:
             raise Exception('Either channels or response_url must be set')
@@ -50,7 +50,8 @@ class SlackSendOperator(BaseEventOperator):
                 reply_broadcast=reply_broadcast,
                 attachments=attachments,
                 response_type=response_type,
-                replace_original=replace_original)
+                replace_original=replace_original,
+                token=token)
             self.logger.debug(response)
 
         if response_url:
@@ -62,7 +63,8 @@ class SlackSendOperator(BaseEventOperator):
                 attachments=attachments,
                 response_url=response_url,
                 response_type=response_type,
-                replace_original=replace_original)
+                replace_original=replace_original,
+                token=token)
             self.logger.debug(response)
 
 
@@ -87,8 +89,8 @@ class SlackReactOperator(BaseEventOperator):
         reaction: str = data.get('reaction')
         ts: str = data.get('ts')
 
+        # The token is passed to each call, since the hook is shared by concurrent invocations
         token: str = self.secret_manager_hook.get_secret(get_config('GCP_PROJECT'), secret_id, True)['bot_token']
-        self.slack_hook.set_token(token)
 
-        response = self.slack_hook.react(channel, reaction, ts)
+        response = self.slack_hook.react(channel, reaction, ts, token=token)
         self.logger.debug(response)